@@ -0,0 +1,174 @@
+import logging
+import operator
+from decimal import Decimal
+import rdflib
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+SH = rdflib.Namespace('http://www.w3.org/ns/shacl#')
+
+RANGES = [
+    ('minExclusive', SH.MinExclusiveConstraintComponent, operator.gt),
+    ('minInclusive', SH.MinInclusiveConstraintComponent, operator.ge),
+    ('maxExclusive', SH.MaxExclusiveConstraintComponent, operator.lt),
+    ('maxInclusive', SH.MaxInclusiveConstraintComponent, operator.le)
+]
+
+LENGTHS = [
+    ('minLength', SH.MinLengthConstraintComponent, operator.ge),
+    ('maxLength', SH.MaxLengthConstraintComponent, operator.le)
+]
+
+# integers up to 2**53 are exactly representable as float
+SAFE_INTEGER = 2 ** 53
+
+
+def exactFloat(value):
+    """Return value as float if the conversion is exact, otherwise None."""
+    if value.__class__ is int and -SAFE_INTEGER <= value <= SAFE_INTEGER:
+        return float(value)
+    if isinstance(value, bool) or not isinstance(value, (int, float, Decimal)):
+        return None
+    try:
+        converted = float(value)
+    except (OverflowError, ValueError):
+        return None
+    if isinstance(value, float):
+        return converted
+    if converted != converted or converted in (float('inf'), float('-inf')):
+        return None
+    if isinstance(value, int):
+        return converted if int(converted) == value else None
+    return converted if Decimal(converted) == value else None
+
+
+class ColumnarChecks:
+    """Check the value range and string length constraints of a property shape in batches.
+
+    The values of many focus nodes are gathered into columns (numeric values and string
+    lengths) and every constraint is checked with one vectorized comparison, if NumPy is
+    installed. Values that have no exact float representation (e.g. dates or very large
+    integers) are checked one by one, so the results are the same as for a per-value loop.
+    Bounds without exact float representation (e.g. sh:maxInclusive 9.99 or dates) are
+    compared with every value one by one as well.
+    """
+
+    logger = logging.getLogger('ShacShifter.ColumnarChecks')
+    # the missing NumPy is only logged for the first ColumnarChecks
+    reportedFallback = False
+
+    def __init__(self, propertyShape, vectorized=True):
+        """Collect the range and length constraints of propertyShape.
+
+        args: PropertyShape propertyShape
+              bool vectorized, use NumPy if it is installed
+        """
+        isSet = propertyShape.isSet
+        self.ranges = [(component, getattr(propertyShape, attribute), accept)
+                       for attribute, component, accept in RANGES if isSet[attribute]]
+        self.lengths = [(component, getattr(propertyShape, attribute), accept)
+                        for attribute, component, accept in LENGTHS if isSet[attribute]]
+        self.numpy = numpy if vectorized else None
+        if self and vectorized and numpy is None and not ColumnarChecks.reportedFallback:
+            ColumnarChecks.reportedFallback = True
+            self.logger.warning('NumPy is not installed, range and length constraints are '
+                                'checked without vectorization (pip install ShacShifter[numpy])')
+
+    def __bool__(self):
+        return bool(self.ranges or self.lengths)
+
+    def check(self, focusNodes, valueLists):
+        """Check the values of focus nodes.
+
+        args: list focusNodes
+              list valueLists, the value nodes of every focus node
+        returns: list with a list of (constraint component, value) per focus node, in the
+                 order of the constraints and values
+        """
+        owners = []
+        terms = []
+        for index, values in enumerate(valueLists):
+            for value in values:
+                owners.append(index)
+                terms.append(value)
+        violations = [[] for _ in focusNodes]
+        if not terms:
+            return violations
+
+        if self.ranges:
+            numbers = self.numericColumn(terms)
+            for component, bound, accept in self.ranges:
+                for index in self.failedRange(terms, numbers, bound, accept):
+                    violations[owners[index]].append((component, terms[index]))
+
+        if self.lengths:
+            lengths = [-1 if isinstance(value, rdflib.BNode) else len(value) for value in terms]
+            if self.numpy is not None:
+                lengths = self.numpy.array(lengths, dtype=self.numpy.int64)
+            for component, bound, accept in self.lengths:
+                for index in self.failedLength(lengths, bound, accept):
+                    violations[owners[index]].append((component, terms[index]))
+
+        return violations
+
+    def numericColumn(self, terms):
+        """Return the exact float values of terms.
+
+        returns: list with None for values without exact float representation, or with
+                 NumPy a pair of a float array and a mask of the exact values
+        """
+        numbers = [exactFloat(value.toPython()) if isinstance(value, rdflib.Literal)
+                   else None for value in terms]
+        if self.numpy is None:
+            return numbers
+        np = self.numpy
+        exact = np.array([number is not None for number in numbers], dtype=bool)
+        column = np.array([0.0 if number is None else number for number in numbers],
+                          dtype=np.float64)
+        return column, exact
+
+    def failedRange(self, terms, numbers, bound, accept):
+        """Return the ascending indices of the values outside of the range."""
+        if exactFloat(bound) is None:
+            return [index for index, value in enumerate(terms)
+                    if not self.inRange(value, bound, accept)]
+
+        if self.numpy is None:
+            return [index for index, number in enumerate(numbers)
+                    if not (accept(number, bound) if number is not None
+                            else self.inRange(terms[index], bound, accept))]
+
+        np = self.numpy
+        column, exact = numbers
+        failed = exact & ~accept(column, float(bound))
+        inexact = np.flatnonzero(~exact).tolist()
+        if not inexact:
+            return np.flatnonzero(failed).tolist()
+        indices = set(np.flatnonzero(failed).tolist())
+        for index in inexact:
+            if not self.inRange(terms[index], bound, accept):
+                indices.add(index)
+        return sorted(indices)
+
+    def failedLength(self, lengths, bound, accept):
+        """Return the ascending indices of the values with a length out of bounds.
+
+        Blank nodes (length -1) always fail.
+        """
+        if self.numpy is None:
+            return [index for index, length in enumerate(lengths)
+                    if length < 0 or not accept(length, bound)]
+        return self.numpy.flatnonzero((lengths < 0) | ~accept(lengths, bound)).tolist()
+
+    @staticmethod
+    def inRange(value, bound, accept):
+        """Check a single value against a range bound."""
+        if not isinstance(value, rdflib.Literal):
+            return False
+        try:
+            return accept(value.toPython(), bound)
+        except TypeError:
+            return False
@@ -0,0 +1,99 @@
+import logging
+import rdflib
+from .ShapeNormalizer import ShapeNormalizer
+from .TargetIndex import TargetIndex
+
+
+def termJson(term):
+    """Return the RDF/JSON representation of an rdflib term, as used by RDForms."""
+    if isinstance(term, rdflib.Literal):
+        value = {'type': 'literal', 'value': str(term)}
+        if term.language:
+            value['lang'] = term.language
+        elif term.datatype:
+            value['datatype'] = str(term.datatype)
+        return value
+    if isinstance(term, rdflib.BNode):
+        return {'type': 'bnode', 'value': '_:' + str(term)}
+    return {'type': 'uri', 'value': str(term)}
+
+
+class FormPrefiller:
+    """Collect the current values of the target instances of node shapes from a data graph.
+
+    The values are fetched with one lookup per property over the whole data graph instead of
+    one lookup per field and instance, so filling the forms of all instances is a single
+    pass over the relevant triples.
+    """
+
+    logger = logging.getLogger('ShacShifter.FormPrefiller')
+
+    def __init__(self, nodeShapes, dataGraph, normalizer=None):
+        """Find the target instances of all node shapes in dataGraph.
+
+        args: dict nodeShapes as returned by ShapeParser.parseShape()
+              rdflib Graph dataGraph
+              ShapeNormalizer normalizer (optional) shared cache of EffectiveShapes, the
+              forms hold the values of the property shapes of sh:and operands as well
+        """
+        self.nodeShapes = nodeShapes
+        self.normalizer = ShapeNormalizer() if normalizer is None else normalizer
+        self.g = dataGraph
+        self.focusNodes = TargetIndex(nodeShapes).focusNodes(dataGraph)
+        self.index = None
+
+    def predicates(self):
+        """Return the predicates of all property shapes with a simple path."""
+        predicates = set()
+        for uri in self.focusNodes:
+            for propertyShape in self.normalizer.effective(self.nodeShapes[uri]).properties:
+                if isinstance(propertyShape.path, str) and propertyShape.path:
+                    predicates.add(rdflib.URIRef(propertyShape.path))
+        return predicates
+
+    def buildIndex(self):
+        """Build the index predicate -> instance -> list of values, one lookup per predicate."""
+        instances = set()
+        for nodes in self.focusNodes.values():
+            instances.update(nodes)
+        index = {}
+        for predicate in self.predicates():
+            values = {}
+            for s, _, o in self.g.triples((None, predicate, None)):
+                if s in instances:
+                    values.setdefault(s, []).append(o)
+            index[predicate] = values
+        self.index = index
+        return index
+
+    def values(self, instance, path):
+        """Return the values of instance for the simple path."""
+        if self.index is None:
+            self.buildIndex()
+        return self.index.get(rdflib.URIRef(path), {}).get(instance, [])
+
+    def forms(self):
+        """Yield a pre-filled form for every target instance of every node shape.
+
+        A form is a dict with the URI of the node shape ("template", the root of its
+        RDForms template bundle), the instance ("resource"), a "label" and its current
+        values as RDF/JSON ("graph").
+        """
+        if self.index is None:
+            self.buildIndex()
+        for uri, nodeShape in self.nodeShapes.items():
+            for instance in sorted(self.focusNodes.get(uri, ())):
+                statements = {}
+                for propertyShape in self.normalizer.effective(nodeShape).properties:
+                    if not isinstance(propertyShape.path, str) or not propertyShape.path:
+                        continue
+                    values = self.values(instance, propertyShape.path)
+                    if values:
+                        statements[propertyShape.path] = [termJson(value) for value in values]
+                resource = termJson(instance)['value']
+                yield {
+                    'template': uri,
+                    'resource': resource,
+                    'label': {'en': 'Edit Instance of: ' + resource},
+                    'graph': {resource: statements} if statements else {}
+                }
@@ -1,4 +1,8 @@
 import logging
+import os
+from .LabelIndex import LabelIndex
+from .Profiler import NULL_PROFILER
+from .ShapeNormalizer import ShapeNormalizer
 
 
 # example class for
@@ -6,28 +10,47 @@ class HTMLSerializer:
     """A Serializer that writes HTML."""
 
     logger = logging.getLogger('ShacShifter.HTMLSerializer')
-    content = []
     outputfile = ''
 
-    def __init__(self, nodeShapes, outputfile):
+    def __init__(self, nodeShapes, outputfile, labels=None, language=None, profiler=None):
+        """Serialize nodeShapes to outputfile.
+
+        args: dict nodeShapes
+              string outputfile
+              LabelIndex labels (optional), e.g. ShapeParser.labels
+              string language (optional) preferred language of the labels
+              Profiler profiler (optional)
+        """
+        self.content = []
+        self.profiler = NULL_PROFILER if profiler is None else profiler
+        self.normalizer = ShapeNormalizer()
+        self.labels = LabelIndex() if labels is None else labels
+        self.language = language
         try:
             fp = open(outputfile, 'w')
             self.outputfile = outputfile
-            fp.close
+            fp.close()
         except Exception:
             raise Exception('Can''t write to file {}'.format(outputfile))
 
-        self.content.append('<html> <body>\n')
-        self.logger.debug(shapes)
-        for nodeShape in nodeShapes:
-            self.nodeShapeEvaluation(nodeShapes[nodeShape], fp)
-        self.content.append('</body></html>')
-        self.saveToFile()
+        with self.profiler.phase('serialize'):
+            self.content.append('<html> <body>\n')
+            self.logger.debug(nodeShapes)
+            for nodeShape in nodeShapes:
+                self.nodeShapeEvaluation(nodeShapes[nodeShape], fp)
+            self.content.append('</body></html>')
+        with self.profiler.phase('write'):
+            self.saveToFile()
 
     def saveToFile(self):
         fp = open(self.outputfile, 'w')
         fp.write(''.join(self.content))
-        fp.close
+        fp.close()
+        if self.profiler.enabled:
+            self.profiler.count('bytesWritten', os.path.getsize(self.outputfile))
+
+    def label(self, resource):
+        return LabelIndex.pick(self.labels.forResource(resource), self.language)
 
     def nodeShapeEvaluation(self, nodeShape, fp):
         """Evaluate a nodeShape.
@@ -48,12 +71,12 @@ class HTMLSerializer:
             for tClass in nodeShape.targetClass:
                 self.content.append(
                     '<input type="radio" name="type" value={type}>{short}</input><br>'.format(
-                        type=tClass, short=tClass.rsplit('/', 1)[-1]))
+                        type=tClass, short=self.label(tClass)))
 
             self.content.append("</fieldset><br>")
         elif len(nodeShape.targetClass) == 1:
             self.content.append("<p>Create new {}</p><br>".format(
-                nodeShape.targetClass[0].rsplit('/', 1)[-1]))
+                self.label(nodeShape.targetClass[0])))
             self.content.append(
                 '<input type="hidden" name="type" value={type}></input><br>'.format(
                     type=nodeShape.targetClass[0]))
@@ -75,7 +98,8 @@ class HTMLSerializer:
         for nodes in nodeShape.targetSubjectsOf:
             self.logger.debug(nodes)
 
-        for property in nodeShape.properties:
+        # including the property shapes of sh:and operands
+        for property in self.normalizer.effective(nodeShape).properties:
             content = self.propertyShapeEvaluation(property, fp)
             self.content.append(content)
 
@@ -97,8 +121,7 @@ class HTMLSerializer:
             # TODO handle sequence paths
             self.logger.info('Sequence path not supported, yet')
         else:
-            label = propertyShape.name \
-                if propertyShape.isSet['name'] else propertyShape.path.rsplit('/', 1)[-1]
+            label = LabelIndex.pick(self.labels.forPropertyShape(propertyShape), self.language)
 
             if not propertyShape.isSet['minCount'] and not propertyShape.isSet['maxCount']:
                 html += """{label}:<br>
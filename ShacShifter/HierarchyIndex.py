@@ -0,0 +1,91 @@
+import rdflib
+from rdflib.namespace import RDF, RDFS, SKOS
+
+
+class HierarchyIndex:
+    """An index of class instances and parent/child relations of an ontology or vocabulary.
+
+    The index is built with one lookup per relation (rdf:type, rdfs:subClassOf, skos:broader,
+    skos:narrower) and then answers which resources are instances of a class and how they
+    are arranged in a tree. Computed trees are cached, so an index can be shared by many
+    serializer runs.
+    """
+
+    def __init__(self, *graphs):
+        """Build the index from the given graphs.
+
+        args: rdflib Graphs, e.g. an ontology or a SKOS vocabulary
+        """
+        self.instances = {}
+        self.subClasses = {}
+        self.children = {}
+        self.trees = {}
+        for graph in graphs:
+            self.addGraph(graph)
+
+    def addGraph(self, graph):
+        """Add the class memberships and hierarchy relations of graph."""
+        for instance, _, cls in graph.triples((None, RDF.type, None)):
+            self.instances.setdefault(cls, set()).add(instance)
+        for subClass, _, superClass in graph.triples((None, RDFS.subClassOf, None)):
+            self.subClasses.setdefault(superClass, set()).add(subClass)
+        for child, _, parent in graph.triples((None, SKOS.broader, None)):
+            self.children.setdefault(parent, set()).add(child)
+        for parent, _, child in graph.triples((None, SKOS.narrower, None)):
+            self.children.setdefault(parent, set()).add(child)
+        self.trees = {}
+
+    def instancesOf(self, cls):
+        """Return the instances of cls and of all its (transitive) sub classes."""
+        cls = rdflib.URIRef(cls)
+        instances = set(self.instances.get(cls, ()))
+        visited = {cls}
+        stack = [cls]
+        while stack:
+            for subClass in self.subClasses.get(stack.pop(), ()):
+                if subClass not in visited:
+                    visited.add(subClass)
+                    stack.append(subClass)
+                    instances.update(self.instances.get(subClass, ()))
+        return instances
+
+    def tree(self, cls):
+        """Return the instances of cls arranged as a tree.
+
+        returns: list of (instance, top, children) sorted by instance, top is True for the
+                 roots of the tree and children is the sorted list of child instances
+        """
+        key = rdflib.URIRef(cls)
+        tree = self.trees.get(key)
+        if tree is not None:
+            return tree
+
+        members = self.instancesOf(key)
+        children = {member: sorted(child for child in self.children.get(member, ())
+                                   if child in members and child != member)
+                    for member in members}
+        hasParent = {child for kids in children.values() for child in kids}
+        tops = {member for member in members if member not in hasParent}
+
+        # members that are only reachable through a cycle become roots as well
+        reached = self.reach(children, tops, set())
+        for member in sorted(members):
+            if member not in reached:
+                tops.add(member)
+                self.reach(children, [member], reached)
+
+        tree = [(member, member in tops, children[member]) for member in sorted(members)]
+        self.trees[key] = tree
+        return tree
+
+    @staticmethod
+    def reach(children, roots, reached):
+        """Add roots and all their descendants to the set reached and return it."""
+        stack = [root for root in roots if root not in reached]
+        reached.update(stack)
+        while stack:
+            for child in children[stack.pop()]:
+                if child not in reached:
+                    reached.add(child)
+                    stack.append(child)
+        return reached
@@ -0,0 +1,212 @@
+import hashlib
+import logging
+import multiprocessing
+import os
+import xml.etree.ElementTree as ElementTree
+from urllib.parse import unquote, urlparse
+import rdflib
+from .NTriples import parseLine
+from .Profiler import NULL_PROFILER
+
+OWL_IMPORTS = rdflib.URIRef('http://www.w3.org/2002/07/owl#imports')
+CATALOG_NS = '{urn:oasis:names:tc:entity:xmlns:xml:catalog}'
+EXTENSIONS = ('', '.ttl', '.nt', '.rdf', '.owl', '.n3', '.jsonld')
+
+
+def fileDigest(inputFilePath):
+    """Return the SHA-256 hash of the content of a file."""
+    digest = hashlib.sha256()
+    with open(inputFilePath, 'rb') as fp:
+        for chunk in iter(lambda: fp.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parseFile(task):
+    """Parse one file and return its triples as N-Triples.
+
+    Runs in a worker process. If cacheFile is given the N-Triples are also written to it.
+
+    args: tuple (path, cacheFile or None)
+    returns: tuple (path, string N-Triples)
+    """
+    inputFilePath, cacheFile = task
+    graph = rdflib.Graph()
+    graph.parse(inputFilePath, format=rdflib.util.guess_format(inputFilePath) or 'turtle')
+    data = graph.serialize(format='nt')
+    if cacheFile is not None:
+        temporary = '{}.{}.tmp'.format(cacheFile, os.getpid())
+        with open(temporary, 'w', encoding='utf-8') as fp:
+            fp.write(data)
+        os.replace(temporary, cacheFile)
+    return inputFilePath, data
+
+
+class ImportResolver:
+    """Load a shapes graph together with all files it imports with owl:imports.
+
+    Imported IRIs are resolved against a catalog and a mirror directory only, the network
+    is never used. The files of one level of the import tree are parsed in parallel by
+    worker processes, every file is loaded once even if it is imported several times. With
+    a cache directory the triples of every parsed file are kept as N-Triples named after
+    the content hash of the file, so later runs only parse the files that changed.
+    """
+
+    logger = logging.getLogger('ShacShifter.ImportResolver')
+
+    def __init__(self, catalog=None, mirror=None, cacheDirectory=None, jobs=1, profiler=None):
+        """Initialize the resolver.
+
+        args: string or dict catalog (optional), an OASIS XML catalog file (as written by
+              Protege) or a dict IRI -> path
+              string mirror (optional), a directory with the imported files, either as
+              host/path of the IRI or as the last segment of the IRI, with or without
+              file extension
+              string cacheDirectory (optional), where the parsed triples are cached
+              int jobs number of worker processes, all cores if 0 or None
+              Profiler profiler (optional)
+        """
+        if isinstance(catalog, str):
+            catalog = self.readCatalog(catalog)
+        self.catalog = catalog or {}
+        self.mirror = mirror
+        self.cacheDirectory = cacheDirectory
+        self.jobs = jobs or os.cpu_count() or 1
+        self.profiler = NULL_PROFILER if profiler is None else profiler
+        self.loaded = []
+        self.missing = []
+        self.parsed = 0
+        self.cached = 0
+
+    @staticmethod
+    def readCatalog(catalogFile):
+        """Read the uri entries of an OASIS XML catalog.
+
+        returns: dict IRI -> path, relative paths are resolved against the catalog
+        """
+        base = os.path.dirname(os.path.abspath(catalogFile))
+        catalog = {}
+        for element in ElementTree.parse(catalogFile).getroot().iter(CATALOG_NS + 'uri'):
+            name = element.get('name')
+            target = element.get('uri')
+            if not name or not target:
+                continue
+            if target.startswith('file:'):
+                target = unquote(urlparse(target).path)
+            catalog[name] = os.path.join(base, target)
+        return catalog
+
+    def resolve(self, iri):
+        """Return the local file of an imported IRI, None if there is none."""
+        iri = str(iri)
+        candidates = []
+        if iri in self.catalog:
+            candidates.append(self.catalog[iri])
+        parsed = urlparse(iri)
+        if parsed.scheme == 'file':
+            candidates.append(unquote(parsed.path))
+        if self.mirror is not None:
+            path = unquote(parsed.path).strip('/')
+            names = [os.path.join(parsed.netloc, path), os.path.basename(path)]
+            for name in names:
+                if name:
+                    candidates.extend(os.path.join(self.mirror, name) + extension
+                                      for extension in EXTENSIONS)
+        for candidate in candidates:
+            if os.path.isfile(candidate):
+                return candidate
+        return None
+
+    def cacheFile(self, digest):
+        if self.cacheDirectory is None:
+            return None
+        return os.path.join(self.cacheDirectory, digest + '.nt')
+
+    def load(self, inputFilePath, graph):
+        """Load inputFilePath and all files it imports, transitively, into graph.
+
+        Imports that can not be resolved are logged and listed in self.missing.
+
+        returns: list of the loaded files
+        """
+        self.loaded = []
+        self.missing = []
+        self.parsed = 0
+        self.cached = 0
+        if self.cacheDirectory is not None:
+            os.makedirs(self.cacheDirectory, exist_ok=True)
+        seenFiles = set()
+        seenDigests = set()
+        seenImports = set()
+        level = [inputFilePath]
+        pool = None
+        try:
+            while level:
+                tasks = []
+                cachedFiles = []
+                for path in level:
+                    realPath = os.path.realpath(path)
+                    if realPath in seenFiles:
+                        continue
+                    seenFiles.add(realPath)
+                    digest = fileDigest(path)
+                    if digest in seenDigests:
+                        # the same content under another name
+                        continue
+                    seenDigests.add(digest)
+                    self.loaded.append(path)
+                    cacheFile = self.cacheFile(digest)
+                    if cacheFile is not None and os.path.exists(cacheFile):
+                        cachedFiles.append(cacheFile)
+                    else:
+                        tasks.append((path, cacheFile))
+
+                if len(tasks) > 1 and self.jobs > 1 and pool is None:
+                    pool = multiprocessing.get_context().Pool(self.jobs)
+                if pool is not None and len(tasks) > 1:
+                    results = pool.imap(parseFile, tasks)
+                else:
+                    results = map(parseFile, tasks)
+
+                imports = []
+                for cacheFile in cachedFiles:
+                    with open(cacheFile, encoding='utf-8') as fp:
+                        imports.extend(self.addTriples(fp, graph))
+                    self.cached += 1
+                for path, data in results:
+                    imports.extend(self.addTriples(data.splitlines(), graph))
+                    self.parsed += 1
+
+                level = []
+                for iri in imports:
+                    if iri in seenImports:
+                        continue
+                    seenImports.add(iri)
+                    path = self.resolve(iri)
+                    if path is None:
+                        self.logger.warning('Could not resolve the import %s', iri)
+                        self.missing.append(str(iri))
+                    else:
+                        level.append(path)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+        self.logger.debug('%d files loaded, %d parsed and %d from the cache',
+                          len(self.loaded), self.parsed, self.cached)
+        self.profiler.count('importedFiles', len(self.loaded))
+        self.profiler.count('importedFilesCached', self.cached)
+        return self.loaded
+
+    @staticmethod
+    def addTriples(lines, graph):
+        """Add N-Triples lines to graph and return the objects of owl:imports."""
+        imports = []
+        for line in lines:
+            triple = parseLine(line)
+            if triple is None:
+                continue
+            if triple[1] == OWL_IMPORTS:
+                imports.append(triple[2])
+            graph.add(triple)
+        return imports
@@ -0,0 +1,271 @@
+import decimal
+import json
+import logging
+import re
+from .LabelIndex import LabelIndex
+from .Profiler import NULL_PROFILER
+from .ShapeNormalizer import ShapeNormalizer
+from .ShapeParser import ShapeParser
+from .ShardedWriter import ShardedWriter
+
+SCHEMA = 'https://json-schema.org/draft/2020-12/schema'
+XSD = 'http://www.w3.org/2001/XMLSchema#'
+
+# JSON type and format per datatype, all other datatypes are strings
+DATATYPES = {XSD + name: ('integer', None) for name in [
+    'integer', 'int', 'long', 'short', 'byte', 'nonNegativeInteger', 'positiveInteger',
+    'negativeInteger', 'nonPositiveInteger', 'unsignedLong', 'unsignedInt', 'unsignedShort',
+    'unsignedByte']}
+DATATYPES.update({
+    XSD + 'decimal': ('number', None),
+    XSD + 'float': ('number', None),
+    XSD + 'double': ('number', None),
+    XSD + 'boolean': ('boolean', None),
+    XSD + 'anyURI': ('string', 'uri'),
+    XSD + 'date': ('string', 'date'),
+    XSD + 'dateTime': ('string', 'date-time'),
+    XSD + 'time': ('string', 'time'),
+})
+# sh:flags that are flags of ECMAScript regular expressions as well
+PATTERN_FLAGS = set('ims')
+# vendor keyword for patterns with flags, the "pattern" keyword of JSON Schema has none
+FLAGGED_PATTERN = 'x-shacl-pattern'
+RANGES = [('minInclusive', 'minimum'), ('maxInclusive', 'maximum'),
+          ('minExclusive', 'exclusiveMinimum'), ('maxExclusive', 'exclusiveMaximum')]
+
+
+def jsonValue(value):
+    """Convert an rdflib term or a plain value of a detached shape into a JSON value."""
+    value = ShapeParser.plainValue(value)
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+class JSONSchemaSerializer:
+    """A serializer for JSON Schema documents that validate form input in the client.
+
+    The input of a form is a JSON object with the path of every property shape as key and
+    an array of values, nested instances of sh:node shapes are objects of the same form.
+    Every node shape becomes one document. The node shapes it references with sh:node are
+    definitions in its "$defs", every definition is computed once and shared by all
+    documents. Property shapes with complex or sequence paths are left out, like in the
+    RDForms output.
+    """
+
+    logger = logging.getLogger('ShacShifter.JSONSchemaSerializer')
+
+    def __init__(self, nodeShapes, outputfile=None, labels=None, language=None,
+                 normalizer=None, profiler=None):
+        """Initialize the serializer.
+
+        args: dict nodeShapes
+              string outputfile, sysout if None
+              LabelIndex labels (optional), e.g. ShapeParser.labels
+              string language (optional) preferred language of the titles
+              ShapeNormalizer normalizer (optional) shared cache of EffectiveShapes, the
+              property shapes of sh:and operands are properties of the schema as well
+              Profiler profiler (optional)
+        """
+        self.nodeShapes = nodeShapes
+        self.outputfile = outputfile
+        self.labels = LabelIndex() if labels is None else labels
+        self.language = language
+        self.normalizer = ShapeNormalizer() if normalizer is None else normalizer
+        self.profiler = NULL_PROFILER if profiler is None else profiler
+        self.definitions = {}
+        self.references = {}
+        # the names of the definitions do not depend on the order of the documents
+        self.keys = {}
+        taken = set()
+        for uri in sorted(nodeShapes):
+            base = re.sub(r'[^A-Za-z0-9_.-]+', '_', re.split(r'[/#]', uri.rstrip('/#'))[-1])
+            key = base or 'shape'
+            number = 1
+            while key in taken:
+                number += 1
+                key = '{}_{}'.format(base or 'shape', number)
+            taken.add(key)
+            self.keys[uri] = key
+
+    def write(self):
+        """Write the documents of all node shapes as one JSON object node shape URI -> schema.
+
+        returns: int number of documents
+        """
+        with self.profiler.phase('serialize'):
+            content = json.dumps({uri: self.document(uri) for uri in self.nodeShapes},
+                                 indent=4)
+        if self.outputfile:
+            with open(self.outputfile, 'w', encoding='utf-8') as fp:
+                fp.write(content + '\n')
+        else:
+            print(content)
+        self.profiler.count('jsonSchemas', len(self.nodeShapes))
+        return len(self.nodeShapes)
+
+    def writeShards(self, directory, compress=False):
+        """Write one document per node shape and a manifest into directory.
+
+        returns: dict manifest, see ShardedWriter
+        """
+        writer = ShardedWriter(directory, compress)
+        with self.profiler.phase('write'):
+            manifest = writer.write((uri, self.nodeShapes[uri].targetClass, self.document(uri))
+                                    for uri in self.nodeShapes)
+        self.profiler.count('shardsWritten', writer.written)
+        self.profiler.count('shardsUnchanged', writer.unchanged)
+        return manifest
+
+    def document(self, uri):
+        """Return the JSON Schema document of the node shape uri."""
+        document = {'$schema': SCHEMA}
+        document.update(self.definition(uri))
+        # the node shapes reachable with sh:node, the root only if it is part of a cycle
+        defs = {}
+        stack = list(self.nodeReferences(uri))
+        while stack:
+            reference = stack.pop()
+            key = self.keys[reference]
+            if key in defs:
+                continue
+            defs[key] = self.definition(reference)
+            stack.extend(self.nodeReferences(reference))
+        if defs:
+            document['$defs'] = {key: defs[key] for key in sorted(defs)}
+        return document
+
+    def nodeReferences(self, uri):
+        """Return the node shapes referenced with sh:node by the property shapes of uri."""
+        references = self.references.get(uri)
+        if references is None:
+            references = []
+            for propertyShape in self.normalizer.effective(self.nodeShapes[uri]).properties:
+                for nested in propertyShape.nodes:
+                    if nested in self.nodeShapes and nested not in references:
+                        references.append(nested)
+            self.references[uri] = references
+        return references
+
+    def definition(self, uri):
+        """Return the schema of the instances of the node shape uri (memoized)."""
+        definition = self.definitions.get(uri)
+        if definition is not None:
+            return definition
+        nodeShape = self.nodeShapes[uri]
+        properties = {}
+        required = []
+        for propertyShape in self.normalizer.effective(nodeShape).properties:
+            path = propertyShape.path
+            if not isinstance(path, str) or not path:
+                self.logger.info('Path %s not supported by JSON Schema', path)
+                continue
+            schema = self.propertySchema(propertyShape)
+            if path in properties:
+                # several property shapes constrain the same path
+                properties[path] = {'allOf': [properties[path], schema]}
+            else:
+                properties[path] = schema
+            if propertyShape.isSet['minCount'] and propertyShape.minCount > 0:
+                if path not in required:
+                    required.append(path)
+
+        definition = {'type': 'object',
+                      'title': LabelIndex.pick(self.labels.forResource(uri), self.language)}
+        if nodeShape.isSet['message']:
+            definition['description'] = LabelIndex.pick(nodeShape.message, self.language)
+        definition['properties'] = properties
+        if required:
+            definition['required'] = required
+        if nodeShape.closed:
+            for ignored in nodeShape.ignoredProperties:
+                properties.setdefault(ignored, {})
+            definition['additionalProperties'] = False
+        self.definitions[uri] = definition
+        return definition
+
+    def propertySchema(self, propertyShape):
+        """Return the schema of the array of values of a property shape."""
+        schema = {
+            'type': 'array',
+            'title': LabelIndex.pick(self.labels.forPropertyShape(propertyShape),
+                                     self.language)
+        }
+        if propertyShape.isSet['description']:
+            schema['description'] = propertyShape.description
+        schema['items'] = self.valueSchema(propertyShape)
+        if propertyShape.isSet['minCount'] and propertyShape.minCount > 0:
+            schema['minItems'] = propertyShape.minCount
+        if propertyShape.isSet['maxCount']:
+            schema['maxItems'] = propertyShape.maxCount
+        contains = [{'contains': {'const': jsonValue(value)}}
+                    for value in propertyShape.hasValue]
+        if len(contains) == 1:
+            schema.update(contains[0])
+        elif contains:
+            schema['allOf'] = contains
+        return schema
+
+    def valueSchema(self, propertyShape):
+        """Return the schema of a single value of a property shape."""
+        schema = {}
+        if propertyShape.isSet['shIn']:
+            schema['enum'] = [jsonValue(value) for value in propertyShape.shIn]
+        elif propertyShape.isSet['dataType']:
+            jsonType, jsonFormat = DATATYPES.get(propertyShape.dataType, ('string', None))
+            schema['type'] = jsonType
+            if jsonFormat is not None:
+                schema['format'] = jsonFormat
+        elif propertyShape.classes and not propertyShape.nodes:
+            schema['type'] = 'string'
+            schema['format'] = 'iri'
+
+        if propertyShape.isSet['minLength']:
+            schema['minLength'] = propertyShape.minLength
+        if propertyShape.isSet['maxLength']:
+            schema['maxLength'] = propertyShape.maxLength
+        if propertyShape.isSet['pattern']:
+            schema.update(self.pattern(propertyShape.pattern, propertyShape.flags))
+        for attribute, keyword in RANGES:
+            if propertyShape.isSet[attribute]:
+                bound = jsonValue(getattr(propertyShape, attribute))
+                if isinstance(bound, (int, float)) and not isinstance(bound, bool):
+                    schema[keyword] = bound
+                else:
+                    # JSON Schema only has numeric ranges, e.g. date bounds are left out
+                    self.logger.info('Range %s %s not supported by JSON Schema',
+                                     attribute, bound)
+
+        references = [{'$ref': '#/$defs/' + self.keys[uri]}
+                      for uri in propertyShape.nodes if uri in self.nodeShapes]
+        if not references:
+            return schema
+        if not schema and len(references) == 1:
+            return references[0]
+        return {'allOf': ([schema] if schema else []) + references}
+
+    def pattern(self, pattern, flags):
+        """Return the keywords of the value schema for sh:pattern and sh:flags.
+
+        A pattern without flags is the "pattern" keyword. The "pattern" keyword can not
+        carry flags and the inline modifiers of newer ECMAScript versions are not supported
+        by most validators, so a pattern with the flags i, m and s is the vendor keyword
+        x-shacl-pattern {"pattern": ..., "flags": ...} instead, for clients that construct
+        RegExp(pattern, flags) themselves. Patterns with other flags can not be expressed
+        and are left to the server.
+
+        returns: dict
+        """
+        if not flags:
+            return {'pattern': pattern}
+        if not set(flags) <= PATTERN_FLAGS:
+            self.logger.info('Flags %s of pattern %s not supported by JSON Schema',
+                             flags, pattern)
+            return {}
+        self.logger.warning('Pattern %s with flags %s is not checked by standard JSON Schema '
+                            'validators, see %s', pattern, flags, FLAGGED_PATTERN)
+        return {FLAGGED_PATTERN: {'pattern': pattern, 'flags': ''.join(sorted(set(flags)))}}
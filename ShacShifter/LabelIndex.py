@@ -0,0 +1,126 @@
+import rdflib
+from rdflib.namespace import RDFS, SKOS
+from .modules.Term import Term
+
+SH = rdflib.Namespace('http://www.w3.org/ns/shacl#')
+
+# label properties, the first one wins if a resource has labels in the same language
+LABEL_PROPERTIES = [SH.name, SKOS.prefLabel, RDFS.label]
+
+
+class LabelIndex:
+    """Multilingual labels for shapes, properties, classes and values.
+
+    The index is built with one lookup per label property over the shapes graph and
+    optionally ontology graphs, afterwards all lookups are dictionary accesses. Labels are
+    kept per language as dict language -> label, untagged labels use the key "default" like
+    the messages of the shapes.
+    """
+
+    def __init__(self, *graphs):
+        """Build the index from the given graphs.
+
+        args: rdflib Graphs, e.g. the shapes graph and an ontology
+        """
+        self.labels = {}
+        self.shapeNames = {}
+        for graph in graphs:
+            self.addGraph(graph)
+
+    def addGraph(self, graph):
+        """Add the sh:name, skos:prefLabel and rdfs:label triples of graph."""
+        for rank, predicate in enumerate(LABEL_PROPERTIES):
+            for subject, _, label in graph.triples((None, predicate, None)):
+                self.addLabel(rank, subject, label)
+
+    def copy(self):
+        """Return an independent copy of the index."""
+        index = LabelIndex()
+        index.labels = {resource: dict(labels) for resource, labels in self.labels.items()}
+        index.shapeNames = dict(self.shapeNames)
+        return index
+
+    def update(self, resources, *graphs):
+        """Recompute the labels of resources from graphs, e.g. after their triples changed."""
+        for resource in resources:
+            self.labels.pop(resource, None)
+            for rank, predicate in enumerate(LABEL_PROPERTIES):
+                for graph in graphs:
+                    for label in graph.objects(resource, predicate):
+                        self.addLabel(rank, resource, label)
+
+    def addLabel(self, rank, subject, label):
+        if not isinstance(label, rdflib.Literal):
+            return
+        language = label.language.lower() if label.language else 'default'
+        labels = self.labels.setdefault(subject, {})
+        current = labels.get(language)
+        # prefer the better label property, then the smaller text to be deterministic
+        if current is None or (rank, str(label)) < current:
+            labels[language] = (rank, str(label))
+
+    def get(self, resource):
+        """Return the labels of resource (an IRI or rdflib term) as dict language -> label."""
+        if not isinstance(resource, rdflib.term.Identifier):
+            resource = rdflib.URIRef(resource)
+        return {language: label for language, (_, label) in self.labels.get(resource, {}).items()}
+
+    def bind(self, propertyShape, shapeNode):
+        """Remember the sh:name labels of shapeNode for the parsed propertyShape.
+
+        Property shapes are often blank nodes, which are gone after the parse, so their
+        names are kept per PropertyShape object.
+        """
+        names = self.get(shapeNode)
+        if names:
+            self.shapeNames[propertyShape] = names
+
+    def forResource(self, resource):
+        """Return the labels of resource, or its local name as default label.
+
+        Literals (and plain values of detached shapes) are their own label.
+        """
+        if isinstance(resource, Term):
+            resource = resource.toTerm()
+        if isinstance(resource, rdflib.Literal) or not isinstance(resource, str):
+            return {'default': str(resource)}
+        labels = self.get(resource)
+        if not labels:
+            labels = {'default': self.localName(resource)}
+        return labels
+
+    def forPropertyShape(self, propertyShape):
+        """Return the labels of a property shape.
+
+        These are the sh:name values of the shape, otherwise the labels of its path property
+        and finally the local name of the path.
+        """
+        names = self.shapeNames.get(propertyShape)
+        if names:
+            return names
+        if propertyShape.isSet['name']:
+            return {'default': propertyShape.name}
+        if isinstance(propertyShape.path, str):
+            return self.forResource(propertyShape.path)
+        return {'default': str(propertyShape.path)}
+
+    @staticmethod
+    def localName(resource):
+        """Return the part of an IRI after the last slash or hash."""
+        return str(resource).rsplit('/', 1)[-1].rsplit('#', 1)[-1]
+
+    @staticmethod
+    def pick(labels, language=None):
+        """Choose one label of a dict language -> label.
+
+        The order is language, language without region, "default", "en" and any other.
+        """
+        if language:
+            language = language.lower()
+            for candidate in [language, language.split('-')[0]]:
+                if candidate in labels:
+                    return labels[candidate]
+        for candidate in ['default', 'en']:
+            if candidate in labels:
+                return labels[candidate]
+        return labels[min(labels)] if labels else ''
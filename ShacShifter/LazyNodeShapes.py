@@ -0,0 +1,52 @@
+from collections.abc import Mapping
+
+
+class LazyNodeShapes(Mapping):
+    """A read only mapping of node shape URIs to NodeShapes that are extracted on first access.
+
+    The URIs come from the discovery of the parser, a node shape and its property shapes
+    are only parsed when the shape is accessed and then cached in the nodeShapes of the
+    parser. The URIs are iterated in sorted order. The time budget of the ParserLimits
+    applies to every extraction.
+
+    The mapping reads the graph of the parser, so it becomes invalid when the parser parses
+    another file or is reset.
+    """
+
+    def __init__(self, parser, nodeShapeUris):
+        """Initialize the mapping.
+
+        args: ShapeParser parser with the loaded shapes graph
+              iterable nodeShapeUris as returned by ShapeParser.getNodeShapeUris()
+        """
+        self.parser = parser
+        self.graph = parser.g
+        self.nodes = {str(node): node for node in nodeShapeUris}
+        self.uris = sorted(self.nodes)
+
+    def __getitem__(self, uri):
+        if self.parser.g is not self.graph:
+            raise Exception('The parser of the lazy node shapes parsed another file')
+        nodeShape = self.parser.nodeShapes.get(uri)
+        if nodeShape is not None:
+            return nodeShape
+        node = self.nodes[uri]
+        self.parser.deadline = self.parser.limits.deadline()
+        return self.parser.extractNodeShape(node)
+
+    def __iter__(self):
+        return iter(self.uris)
+
+    def __len__(self):
+        return len(self.uris)
+
+    def __contains__(self, uri):
+        return uri in self.nodes
+
+    def materialized(self):
+        """Return the URIs of the node shapes that were extracted already."""
+        return [uri for uri in self.uris if uri in self.parser.nodeShapes]
+
+    def materializeAll(self):
+        """Extract all node shapes and return them as a dictionary."""
+        return {uri: self[uri] for uri in self.uris}
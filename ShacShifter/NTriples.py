@@ -0,0 +1,101 @@
+"""Line based reading of N-Triples, shared by the streaming and parallel loaders."""
+import gzip
+import re
+import rdflib
+
+IRI = r'<([^>]*)>'
+BNODE = r'_:([^\s.]+(?:\.+[^\s.]+)*)'
+LITERAL = r'"((?:[^"\\]|\\.)*)"(?:@([a-zA-Z]+(?:-[a-zA-Z0-9]+)*)|\^\^<([^>]*)>)?'
+
+TRIPLE = re.compile(
+    r'\s*(?:{iri}|{bnode})\s*{iri}\s*(?:{iri}|{bnode}|{literal})\s*\.\s*(?:#.*)?$'.format(
+        iri=IRI, bnode=BNODE, literal=LITERAL))
+
+ESCAPE = re.compile(r'\\(?:u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))')
+ESCAPES = {'t': '\t', 'b': '\b', 'n': '\n', 'r': '\r', 'f': '\f', '"': '"', "'": "'", '\\': '\\'}
+
+
+class NTriplesError(Exception):
+    """Raised for lines that are no valid N-Triples."""
+
+
+def unescape(value):
+    if '\\' not in value:
+        return value
+
+    def replace(match):
+        code = match.group(1) or match.group(2)
+        if code:
+            return chr(int(code, 16))
+        return ESCAPES.get(match.group(3), match.group(0))
+    return ESCAPE.sub(replace, value)
+
+
+def matchLine(line):
+    """Split one line of N-Triples into its escaped parts, without creating rdflib terms.
+
+    returns: tuple (subjectIri, subjectBnode, predicate, objectIri, objectBnode, lexical,
+             language, datatype), parts that do not occur are None, or None for empty
+             lines and comments
+    """
+    stripped = line.strip()
+    if not stripped or stripped.startswith('#'):
+        return None
+    match = TRIPLE.match(stripped)
+    if match is None:
+        raise NTriplesError('Invalid N-Triples line: {}'.format(stripped))
+    return match.groups()
+
+
+def parseLine(line):
+    """Parse one line of N-Triples.
+
+    returns: tuple of rdflib terms (subject, predicate, object) or None for empty lines
+             and comments
+    """
+    parts = matchLine(line)
+    if parts is None:
+        return None
+    (subjectIri, subjectBnode, predicate, objectIri, objectBnode,
+     lexical, language, datatype) = parts
+
+    if subjectIri is not None:
+        subject = rdflib.URIRef(unescape(subjectIri))
+    else:
+        subject = rdflib.BNode(subjectBnode)
+
+    if objectIri is not None:
+        obj = rdflib.URIRef(unescape(objectIri))
+    elif objectBnode is not None:
+        obj = rdflib.BNode(objectBnode)
+    else:
+        obj = rdflib.Literal(
+            unescape(lexical), lang=language,
+            datatype=rdflib.URIRef(unescape(datatype)) if datatype else None)
+
+    return subject, rdflib.URIRef(unescape(predicate)), obj
+
+
+def subjectKey(line):
+    """Return the subject of a line in N-Triples notation, without creating rdflib terms.
+
+    Escapes in the IRI are resolved, so all lines of a subject have the same key, even
+    without whitespace after the subject.
+
+    raises: NTriplesError for lines that are no valid N-Triples
+    """
+    parts = matchLine(line)
+    if parts is None:
+        return ''
+    if parts[0] is not None:
+        return '<{}>'.format(unescape(parts[0]))
+    return '_:' + parts[1]
+
+
+def openNTriples(inputFilePath, mode='rt'):
+    """Open an N-Triples file, files ending with .gz are decompressed while reading."""
+    if inputFilePath.endswith('.gz'):
+        return gzip.open(inputFilePath, mode, encoding='utf-8' if 't' in mode else None)
+    if 't' in mode:
+        return open(inputFilePath, mode, encoding='utf-8')
+    return open(inputFilePath, mode)
@@ -0,0 +1,169 @@
+import array
+import logging
+import multiprocessing
+import os
+import rdflib
+from .ImportResolver import OWL_IMPORTS
+from .LabelIndex import LABEL_PROPERTIES
+from .NTriples import matchLine, openNTriples, unescape
+from .Profiler import NULL_PROFILER, CountingGraph
+
+SH = 'http://www.w3.org/ns/shacl#'
+RDF_TYPE = str(rdflib.RDF.type)
+# predicates the ShapeParser reads besides the SHACL vocabulary
+RELEVANT_PREDICATES = frozenset(
+    str(predicate) for predicate in LABEL_PROPERTIES + [rdflib.RDF.first, rdflib.RDF.rest,
+                                                        OWL_IMPORTS])
+CHUNK_BYTES = 16 * 2 ** 20
+
+
+def isRelevant(predicate, objectIri):
+    """Check if a triple can matter to the ShapeParser, given its (unescaped) IRIs.
+
+    These are SHACL triples, rdf:type SHACL classes, RDF lists, labels and owl:imports.
+    """
+    return (predicate.startswith(SH) or predicate in RELEVANT_PREDICATES or
+            (predicate == RDF_TYPE and objectIri is not None and objectIri.startswith(SH)))
+
+
+def decodeTerm(key):
+    """Create the rdflib term of a key of loadChunk()."""
+    if isinstance(key, str):
+        return rdflib.URIRef(key)
+    if len(key) == 2:
+        return rdflib.BNode(key[1])
+    lexical, language, datatype = key
+    return rdflib.Literal(lexical, lang=language,
+                          datatype=None if datatype is None else rdflib.URIRef(datatype))
+
+
+def loadChunk(task):
+    """Parse the lines of a file between two byte offsets.
+
+    Runs in a worker process. Every distinct term of the chunk is encoded once: IRIs as
+    string, blank nodes as ("_", label) and literals as (lexical, language, datatype).
+    The triples are three indexes into the terms each.
+
+    args: tuple (path, start, end, relevantOnly), end None reads the whole file
+    returns: tuple (list of term keys, array of term indexes, int number of lines)
+    """
+    inputFilePath, start, end, relevantOnly = task
+    terms = {}
+    triples = array.array('I')
+    lines = 0
+
+    def index(key):
+        number = terms.get(key)
+        if number is None:
+            number = terms[key] = len(terms)
+        return number
+
+    with openNTriples(inputFilePath, 'rb') as fp:
+        fp.seek(start)
+        position = start
+        while end is None or position < end:
+            line = fp.readline()
+            if not line:
+                break
+            position += len(line)
+            lines += 1
+            parts = matchLine(line.decode('utf-8'))
+            if parts is None:
+                continue
+            (subjectIri, subjectBnode, predicate, objectIri, objectBnode,
+             lexical, language, datatype) = parts
+            predicate = unescape(predicate)
+            objectIri = None if objectIri is None else unescape(objectIri)
+            if relevantOnly and not isRelevant(predicate, objectIri):
+                continue
+            if subjectIri is not None:
+                triples.append(index(unescape(subjectIri)))
+            else:
+                triples.append(index(('_', subjectBnode)))
+            triples.append(index(predicate))
+            if objectIri is not None:
+                triples.append(index(objectIri))
+            elif objectBnode is not None:
+                triples.append(index(('_', objectBnode)))
+            else:
+                triples.append(index((unescape(lexical), language,
+                                      unescape(datatype) if datatype else None)))
+    return list(terms), triples, lines
+
+
+class NTriplesLoader:
+    """Load large N-Triples files with a pool of worker processes.
+
+    The file is split into chunks at line boundaries, every chunk is parsed by a worker
+    that only keeps the triples the ShapeParser reads (see isRelevant()) and sends them back
+    encoded (see loadChunk()). The chunks are merged into the graph in file order. Blank
+    node labels are kept, so a blank node shared by two chunks stays one node. Compressed
+    files can not be split and are read by one worker.
+    """
+
+    logger = logging.getLogger('ShacShifter.NTriplesLoader')
+
+    def __init__(self, jobs=1, relevantOnly=True, chunkBytes=CHUNK_BYTES, profiler=None):
+        """Initialize the loader.
+
+        args: int jobs number of worker processes, all cores if 0 or None
+              bool relevantOnly, skip the triples the ShapeParser does not read
+              int chunkBytes size of the chunks
+              Profiler profiler (optional)
+        """
+        self.jobs = jobs or os.cpu_count() or 1
+        self.relevantOnly = relevantOnly
+        self.chunkBytes = chunkBytes
+        self.profiler = NULL_PROFILER if profiler is None else profiler
+        self.lines = 0
+        self.triples = 0
+
+    def chunks(self, inputFilePath):
+        """Return the (start, end) byte offsets of the chunks of a file.
+
+        Every chunk ends after a line break, end None is the rest of the file.
+        """
+        if inputFilePath.endswith('.gz'):
+            return [(0, None)]
+        size = os.path.getsize(inputFilePath)
+        offsets = [0]
+        with open(inputFilePath, 'rb') as fp:
+            while offsets[-1] + self.chunkBytes < size:
+                fp.seek(offsets[-1] + self.chunkBytes)
+                fp.readline()
+                if fp.tell() >= size:
+                    break
+                offsets.append(fp.tell())
+        return list(zip(offsets, offsets[1:] + [None]))
+
+    def load(self, inputFilePath, graph):
+        """Load the triples of an N-Triples file into graph.
+
+        returns: int number of loaded triples
+        """
+        self.lines = 0
+        self.triples = 0
+        tasks = [(inputFilePath, start, end, self.relevantOnly)
+                 for start, end in self.chunks(inputFilePath)]
+        # rdflib drops quads whose context is not the graph itself
+        store = graph.graph if isinstance(graph, CountingGraph) else graph
+        pool = None
+        if self.jobs > 1 and len(tasks) > 1:
+            pool = multiprocessing.get_context().Pool(min(self.jobs, len(tasks)))
+        try:
+            results = map(loadChunk, tasks) if pool is None else pool.imap(loadChunk, tasks)
+            for keys, triples, lines in results:
+                nodes = [decodeTerm(key) for key in keys]
+                store.addN((nodes[triples[n]], nodes[triples[n + 1]], nodes[triples[n + 2]],
+                            store) for n in range(0, len(triples), 3))
+                self.lines += lines
+                self.triples += len(triples) // 3
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+        self.logger.debug('%d of %d lines loaded from %d chunks', self.triples, self.lines,
+                          len(tasks))
+        self.profiler.count('ntriplesLines', self.lines)
+        self.profiler.count('ntriplesChunks', len(tasks))
+        return self.triples
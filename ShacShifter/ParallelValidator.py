@@ -0,0 +1,99 @@
+import logging
+import multiprocessing
+import os
+import rdflib
+from .ShapeValidator import ShapeValidator, ValidationContext, ValidationReport
+
+# the validator and data graph of a worker process, set once by initWorker()
+worker = None
+
+
+def loadGraph(inputFilePath):
+    """Load a data graph, the format is guessed from the file extension."""
+    graph = rdflib.Graph()
+    graph.parse(inputFilePath, format=rdflib.util.guess_format(inputFilePath) or 'turtle')
+    return graph
+
+
+def initWorker(nodeShapes, dataFile, dataGraph=None):
+    """Compile the shapes and load the data once per worker process.
+
+    With the fork start method the parent's data graph is inherited, otherwise every
+    worker parses dataFile itself.
+    """
+    global worker
+    if dataGraph is None:
+        dataGraph = loadGraph(dataFile)
+    validator = ShapeValidator(nodeShapes)
+    worker = (validator, ValidationContext(validator, dataGraph))
+
+
+def checkShard(task):
+    """Validate one shard, i.e. a list of focus nodes of one node shape."""
+    shapeUri, focusNodes = task
+    validator, context = worker
+    results = []
+    validator.checkFocusNodes(shapeUri, focusNodes, context, results)
+    return results
+
+
+class ParallelValidator:
+    """Validate a data graph with a pool of worker processes.
+
+    The focus nodes of every node shape are split into shards of shardSize nodes that are
+    checked by the workers. Every worker compiles the shapes and loads the data graph once
+    when it starts, the tasks only carry the shape URI and the focus nodes. The results are
+    merged in the order of the shards, so the report equals the one of ShapeValidator.
+    """
+
+    logger = logging.getLogger('ShacShifter.ParallelValidator')
+
+    def __init__(self, nodeShapes, jobs=None, shardSize=1000):
+        """Compile the target index of the node shapes.
+
+        args: dict nodeShapes as returned by ShapeParser.parseShape()
+              int jobs number of worker processes, all cores if None
+              int shardSize number of focus nodes per task
+        """
+        self.nodeShapes = nodeShapes
+        self.jobs = jobs or os.cpu_count() or 1
+        self.shardSize = shardSize
+        self.validator = ShapeValidator(nodeShapes)
+
+    def shards(self, focusNodes):
+        """Yield the tasks (shape URI, list of focus nodes) in report order."""
+        for uri in self.nodeShapes:
+            nodes = sorted(focusNodes.get(uri, ()))
+            for start in range(0, len(nodes), self.shardSize):
+                yield uri, nodes[start:start + self.shardSize]
+
+    def validate(self, dataFile, dataGraph=None):
+        """Validate the data graph in dataFile and return a ValidationReport.
+
+        args: string dataFile path of the data graph
+              rdflib Graph dataGraph (optional) the already loaded data of dataFile
+        """
+        if dataGraph is None:
+            dataGraph = loadGraph(dataFile)
+        tasks = list(self.shards(self.validator.targetIndex.focusNodes(dataGraph)))
+        if self.jobs == 1 or len(tasks) < 2:
+            context = ValidationContext(self.validator, dataGraph)
+            results = []
+            for shapeUri, focusNodes in tasks:
+                self.validator.checkFocusNodes(shapeUri, focusNodes, context, results)
+            return ValidationReport(results)
+
+        methods = multiprocessing.get_all_start_methods()
+        if 'fork' in methods:
+            pool = multiprocessing.get_context('fork').Pool(
+                self.jobs, initWorker, (self.nodeShapes, dataFile, dataGraph))
+        else:
+            pool = multiprocessing.get_context().Pool(
+                self.jobs, initWorker, (self.nodeShapes, dataFile))
+        self.logger.debug('Validating %s shards with %s workers', len(tasks), self.jobs)
+
+        results = []
+        with pool:
+            for shardResults in pool.imap(checkShard, tasks):
+                results.extend(shardResults)
+        return ValidationReport(results)
@@ -0,0 +1,122 @@
+import time
+import rdflib
+
+
+class ShapeParserLimitError(Exception):
+    """Raised by ShapeParser if an input exceeds one of its ParserLimits.
+
+    limit is the name of the exceeded limit (an attribute of ParserLimits, or "cycle" for
+    cyclic lists and shape references), value the observed value, maximum the configured
+    maximum and node the RDF node where it happened, if known.
+    """
+
+    def __init__(self, limit, value, maximum, node=None):
+        self.limit = limit
+        self.value = value
+        self.maximum = maximum
+        self.node = None if node is None else str(node)
+        if limit == 'cycle':
+            message = 'Cycle detected at {}'.format(self.node)
+        else:
+            message = 'Limit {} exceeded: {} > {}'.format(limit, value, maximum)
+            if self.node is not None:
+                message += ' at {}'.format(self.node)
+        super().__init__(message)
+
+
+class ParserLimits:
+    """Limits that protect the ShapeParser against pathological or hostile input.
+
+    All limits are optional, None means unlimited. The defaults only reject inputs that no
+    real shapes graph needs. Cycles in RDF lists and sh:qualifiedValueShape references are
+    always rejected.
+    """
+
+    def __init__(self, maxTriples=None, maxListLength=100000, maxPathDepth=100,
+                 maxRecursionDepth=50, timeBudget=None):
+        """Configure the limits.
+
+        args: int maxTriples number of triples of the shapes graph
+              int maxListLength number of members of an RDF list
+              int maxPathDepth nesting depth of property paths
+              int maxRecursionDepth nesting depth of sh:qualifiedValueShape and, separately,
+              of the operands of sh:and, sh:or, sh:xone and sh:not
+              float timeBudget seconds a single parseShape() call may take
+        """
+        self.maxTriples = maxTriples
+        self.maxListLength = maxListLength
+        self.maxPathDepth = maxPathDepth
+        self.maxRecursionDepth = maxRecursionDepth
+        self.timeBudget = timeBudget
+
+    def check(self, limit, value, node=None):
+        """Raise a ShapeParserLimitError if value exceeds the limit with the given name."""
+        maximum = getattr(self, limit)
+        if maximum is not None and value > maximum:
+            raise ShapeParserLimitError(limit, value, maximum, node)
+
+    def deadline(self):
+        """Return the time.monotonic() deadline for a parse starting now, or None."""
+        if self.timeBudget is None:
+            return None
+        return time.monotonic() + self.timeBudget
+
+    def checkDeadline(self, deadline):
+        """Raise a ShapeParserLimitError if the deadline of the time budget has passed."""
+        if deadline is not None and time.monotonic() > deadline:
+            raise ShapeParserLimitError(
+                'timeBudget', self.timeBudget + time.monotonic() - deadline, self.timeBudget)
+
+    def limitsLoading(self):
+        """Check if maxTriples or timeBudget have to be enforced while a graph is loaded."""
+        return self.maxTriples is not None or self.timeBudget is not None
+
+
+class LimitedGraph(rdflib.Graph):
+    """An rdflib Graph that enforces maxTriples and the time budget while triples are added.
+
+    The parsers of rdflib, the ImportResolver and the NTriplesLoader add triples one by one
+    or with addN(), so an oversized or slow input is rejected while it is loaded instead of
+    after it is in memory. The limits are checked every CHECK_INTERVAL added triples, the
+    number of triples is only counted (len()) once more triples were added than allowed, so
+    duplicates do not count.
+    """
+
+    CHECK_INTERVAL = 1024
+
+    def __init__(self, limits, deadline=None):
+        """Initialize an empty graph.
+
+        args: ParserLimits limits
+              float deadline (optional) time.monotonic() deadline, see ParserLimits.deadline()
+        """
+        super().__init__()
+        self.limits = limits
+        self.deadline = deadline
+        self.added = 0
+
+    def add(self, triple):
+        self.added += 1
+        if not self.added % self.CHECK_INTERVAL:
+            self.checkLimits()
+        return super().add(triple)
+
+    def addN(self, quads):
+        return super().addN(self.countQuads(quads))
+
+    def countQuads(self, quads):
+        for quad in quads:
+            self.added += 1
+            if not self.added % self.CHECK_INTERVAL:
+                self.checkLimits()
+            yield quad
+
+    def checkLimits(self):
+        """Raise a ShapeParserLimitError if the graph exceeds a limit."""
+        maxTriples = self.limits.maxTriples
+        if maxTriples is not None and self.added > maxTriples:
+            self.limits.check('maxTriples', len(self))
+        self.limits.checkDeadline(self.deadline)
+
+
+UNLIMITED = ParserLimits(maxListLength=None, maxPathDepth=None, maxRecursionDepth=None)
@@ -0,0 +1,211 @@
+import rdflib
+
+SH = rdflib.Namespace('http://www.w3.org/ns/shacl#')
+
+ALTERNATIVE = str(SH.alternativePath)
+INVERSE = str(SH.inversePath)
+ZERO_OR_MORE = str(SH.zeroOrMorePath)
+ONE_OR_MORE = str(SH.oneOrMorePath)
+ZERO_OR_ONE = str(SH.zeroOrOnePath)
+
+
+class PathEvaluator:
+    """Evaluate SHACL property paths over a data graph.
+
+    Paths are given in the form produced by ShapeParser.getPropertyPath(): a predicate IRI,
+    a list for sequence paths or a dict with one of the path operators as key. Results are
+    memoized per (path, start node), and all evaluation is done for sets of start nodes at
+    once, so every node is expanded only once per path. Transitive closures are computed
+    over the strongly connected components of the step relation, which is safe for cycles
+    and shares the reachable sets of all nodes of a component.
+    """
+
+    def __init__(self, graph):
+        self.g = graph
+        self.memo = {}
+
+    def values(self, focusNode, path):
+        """Return the value nodes of path for focusNode as frozenset."""
+        return self.evaluate(path, [focusNode])[focusNode]
+
+    def evaluate(self, path, focusNodes):
+        """Evaluate path for many focus nodes at once.
+
+        returns: dict focus node -> frozenset of value nodes
+        """
+        key = self.pathKey(path)
+        memo = self.memo.setdefault(key, {})
+        missing = [node for node in set(focusNodes) if node not in memo]
+        if missing:
+            self.compute(path, key, missing, memo)
+        return {node: memo[node] for node in focusNodes}
+
+    def pathKey(self, path):
+        """Return a hashable key for a path structure."""
+        if isinstance(path, list):
+            return ('sequence',) + tuple(self.pathKey(step) for step in path)
+        if isinstance(path, dict):
+            (operator, inner), = path.items()
+            operator = str(operator)
+            if operator == ALTERNATIVE:
+                alternatives = inner if isinstance(inner, list) else [inner]
+                return (operator,) + tuple(self.pathKey(part) for part in alternatives)
+            return (operator, self.pathKey(inner))
+        return str(path)
+
+    def compute(self, path, key, nodes, memo):
+        if isinstance(key, str):
+            predicate = rdflib.URIRef(key)
+            for node in nodes:
+                memo[node] = frozenset(self.g.objects(node, predicate))
+            return
+
+        operator = key[0]
+        if operator == 'sequence':
+            self.computeSequence(path, nodes, memo)
+        elif operator == ALTERNATIVE:
+            (_, inner), = path.items()
+            alternatives = inner if isinstance(inner, list) else [inner]
+            results = [self.evaluate(part, nodes) for part in alternatives]
+            for node in nodes:
+                memo[node] = frozenset().union(*(result[node] for result in results))
+        elif operator == INVERSE:
+            (_, inner), = path.items()
+            if isinstance(inner, (list, dict)):
+                self.computeInverse(inner, nodes, memo)
+            else:
+                predicate = rdflib.URIRef(inner)
+                for node in nodes:
+                    memo[node] = frozenset(self.g.subjects(predicate, node))
+        elif operator == ZERO_OR_ONE:
+            (_, inner), = path.items()
+            result = self.evaluate(inner, nodes)
+            for node in nodes:
+                memo[node] = result[node] | {node}
+        else:
+            (_, inner), = path.items()
+            self.computeClosure(inner, nodes, memo, operator == ZERO_OR_MORE)
+
+    def computeSequence(self, path, nodes, memo):
+        # evaluate step by step for the set of all intermediate nodes
+        reached = {node: frozenset([node]) for node in nodes}
+        for step in path:
+            intermediates = set()
+            for values in reached.values():
+                intermediates.update(values)
+            result = self.evaluate(step, intermediates)
+            reached = {
+                node: frozenset().union(*(result[value] for value in values))
+                for node, values in reached.items()
+            }
+        memo.update(reached)
+
+    def computeInverse(self, inner, nodes, memo):
+        result = self.evaluate(self.invert(inner), nodes)
+        memo.update(result)
+
+    def invert(self, path):
+        """Return the inverse of a path structure."""
+        if isinstance(path, list):
+            return [self.invert(step) for step in reversed(path)]
+        if isinstance(path, dict):
+            (operator, inner), = path.items()
+            operator = str(operator)
+            if operator == INVERSE:
+                return inner
+            if operator == ALTERNATIVE:
+                alternatives = inner if isinstance(inner, list) else [inner]
+                return {ALTERNATIVE: [self.invert(part) for part in alternatives]}
+            return {operator: self.invert(inner)}
+        return {INVERSE: path}
+
+    def computeClosure(self, inner, nodes, memo, reflexive):
+        """Compute the transitive closure of the path inner for nodes.
+
+        The reachable nodes are expanded breadth first, one batch per level, then the
+        closure is computed per strongly connected component in reverse topological order.
+        """
+        key = self.pathKey(inner)
+        oneOrMore = self.memo.setdefault((ONE_OR_MORE, key), {})
+
+        successors = {}
+        frontier = [node for node in nodes if node not in oneOrMore]
+        while frontier:
+            result = self.evaluate(inner, frontier)
+            successors.update(result)
+            frontier = {value for values in result.values() for value in values
+                        if value not in successors and value not in oneOrMore}
+
+        for component in self.components(successors, oneOrMore):
+            members = frozenset(component)
+            reachable = set()
+            cyclic = len(component) > 1
+            for node in component:
+                for value in successors[node]:
+                    if value in members:
+                        cyclic = True
+                    else:
+                        reachable.add(value)
+                        reachable.update(oneOrMore[value])
+            if cyclic:
+                reachable.update(members)
+            reachable = frozenset(reachable)
+            for node in component:
+                oneOrMore[node] = reachable
+
+        for node in nodes:
+            memo[node] = oneOrMore[node] | {node} if reflexive else oneOrMore[node]
+
+    def components(self, successors, done):
+        """Yield the strongly connected components of successors (Tarjan, iterative).
+
+        Components are yielded in reverse topological order, nodes in done are treated
+        as already finished components.
+        """
+        index = {}
+        lowlink = {}
+        stack = []
+        onStack = set()
+        counter = 0
+
+        for root in successors:
+            if root in index:
+                continue
+            work = [(root, iter(successors[root]))]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            onStack.add(root)
+
+            while work:
+                node, children = work[-1]
+                advanced = False
+                for child in children:
+                    if child in done or child not in successors:
+                        continue
+                    if child not in index:
+                        index[child] = lowlink[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        onStack.add(child)
+                        work.append((child, iter(successors[child])))
+                        advanced = True
+                        break
+                    elif child in onStack:
+                        lowlink[node] = min(lowlink[node], index[child])
+                if advanced:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        onStack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    yield component
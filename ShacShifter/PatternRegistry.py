@@ -0,0 +1,128 @@
+import re
+import time
+
+# SHACL uses the flags of XPath fn:matches, q means the pattern is taken literally
+FLAGS = {'i': re.IGNORECASE, 's': re.DOTALL, 'm': re.MULTILINE, 'x': re.VERBOSE}
+
+METACHARACTERS = set('.^$*+?{}[]|()\\')
+ESCAPED = re.compile(r'\\([.^$*+?{}\[\]|()\\/-])')
+
+
+class Pattern:
+    """A compiled sh:pattern with its matcher and evaluation statistics.
+
+    kind is one of "regex", "equals", "prefix", "suffix" and "contains", for all but
+    "regex" the pattern is a literal string and search() uses string methods.
+    """
+
+    def __init__(self, pattern, flags='', timed=False):
+        self.pattern = pattern
+        self.flags = flags
+        self.kind, self.literal = self.analyze(pattern, flags)
+        self.regex = None
+        if self.kind == 'regex':
+            reFlags = 0
+            for flag in flags:
+                reFlags |= FLAGS.get(flag, 0)
+            self.regex = re.compile(re.escape(pattern) if 'q' in flags else pattern, reFlags)
+        self.uses = 0
+        self.calls = 0
+        self.seconds = 0.0
+        self.maxSeconds = 0.0
+        self.test = self.matcher()
+        self.search = self.timedSearch if timed else self.test
+
+    @staticmethod
+    def analyze(pattern, flags):
+        """Return (kind, literal) for pattern.
+
+        Only patterns without flags (or with q alone) that consist of literal characters,
+        optionally anchored with ^ and $, get a fast path.
+        """
+        if 'q' in flags:
+            return ('contains', pattern) if set(flags) == {'q'} else ('regex', None)
+        if flags:
+            return 'regex', None
+        start = pattern.startswith('^')
+        end = pattern.endswith('$') and not pattern.endswith('\\$')
+        body = pattern[1 if start else 0:len(pattern) - 1 if end else len(pattern)]
+        literal = ESCAPED.sub(r'\1', body)
+        if METACHARACTERS.intersection(ESCAPED.sub('', body)):
+            return 'regex', None
+        if start and end:
+            return 'equals', literal
+        if start:
+            return 'prefix', literal
+        if end:
+            return 'suffix', literal
+        return 'contains', literal
+
+    def matcher(self):
+        """Return a function value -> bool implementing the pattern for plain strings."""
+        literal = self.literal
+        # like the re module, $ also matches before a final newline
+        if self.kind == 'equals':
+            withNewline = literal + '\n'
+            return lambda value: value == literal or value == withNewline
+        if self.kind == 'prefix':
+            return lambda value: value.startswith(literal)
+        if self.kind == 'suffix':
+            withNewline = literal + '\n'
+            return lambda value: value.endswith(literal) or value.endswith(withNewline)
+        if self.kind == 'contains':
+            return lambda value: literal in value
+        search = self.regex.search
+        return lambda value: search(value) is not None
+
+    def timedSearch(self, value):
+        start = time.perf_counter()
+        result = self.test(value)
+        elapsed = time.perf_counter() - start
+        self.calls += 1
+        self.seconds += elapsed
+        if elapsed > self.maxSeconds:
+            self.maxSeconds = elapsed
+        return result
+
+    def stats(self):
+        return {
+            'pattern': self.pattern,
+            'flags': self.flags,
+            'kind': self.kind,
+            'uses': self.uses,
+            'calls': self.calls,
+            'seconds': self.seconds,
+            'maxSeconds': self.maxSeconds
+        }
+
+
+class PatternRegistry:
+    """A shared cache of compiled sh:pattern expressions.
+
+    Patterns are compiled once per (pattern, flags), no matter how many property shapes use
+    them. If timed is True every evaluation is timed, stats() then shows which patterns are
+    expensive, e.g. because of catastrophic backtracking.
+    """
+
+    def __init__(self, timed=False):
+        self.timed = timed
+        self.patterns = {}
+
+    def get(self, pattern, flags=''):
+        """Return the Pattern for pattern and flags (a string of SHACL flag characters)."""
+        flags = ''.join(sorted(set(flags or '')))
+        key = (pattern, flags)
+        compiled = self.patterns.get(key)
+        if compiled is None:
+            compiled = Pattern(pattern, flags, self.timed)
+            self.patterns[key] = compiled
+        compiled.uses += 1
+        return compiled
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def stats(self):
+        """Return the statistics of all patterns, the most expensive first."""
+        return sorted((pattern.stats() for pattern in self.patterns.values()),
+                      key=lambda stats: (-stats['seconds'], stats['pattern'], stats['flags']))
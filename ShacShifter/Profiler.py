@@ -0,0 +1,215 @@
+import json
+import time
+import tracemalloc
+
+# tracemalloc.reset_peak() is available since Python 3.9
+RESET_PEAK = hasattr(tracemalloc, 'reset_peak')
+
+
+class Profiler:
+    """Collect per-phase timings and counters of a ShacShifter run.
+
+    Phases are timed with wall and CPU clocks, nested phases are timed inclusively.
+    If traceMemory is True, tracemalloc is used to record the peak of traced memory
+    per phase. Before Python 3.9 the peak can not be reset per phase, then the largest
+    amount of traced memory at the start and end of the phase and its nested phases is
+    recorded instead, which is a lower bound of the peak. Hooks registered with addHook()
+    are called with the report when publish() is invoked, so a service can export the
+    numbers to its own metrics system.
+    """
+
+    enabled = True
+
+    def __init__(self, traceMemory=False):
+        self.traceMemory = traceMemory
+        self.phases = {}
+        self.counters = {}
+        self.sections = {}
+        self.hooks = []
+        self._memoryFrames = []
+        self._startedTracemalloc = False
+
+    def phase(self, name):
+        """Return a context manager that times the phase name."""
+        return _Phase(self, name)
+
+    def count(self, name, amount=1):
+        """Increase the counter name by amount."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def addSection(self, name, value):
+        """Add a JSON serializable value as section name to the report, e.g. detailed stats."""
+        self.sections[name] = value
+
+    def addHook(self, hook):
+        """Register a callable that receives the report dict on publish()."""
+        self.hooks.append(hook)
+
+    def publish(self):
+        """Call all registered hooks with the current report."""
+        report = self.report()
+        for hook in self.hooks:
+            hook(report)
+        return report
+
+    def report(self):
+        """Return the collected phases and counters as a dict."""
+        report = dict(self.sections)
+        report['phases'] = {name: dict(values) for name, values in self.phases.items()}
+        report['counters'] = dict(self.counters)
+        return report
+
+    def toJson(self):
+        return json.dumps(self.report(), indent=4, sort_keys=True)
+
+    def write(self, outputfile):
+        """Write the JSON report to outputfile."""
+        with open(outputfile, 'w') as fp:
+            fp.write(self.toJson() + '\n')
+
+    def _enter(self):
+        if not self.traceMemory:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._startedTracemalloc = True
+        if self._memoryFrames:
+            # keep the peak the enclosing phase reached so far before resetting it
+            parent = self._memoryFrames[-1]
+            parent[0] = max(parent[0], self._tracedMemory())
+        if RESET_PEAK:
+            tracemalloc.reset_peak()
+            self._memoryFrames.append([0])
+        else:
+            self._memoryFrames.append([self._tracedMemory()])
+
+    def _tracedMemory(self):
+        """Return the peak since the last reset, or the current traced memory before 3.9."""
+        current, peak = tracemalloc.get_traced_memory()
+        return peak if RESET_PEAK else current
+
+    def _exit(self, name, wall, cpu):
+        values = self.phases.get(name)
+        if values is None:
+            values = {'calls': 0, 'wall': 0.0, 'cpu': 0.0}
+            self.phases[name] = values
+        values['calls'] += 1
+        values['wall'] += wall
+        values['cpu'] += cpu
+
+        if not self.traceMemory:
+            return
+        frame = self._memoryFrames.pop()
+        peak = max(frame[0], self._tracedMemory())
+        values['peakMemory'] = max(values.get('peakMemory', 0), peak)
+        if self._memoryFrames:
+            parent = self._memoryFrames[-1]
+            parent[0] = max(parent[0], peak)
+        elif self._startedTracemalloc:
+            tracemalloc.stop()
+            self._startedTracemalloc = False
+
+
+class _Phase:
+    """Context manager timing one phase of a Profiler."""
+
+    __slots__ = ('profiler', 'name', 'wall', 'cpu')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._enter()
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+        self.profiler._exit(self.name, wall, cpu)
+        return False
+
+
+class _NullPhase:
+    """A phase that does nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class NullProfiler:
+    """A Profiler replacement that records nothing.
+
+    It is used when profiling is disabled, all methods return immediately.
+    """
+
+    enabled = False
+    _phase = _NullPhase()
+
+    def phase(self, name):
+        return self._phase
+
+    def count(self, name, amount=1):
+        pass
+
+    def addSection(self, name, value):
+        pass
+
+    def addHook(self, hook):
+        pass
+
+    def publish(self):
+        return None
+
+    def report(self):
+        return {'phases': {}, 'counters': {}}
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class CountingGraph:
+    """Proxy for an rdflib Graph that counts lookups issued against it.
+
+    Only used while profiling, so the unprofiled parser talks to the graph directly.
+    """
+
+    def __init__(self, graph, profiler):
+        self.graph = graph
+        self.profiler = profiler
+
+    def value(self, *args, **kwargs):
+        self.profiler.count('graphLookups')
+        return self.graph.value(*args, **kwargs)
+
+    def objects(self, *args, **kwargs):
+        self.profiler.count('graphLookups')
+        return self.graph.objects(*args, **kwargs)
+
+    def subjects(self, *args, **kwargs):
+        self.profiler.count('graphLookups')
+        return self.graph.subjects(*args, **kwargs)
+
+    def triples(self, *args, **kwargs):
+        self.profiler.count('graphLookups')
+        return self.graph.triples(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.graph, name)
+
+    def __len__(self):
+        return len(self.graph)
+
+    def __contains__(self, triple):
+        self.profiler.count('graphLookups')
+        return triple in self.graph
+
+    def __iter__(self):
+        return iter(self.graph)
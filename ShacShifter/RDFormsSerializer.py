@@ -1,8 +1,19 @@
 from .modules.NodeShape import NodeShape
 from .modules.PropertyShape import PropertyShape
 from .ShapeParser import ShapeParser
+from .Profiler import NULL_PROFILER
+from .FormPrefiller import FormPrefiller
+from .LabelIndex import LabelIndex
+from .ShapeNormalizer import ShapeNormalizer
+from .ShardedWriter import ShardedWriter
 import json
 import logging
+import os
+
+
+RDF_TYPE = 'http://www.w3.org/1999/02/22-rdf-syntax-ns#type'
+SKOS_BROADER = 'http://www.w3.org/2004/02/skos/core#broader'
+SKOS_NARROWER = 'http://www.w3.org/2004/02/skos/core#narrower'
 
 
 class RDFormsPart:
@@ -49,6 +60,9 @@ class RDFormsTemplateBundle(RDFormsPart):
         for key, value in self.__dict__.items():
             if key == 'templates' and len(value) > 0:
                 jd[key] = [template.jsonRepr() for template in value]
+            elif key == 'cachedCoices':
+                jd[key] = {cls: [choice.jsonRepr() for choice in choices]
+                           for cls, choices in value.items()}
             else:
                 jd[key] = value
         return jd
@@ -189,39 +203,93 @@ class RDFormsSerializer:
     """A serializer for RDForms."""
 
     logger = logging.getLogger('ShacShifter.RDFormsSerializer')
-    templateBundles = []
     outputfile = None
 
-    def __init__(self, nodeShapes, outputfile=None):
+    def __init__(self, nodeShapes, outputfile=None, profiler=None, labels=None,
+                 hierarchy=None, ontologyUrl='', normalizer=None):
         """Initialize the Serializer and parse des ShapeParser results.
 
         args: shapes
               string outputfile
+              Profiler profiler (optional)
+              LabelIndex labels (optional), e.g. ShapeParser.labels
+              HierarchyIndex hierarchy (optional), sh:class constrained properties become
+              choices of the instances of the class in it
+              string ontologyUrl (optional) the source of the hierarchy
+              ShapeNormalizer normalizer (optional) shared cache of EffectiveShapes, the
+              property shapes of sh:and operands become templates of the bundle as well
         """
-        try:
-            fp = open(outputfile, 'w')
-            self.outputfile = outputfile
-            fp.close()
-        except Exception:
-            self.logger.error('Can''t write to file {}'.format(outputfile))
-            self.logger.error('Content will be printed to sys.')
+        self.normalizer = ShapeNormalizer() if normalizer is None else normalizer
+        self.profiler = NULL_PROFILER if profiler is None else profiler
+        self.labels = LabelIndex() if labels is None else labels
+        self.hierarchy = hierarchy
+        self.ontologyUrl = ontologyUrl
+        # choices per class, shared by the cachedCoices of all bundles
+        self.classChoices = {}
+        self.nodeShapes = nodeShapes
+        self.templateBundles = []
+        if outputfile is not None:
+            try:
+                fp = open(outputfile, 'w')
+                self.outputfile = outputfile
+                fp.close()
+            except Exception:
+                self.logger.error('Can''t write to file {}'.format(outputfile))
+                self.logger.error('Content will be printed to sys.')
 
         for nodeShape in nodeShapes:
             bundle = self.createTemplateBundle(nodeShapes[nodeShape])
             self.templateBundles.append(bundle)
 
-    def write(self):
-        """Write RDForms to file or sysout."""
+    def write(self, dataGraph=None):
+        """Write RDForms to file or sysout.
+
+        args: rdflib Graph dataGraph (optional), if given the templates are followed by a
+              pre-filled form for every target instance in dataGraph (see FormPrefiller)
+        """
+        with self.profiler.phase('serialize'):
+            jsonstrings = [bundle.toJson() for bundle in self.templateBundles]
+
+        forms = []
+        if dataGraph is not None:
+            with self.profiler.phase('prefill'):
+                prefiller = FormPrefiller(self.nodeShapes, dataGraph, self.normalizer)
+                prefiller.buildIndex()
+            forms = prefiller.forms()
+
         if self.outputfile:
-            fp = open(self.outputfile, 'w')
-            for bundle in self.templateBundles:
-                jsonstring = bundle.toJson()
-                print(jsonstring)
-                fp.write(jsonstring + '\n')
-            fp.close()
+            with self.profiler.phase('write'):
+                fp = open(self.outputfile, 'w')
+                for jsonstring in jsonstrings:
+                    print(jsonstring)
+                    fp.write(jsonstring + '\n')
+                for form in forms:
+                    fp.write(json.dumps(form, indent=4) + '\n')
+                    self.profiler.count('forms')
+                fp.close()
+            if self.profiler.enabled:
+                self.profiler.count('bytesWritten', os.path.getsize(self.outputfile))
         else:
-            for bundle in self.templateBundles:
-                print(bundle.toJson())
+            for jsonstring in jsonstrings:
+                print(jsonstring)
+            for form in forms:
+                print(json.dumps(form, indent=4))
+
+    def writeShards(self, directory, compress=False):
+        """Write one file per template bundle and a manifest into directory.
+
+        args: string directory
+              bool compress, write gzip compressed files
+        returns: dict manifest, see ShardedWriter
+        """
+        writer = ShardedWriter(directory, compress)
+        with self.profiler.phase('write'):
+            manifest = writer.write(
+                (bundle.root, self.nodeShapes[bundle.root].targetClass, bundle.jsonRepr())
+                for bundle in self.templateBundles)
+        self.profiler.count('shardsWritten', writer.written)
+        self.profiler.count('shardsUnchanged', writer.unchanged)
+        return manifest
 
     def createTemplateBundle(self, nodeShape):
         """Evaluate a nodeShape.
@@ -231,7 +299,9 @@ class RDFormsSerializer:
         def addNodeLabel():
             label = {'en': 'Template: ' + nodeShape.uri}
             if nodeShape.isSet['targetClass']:
-                label = {'en': 'Create new Instance of: ' + ', '.join(nodeShape.targetClass)}
+                label = {'en': 'Create new Instance of: ' + ', '.join(
+                    LabelIndex.pick(self.labels.forResource(cls), 'en')
+                    for cls in nodeShape.targetClass)}
             if nodeShape.isSet['targetNode']:
                 label = {'en': 'Edit Instance of: ' + ', '.join(nodeShape.targetNode)}
             if nodeShape.isSet['targetObjectsOf']:
@@ -243,7 +313,7 @@ class RDFormsSerializer:
         def addTemplates():
             """Check Propertey Shapes to fill the templates."""
             templates = []
-            for propertyShape in nodeShape.properties:
+            for propertyShape in properties:
                 templates.append(self.getTemplate(propertyShape))
             return templates
 
@@ -252,9 +322,16 @@ class RDFormsSerializer:
         if nodeShape.isSet['message']:
             bundle.description = nodeShape.message
         bundle.root = nodeShape.uri
-        if len(nodeShape.properties) > 0:
+        properties = self.normalizer.effective(nodeShape).properties
+        if len(properties) > 0:
             bundle.templates = addTemplates()
 
+        for template in bundle.templates:
+            # class choices are computed once and shared by all bundles
+            if isinstance(template, RDFormsChoiceItem) and RDF_TYPE in template.constraints:
+                cls = template.constraints[RDF_TYPE]
+                bundle.cachedCoices[cls] = self.classChoices[cls]
+
         return bundle
 
     def getTemplate(self, propertyShape):
@@ -264,8 +341,11 @@ class RDFormsSerializer:
         return: RDFormsItem
         """
         def initTemplateItem():
+            classes = self.choiceClasses(propertyShape)
             if propertyShape.isSet['shIn']:
                 item = fillChoiceItem(RDFormsChoiceItem())
+            elif classes:
+                item = fillClassChoiceItem(RDFormsChoiceItem(), classes[0])
             else:
                 item = fillTextItem(RDFormsTextItem())
 
@@ -277,14 +357,25 @@ class RDFormsSerializer:
             item.choices = self.getChoices(propertyShape)
             return item
 
+        def fillClassChoiceItem(item, cls):
+            item = fillBasicItemValues(item)
+            item.cardinality = getCardinality()
+            item.nodetype = 'RESOURCE'
+            item.constraints = {RDF_TYPE: cls}
+            item.ontologyUrl = self.ontologyUrl
+            item.hierarchyProperty = SKOS_NARROWER
+            item.parentProperty = SKOS_BROADER
+            item.isParentPropertyInverted = True
+            self.getClassChoices(cls)
+            return item
+
         def fillTextItem(item):
             item.cardinality = getCardinality()
             return item
 
         def fillBasicItemValues(item):
             item.id = propertyShape.path
-            item.label = propertyShape.name if propertyShape.isSet['name'] else (
-                                    propertyShape.path.rsplit('/', 1)[-1])
+            item.label = self.languageMap(self.labels.forPropertyShape(propertyShape))
             item.description = getDescription()
             return item
 
@@ -317,7 +408,40 @@ class RDFormsSerializer:
             item = initTemplateItem()
             return item
 
-    def getChoices(propertyShape):
+    def languageMap(self, labels):
+        """Convert a dict language -> label of the LabelIndex into an RDForms language map.
+
+        RDForms uses the empty string for values without language.
+        """
+        return {('' if language == 'default' else language): label
+                for language, label in labels.items()}
+
+    def choiceClasses(self, propertyShape):
+        """Return the sh:class values of propertyShape that have instances in the hierarchy."""
+        if self.hierarchy is None:
+            return []
+        return [cls for cls in propertyShape.classes if self.hierarchy.tree(cls)]
+
+    def getClassChoices(self, cls):
+        """Return the choice tree of the instances of cls, computed once per serializer.
+
+        args: string cls
+        returns: list
+        """
+        choices = self.classChoices.get(cls)
+        if choices is None:
+            choices = []
+            for instance, top, children in self.hierarchy.tree(cls):
+                choiceItem = RDFormsChoiceExpression()
+                choiceItem.value = str(instance)
+                choiceItem.label = self.languageMap(self.labels.forResource(instance))
+                choiceItem.top = top
+                choiceItem.children = [{'_reference': str(child)} for child in children]
+                choices.append(choiceItem)
+            self.classChoices[cls] = choices
+        return choices
+
+    def getChoices(self, propertyShape):
         """Search for choice candidates in propertyShape and return a choice list.
 
         args: PropertyShape propertyShape
@@ -326,9 +450,8 @@ class RDFormsSerializer:
         choices = []
         for choice in propertyShape.shIn:
             choiceItem = RDFormsChoiceExpression()
-            choiceItem.label = choice
-            choiceItem.value = choice
-            choiceItem.children = set(propertyShape.shIn) - set([choice])
-            choices.append[choiceItem]
+            choiceItem.label = self.languageMap(self.labels.forResource(choice))
+            choiceItem.value = str(choice)
+            choices.append(choiceItem)
 
         return choices
@@ -5,10 +5,25 @@ import os
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')))
 
+from ShacShifter.HierarchyIndex import HierarchyIndex
 from ShacShifter.HTMLSerializer import HTMLSerializer
+from ShacShifter.ImportResolver import ImportResolver
+from ShacShifter.JSONSchemaSerializer import JSONSchemaSerializer
+from ShacShifter.NTriplesLoader import NTriplesLoader
 from ShacShifter.RDFormsSerializer import RDFormsSerializer
+from ShacShifter.ParallelValidator import ParallelValidator
+from ShacShifter.PatternRegistry import PatternRegistry
+from ShacShifter.ShapeDiff import ShapeDiff
 from ShacShifter.ShapeParser import ShapeParser
+from ShacShifter.ShapeSnapshot import ShapeSnapshot, ShapeSnapshotError
+from ShacShifter.ShapeStatistics import ShapeStatistics
+from ShacShifter.ShapeValidator import ShapeValidator
+from ShacShifter.ShapeWatcher import ShapeWatcher
+from ShacShifter.StreamingValidator import StreamingValidator
+from ShacShifter.WisskiSerializer import WisskiSerializer
+from ShacShifter.Profiler import NULL_PROFILER
 import logging
+import rdflib
 
 
 class ShacShifter:
@@ -17,16 +32,138 @@ class ShacShifter:
     logger = logging.getLogger('ShacShifter')
 
     # def __init__(self):
-    def shift(self, input, output, format):
-        """Transform input to output with format."""
-        self.logger.debug('Start Shifting from {} into {}'.format(input, output))
-        parser = ShapeParser()
+    def shift(self, input, output, format, profiler=None, data=None, stream=False,
+              jobs=1, ontology=None, language=None, watch=False, diff=None, shards=False,
+              compress=False, catalog=None, mirror=None, importCache=None, stats=False):
+        """Transform input to output with format.
+
+        args: string input
+              string output
+              string format
+              Profiler profiler (optional), its hooks are called when the run is done
+              string data (optional) a data graph, required for the format "report", with
+              "rdforms" forms pre-filled with its values are written
+              bool stream, validate N-Triples data subject by subject with bounded memory
+              int jobs, number of processes used for validation, imports and loading
+              N-Triples input (files ending with .nt or .nt.gz)
+              string ontology (optional) a graph with labels of properties, classes and values
+              and the instances offered as choices for sh:class in RDForms
+              string language (optional) preferred language of the labels in HTML forms
+              bool watch, keep running and update the RDForms output after every change of
+              input, only the changed shapes are extracted and serialized again
+              string diff (optional) an older version of input, if given the delta between
+              both versions is written as JSON instead of format
+              bool shards, output is a directory, RDForms bundles or JSON Schemas are written
+              into one file per node shape with a manifest
+              bool compress, gzip compress the shards
+              string catalog (optional) an XML catalog of the files imported by input
+              string mirror (optional) a directory with the files imported by input
+              string importCache (optional) a directory to cache the parsed imports in,
+              with catalog, mirror or importCache given owl:imports are followed
+              bool stats, write statistics and estimated output sizes of input as JSON
+              instead of format, the shapes are not extracted
+        """
+        self.logger.debug('Start Shifting from %s into %s', input, output)
+        if profiler is None:
+            profiler = NULL_PROFILER
+        if watch:
+            if format != 'rdforms':
+                raise Exception('The watch mode only supports the format rdforms')
+            ontologyGraph = None if ontology is None else self.loadGraph(ontology)
+            ShapeWatcher(input, output, ontology=ontologyGraph,
+                         ontologyUrl=ontology or '').watch()
+            return
+        if diff is not None:
+            with profiler.phase('diff'):
+                ShapeDiff(self.loadShapes(diff), self.loadShapes(input)).write(output)
+            profiler.publish()
+            return
+        imports = None
+        if catalog is not None or mirror is not None or importCache is not None:
+            imports = ImportResolver(catalog, mirror, importCache, jobs, profiler)
+        loader = None
+        if imports is None and input.endswith(('.nt', '.nt.gz')):
+            loader = NTriplesLoader(jobs, profiler=profiler)
+        parser = ShapeParser(profiler=profiler, imports=imports, loader=loader)
+        if stats:
+            parser.loadGraph(input)
+            ShapeStatistics(parser).write(output)
+            profiler.publish()
+            return
         parseResult = parser.parseShape(input)
 
+        hierarchy = None
+        if ontology is not None:
+            with profiler.phase('ontology'):
+                ontologyGraph = self.loadGraph(ontology)
+                parser.labels.addGraph(ontologyGraph)
+                hierarchy = HierarchyIndex(ontologyGraph)
+
         if (format == "html"):
-            writer = HTMLSerializer(parseResult, output)
+            writer = HTMLSerializer(parseResult, output, labels=parser.labels,
+                                    language=language, profiler=profiler)
         elif (format == "rdforms"):
-            writer = RDFormsSerializer(parseResult, output)
+            writer = RDFormsSerializer(parseResult, None if shards else output,
+                                       profiler=profiler, labels=parser.labels,
+                                       hierarchy=hierarchy,
+                                       ontologyUrl=ontology or '')
+            if shards:
+                if data is not None:
+                    raise Exception('Pre-filled forms can not be written as shards')
+                writer.writeShards(output, compress)
+            elif data is None:
+                writer.write()
+            else:
+                with profiler.phase('loadData'):
+                    dataGraph = self.loadGraph(data)
+                writer.write(dataGraph)
+        elif (format == "wisski"):
+            writer = WisskiSerializer(parseResult, output, labels=parser.labels,
+                                      language=language, profiler=profiler)
             writer.write()
+        elif (format == "jsonschema"):
+            writer = JSONSchemaSerializer(parseResult, None if shards else output,
+                                          labels=parser.labels, language=language,
+                                          profiler=profiler)
+            if shards:
+                writer.writeShards(output, compress)
+            else:
+                writer.write()
+        elif (format == "report"):
+            if data is None:
+                raise Exception('A data graph is required to create a validation report')
+            if stream:
+                with profiler.phase('validate'):
+                    results = StreamingValidator(parseResult).write(data, output)
+                profiler.count('validationResults', results)
+                profiler.publish()
+                return
+            with profiler.phase('loadData'):
+                dataGraph = self.loadGraph(data)
+            with profiler.phase('validate'):
+                if jobs == 1:
+                    patterns = PatternRegistry(timed=profiler.enabled)
+                    report = ShapeValidator(parseResult, patterns=patterns).validate(dataGraph)
+                    profiler.addSection('patterns', patterns.stats())
+                else:
+                    report = ParallelValidator(parseResult, jobs).validate(data, dataGraph)
+            profiler.count('validationResults', len(report.results))
+            with profiler.phase('write'):
+                report.write(output)
         else:
             writer = None
+
+        profiler.publish()
+
+    def loadShapes(self, inputFilePath):
+        """Load node shapes from a shape snapshot or parse them from a Turtle file."""
+        try:
+            return ShapeSnapshot(inputFilePath)
+        except ShapeSnapshotError:
+            return ShapeParser().parseShape(inputFilePath, detached=True)
+
+    def loadGraph(self, inputFilePath):
+        """Load a data graph, the format is guessed from the file extension."""
+        graph = rdflib.Graph()
+        graph.parse(inputFilePath, format=rdflib.util.guess_format(inputFilePath) or 'turtle')
+        return graph
@@ -0,0 +1,190 @@
+import hashlib
+import json
+import logging
+from .ShapeParser import ShapeParser
+from .modules.NodeShape import NodeShape
+from .modules.PropertyShape import PropertyShape
+from .modules.Term import Term
+
+# paths and fields filled from RDF lists, all other lists hold the values of a repeated
+# predicate and their order is not significant
+ORDERED_FIELDS = {'path', 'shIn', 'languageIn', 'ignoredProperties'}
+# fields with RDF terms, IRIs and literals with the same text have to differ
+TERM_FIELDS = {'hasValue', 'shIn'}
+# isSet flags that are named after the SHACL predicate instead of the attribute
+FIELD_ATTRIBUTES = {'property': 'properties', 'node': 'nodes'}
+PLAIN_TYPES = {str, int, float, bool}
+
+
+def canonical(value, ordered=True):
+    """Return a hashable, JSON serializable and order independent form of a model value.
+
+    Terms are written in N-Triples notation, so they keep their kind, language and datatype.
+    Other rdflib terms become plain python values (see ShapeParser.plainValue), so shapes of
+    the parser and of snapshots compare equal. Lists that are not ordered are sorted. Node
+    shapes that are operands of logical constraints are represented by their content hash.
+    """
+    if type(value) in PLAIN_TYPES:
+        return value
+    if isinstance(value, PropertyShape):
+        return canonicalShape(value)
+    if isinstance(value, NodeShape):
+        return shapeHash(value)
+    if isinstance(value, Term):
+        return value.toTerm().n3()
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), canonical(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        values = [canonical(item) for item in value]
+        return tuple(values) if ordered else tuple(sorted(values, key=repr))
+    return ShapeParser.plainValue(value)
+
+
+def canonicalShape(shape, keys=None):
+    """Return the set fields of a node or property shape as a tuple of (field, value).
+
+    Fields whose isSet flag is False are left out, the property shapes of a node shape are
+    compared separately and only contribute their keys (see propertyKeys()).
+    """
+    fields = {}
+    for field, isSet in shape.isSet.items():
+        if not isSet:
+            continue
+        field = FIELD_ATTRIBUTES.get(field, field)
+        value = getattr(shape, field)
+        if field == 'properties':
+            value = sorted(propertyKeys(value) if keys is None else keys)
+        elif field in TERM_FIELDS:
+            value = [Term.fromTerm(item) for item in value]
+        fields[field] = canonical(value, field in ORDERED_FIELDS)
+    return tuple(sorted(fields.items()))
+
+
+def propertyKeys(properties):
+    """Return a key per property shape of a node shape.
+
+    Property shapes with an IRI are identified by it, blank node property shapes by their
+    path, a number is appended if a path is used more than once.
+    """
+    keys = []
+    seen = {}
+    for propertyShape in properties:
+        if propertyShape.isSet['uri']:
+            key = propertyShape.uri
+        else:
+            path = canonical(propertyShape.path)
+            key = path if isinstance(path, str) else json.dumps(path, default=str)
+        count = seen.get(key, 0)
+        seen[key] = count + 1
+        keys.append(key if count == 0 else '{}#{}'.format(key, count))
+    return keys
+
+
+def shapeHash(nodeShape):
+    """Return a content hash of a node shape and its property shapes."""
+    keys = propertyKeys(nodeShape.properties)
+    content = [canonicalShape(nodeShape, keys)]
+    for key, propertyShape in sorted(zip(keys, nodeShape.properties), key=lambda item: item[0]):
+        content.append((key, canonicalShape(propertyShape)))
+    return hashlib.sha1(repr(content).encode('utf-8')).hexdigest()
+
+
+class ShapeDiff:
+    """A structural comparison of two versions of parsed node shapes.
+
+    Shapes are first compared by content hashes, only shapes with different hashes are
+    compared field by field. Both versions can be dictionaries returned by
+    ShapeParser.parseShape() or ShapeSnapshots.
+    """
+
+    logger = logging.getLogger('ShacShifter.ShapeDiff')
+
+    def __init__(self, oldShapes, newShapes, oldHashes=None, newHashes=None):
+        """Prepare the comparison.
+
+        args: dict oldShapes node shape URI -> NodeShape of the old version
+              dict newShapes node shape URI -> NodeShape of the new version
+              dict oldHashes, newHashes (optional) precomputed results of hashes()
+        """
+        self.oldShapes = oldShapes
+        self.newShapes = newShapes
+        self.oldHashes = self.hashes(oldShapes) if oldHashes is None else oldHashes
+        self.newHashes = self.hashes(newShapes) if newHashes is None else newHashes
+
+    @staticmethod
+    def hashes(nodeShapes):
+        """Return the content hash of every node shape as dict URI -> hash."""
+        return {uri: shapeHash(nodeShapes[uri]) for uri in nodeShapes}
+
+    def delta(self):
+        """Compare both versions.
+
+        returns: dict with the sorted URIs of "added", "removed" and "modified" node shapes,
+                 the "changes" of every modified shape (see compareNodeShapes()) and the
+                 "bundles" that have to be fetched again, i.e. the RDForms template bundles
+                 of added and modified shapes
+        """
+        added = sorted(uri for uri in self.newHashes if uri not in self.oldHashes)
+        removed = sorted(uri for uri in self.oldHashes if uri not in self.newHashes)
+        modified = sorted(uri for uri, digest in self.newHashes.items()
+                          if uri in self.oldHashes and self.oldHashes[uri] != digest)
+        changes = {uri: self.compareNodeShapes(self.oldShapes[uri], self.newShapes[uri])
+                   for uri in modified}
+        self.logger.debug('%d added, %d removed and %d modified shapes',
+                          len(added), len(removed), len(modified))
+        return {
+            'added': added,
+            'removed': removed,
+            'modified': modified,
+            'changes': changes,
+            'bundles': sorted(added + modified)
+        }
+
+    def compareNodeShapes(self, old, new):
+        """Return the changed fields and property shapes of a node shape.
+
+        returns: dict with "fields" (see compareFields()) and "properties", the keys of the
+                 "added" and "removed" property shapes and the changed fields of the
+                 "modified" ones
+        """
+        oldProperties = dict(zip(propertyKeys(old.properties), old.properties))
+        newProperties = dict(zip(propertyKeys(new.properties), new.properties))
+        properties = {
+            'added': sorted(key for key in newProperties if key not in oldProperties),
+            'removed': sorted(key for key in oldProperties if key not in newProperties),
+            'modified': {}
+        }
+        for key in sorted(newProperties):
+            if key in oldProperties:
+                fields = self.compareFields(oldProperties[key], newProperties[key])
+                if fields:
+                    properties['modified'][key] = fields
+        fields = self.compareFields(old, new, ignore={'properties'})
+        return {'fields': fields, 'properties': properties}
+
+    @staticmethod
+    def compareFields(old, new, ignore=()):
+        """Return the fields that differ between two shapes as dict field -> [old, new].
+
+        A field that is not set (see isSet) is null.
+        """
+        oldFields = dict(canonicalShape(old))
+        newFields = dict(canonicalShape(new))
+        changed = {}
+        for field in sorted(set(oldFields).union(newFields)):
+            if field in ignore:
+                continue
+            oldValue = oldFields.get(field)
+            newValue = newFields.get(field)
+            if oldValue != newValue:
+                changed[field] = [oldValue, newValue]
+        return changed
+
+    def write(self, outputfile=None):
+        """Write the delta as JSON to outputfile or sysout."""
+        content = json.dumps(self.delta(), indent=4, default=str)
+        if outputfile:
+            with open(outputfile, 'w') as fp:
+                fp.write(content + '\n')
+        else:
+            print(content)
@@ -0,0 +1,83 @@
+import logging
+import weakref
+from .modules.NodeShape import NodeShape
+
+
+class EffectiveShape:
+    """The effective constraints of a node or property shape.
+
+    conjuncts are the shape itself and all operands of its sh:and constraints, every shape
+    once. sh:and chains of node shape operands are flattened, property shape operands are
+    conjuncts as a whole. The operands apply to the nodes the shape checks, i.e. the focus
+    nodes of a node shape and the value nodes of a property shape.
+
+    properties are the property shapes of the node shape conjuncts and the property shape
+    operands. sOr and sXone are the operand lists and sNot the operands of the shape and its
+    node shape operands.
+    """
+
+    def __init__(self, shape):
+        self.shape = shape
+        self.conjuncts = []
+        self.properties = []
+        self.sOr = []
+        self.sXone = []
+        self.sNot = []
+
+
+class ShapeNormalizer:
+    """Flatten the logical constraints of parsed shapes into EffectiveShapes.
+
+    The result is computed once per shape and shared, operands that are used by several
+    shapes (see ShapeParser.parseOperand()) are resolved once as well.
+    """
+
+    logger = logging.getLogger('ShacShifter.ShapeNormalizer')
+
+    def __init__(self):
+        # shapes can be replaced (see ShapeWatcher), so they must not be kept alive
+        self.effectiveShapes = weakref.WeakKeyDictionary()
+
+    def effective(self, shape):
+        """Return the EffectiveShape of a node or property shape (memoized)."""
+        effective = self.effectiveShapes.get(shape)
+        if effective is None:
+            effective = self.normalize(shape)
+            self.effectiveShapes[shape] = effective
+        return effective
+
+    def normalize(self, shape):
+        effective = EffectiveShape(shape)
+        seen = set()
+        stack = [shape]
+        while stack:
+            conjunct = stack.pop()
+            if id(conjunct) in seen:
+                continue
+            seen.add(id(conjunct))
+            effective.conjuncts.append(conjunct)
+            if isinstance(conjunct, NodeShape):
+                effective.properties.extend(conjunct.properties)
+            elif conjunct is not shape:
+                # the logical constraints of a property shape apply to its own values
+                effective.properties.append(conjunct)
+                continue
+            effective.sOr.extend(conjunct.sOr)
+            effective.sXone.extend(conjunct.sXone)
+            effective.sNot.extend(conjunct.sNot)
+            for operands in reversed(conjunct.sAnd):
+                # operands are visited in document order
+                stack.extend(reversed(operands))
+        return effective
+
+    def normalizeAll(self, nodeShapes):
+        """Compute the EffectiveShapes of all node shapes and their property shapes.
+
+        returns: dict node shape URI -> EffectiveShape
+        """
+        result = {}
+        for uri, nodeShape in nodeShapes.items():
+            result[uri] = self.effective(nodeShape)
+            for propertyShape in nodeShape.properties:
+                self.effective(propertyShape)
+        return result
@@ -1,39 +1,264 @@
 #!/usr/bin/env python3
 
 import logging
+import sys
 import rdflib
 from rdflib.exceptions import UniquenessError
 from .modules.NodeShape import NodeShape
 from .modules.PropertyShape import PropertyShape
+from .modules.Term import Term
+from .Profiler import NULL_PROFILER, CountingGraph
+from .LabelIndex import LabelIndex
+from .LazyNodeShapes import LazyNodeShapes
+from .ParserLimits import LimitedGraph, ParserLimits, ShapeParserLimitError
+
+# the attributes of the logical constraints with a list of shapes and their predicates
+LOGICAL_LISTS = ['sAnd', 'sOr', 'sXone']
+LOGICAL_PREDICATES = ['and', 'or', 'xone']
 
 
 class ShapeParser:
-    """A parser for SHACL Shapes."""
+    """A parser for SHACL Shapes.
+
+    A parser can parse several files one after another, every parse starts from scratch.
+    The state of the current parse (g, nodeShapes, propertyShapes, qualifiedShapes,
+    operandShapes, logicalShapes, labels and deadline) lives on the instance and reset()
+    replaces it, so an instance must not be shared between threads. Threads use a parser
+    each or check one out of a ShapeParserPool.
+    """
 
     logger = logging.getLogger('ShacShifter.ShapeParser')
 
-    def __init__(self):
+    def __init__(self, profiler=None, limits=None, imports=None, loader=None):
+        """Initialize the parser.
+
+        args: Profiler profiler (optional) to collect timings and counters
+              ParserLimits limits (optional) limits for pathological input
+              ImportResolver imports (optional) to load the files imported with owl:imports
+              NTriplesLoader loader (optional) to load N-Triples input in parallel
+        """
         self.rdf = rdflib.Namespace('http://www.w3.org/1999/02/22-rdf-syntax-ns#')
         self.sh = rdflib.Namespace('http://www.w3.org/ns/shacl#')
-        self.g = rdflib.Graph()
+        self.profiler = NULL_PROFILER if profiler is None else profiler
+        self.limits = ParserLimits() if limits is None else limits
+        self.imports = imports
+        self.loader = loader
+        self.reset()
+
+    def reset(self):
+        """Forget the graph, shapes and labels of the previous parse, keep the configuration.
+
+        Results of earlier parses are replaced, not modified, so they stay valid.
+        """
+        self.g = self.newGraph()
         self.nodeShapes = {}
         self.propertyShapes = {}
-
-    def parseShape(self, inputFilePath):
+        self.labels = LabelIndex()
+        self.deadline = None
+        self.qualifiedShapes = []
+        self.operandShapes = {}
+        self.logicalShapes = []
+        self.detachedOperands = set()
+
+    def parseShape(self, inputFilePath, detached=False, lazy=False):
         """Parse a Shape given in a file.
 
         args: string inputFilePath
+              bool detached, if True the result is detached from the graph (see detach())
+              bool lazy, if True the node shapes are extracted on first access (see
+              LazyNodeShapes), this can not be combined with detached
         returns: list of dictionaries for nodeShapes and propertyShapes
+        raises: ShapeParserLimitError if the input exceeds one of the limits
         """
-        self.g.parse(inputFilePath, format='turtle')
-        nodeShapeUris = self.getNodeShapeUris()
+        if lazy and detached:
+            raise Exception('Lazily extracted shapes can not be detached')
+        self.loadGraph(inputFilePath)
+
+        with self.profiler.phase('labels'):
+            self.labels.addGraph(self.g)
+
+        with self.profiler.phase('discovery'):
+            nodeShapeUris = self.getNodeShapeUris()
+
+        if lazy:
+            return LazyNodeShapes(self, nodeShapeUris)
 
-        for shapeUri in nodeShapeUris:
-            nodeShape = self.parseNodeShape(shapeUri)
-            self.nodeShapes[nodeShape.uri] = nodeShape
+        with self.profiler.phase('extraction'):
+            for shapeUri in nodeShapeUris:
+                self.extractNodeShape(shapeUri)
+
+        if detached:
+            self.detach()
 
         return self.nodeShapes
 
+    def extractNodeShape(self, shapeUri):
+        """Parse a node shape found by getNodeShapeUris() and add it to nodeShapes.
+
+        returns: object NodeShape
+        """
+        # node shapes that are operands of an earlier shape are parsed already
+        nodeShape = self.operandShapes.get(shapeUri) or self.parseNodeShape(shapeUri)
+        self.nodeShapes[nodeShape.uri] = nodeShape
+        return nodeShape
+
+    def newGraph(self, deadline=None):
+        """Return an empty graph that enforces the limits while it is loaded."""
+        if self.limits.limitsLoading():
+            graph = LimitedGraph(self.limits, deadline)
+        else:
+            graph = rdflib.Graph()
+        if self.profiler.enabled:
+            graph = CountingGraph(graph, self.profiler)
+        return graph
+
+    def loadGraph(self, inputFilePath):
+        """Load the shapes graph of a file (and its imports) without extracting shapes.
+
+        The state of a previous parse is reset first (see reset()) and the time budget of
+        the parse starts, see ShapeStatistics for a use without parseShape().
+
+        raises: ShapeParserLimitError if the input exceeds one of the limits
+        """
+        self.reset()
+        self.deadline = self.limits.deadline()
+        # maxTriples and the time budget are checked while the triples are added
+        self.g = self.newGraph(self.deadline)
+        with self.profiler.phase('load'):
+            if self.imports is not None:
+                self.imports.load(inputFilePath, self.g)
+            elif self.loader is not None:
+                self.loader.load(inputFilePath, self.g)
+            else:
+                self.g.parse(inputFilePath, format='turtle')
+        if self.profiler.enabled:
+            self.profiler.count('triplesLoaded', len(self.g))
+        self.limits.check('maxTriples', len(self.g))
+        self.checkTime()
+        return self.g
+
+    def detach(self):
+        """Make the parsed shapes independent of rdflib and release the graph.
+
+        The values of sh:hasValue and sh:in become Terms, which keep the kind, language and
+        datatype of the values, IRIs in paths and the keys of complex paths become strings.
+        All strings are interned, so equal IRIs share one object. Afterwards the parser holds
+        an empty graph.
+
+        returns: dictionary of nodeShapes
+        """
+        for nodeShape in self.nodeShapes.values():
+            self.detachNodeShape(nodeShape)
+
+        self.propertyShapes = {}
+        self.operandShapes = {}
+        self.detachedOperands = set()
+        # the labels of blank nodes can not be referenced anymore
+        self.labels.labels = {resource: labels for resource, labels in self.labels.labels.items()
+                              if not isinstance(resource, rdflib.BNode)}
+        self.g = self.newGraph()
+
+        return self.nodeShapes
+
+    def detachNodeShape(self, nodeShape):
+        nodeShape.uri = sys.intern(nodeShape.uri)
+        nodeShape.nodeKind = sys.intern(nodeShape.nodeKind)
+        for attribute in ['targetClass', 'targetNode', 'targetObjectsOf', 'targetSubjectsOf',
+                          'ignoredProperties']:
+            setattr(nodeShape, attribute,
+                    [sys.intern(value) for value in getattr(nodeShape, attribute)])
+        for propertyShape in nodeShape.properties:
+            self.detachPropertyShape(propertyShape)
+        self.detachOperands(nodeShape)
+
+    def detachPropertyShape(self, propertyShape):
+        for attribute in ['uri', 'dataType', 'pattern', 'flags']:
+            setattr(propertyShape, attribute, sys.intern(getattr(propertyShape, attribute)))
+        for attribute in ['classes', 'languageIn', 'equals', 'disjoint', 'lessThan',
+                          'lessThanOrEquals', 'nodes']:
+            setattr(propertyShape, attribute,
+                    [sys.intern(value) for value in getattr(propertyShape, attribute)])
+        propertyShape.path = self.detachPath(propertyShape.path)
+        propertyShape.hasValue = [Term.fromTerm(value) for value in propertyShape.hasValue]
+        propertyShape.shIn = [Term.fromTerm(value) for value in propertyShape.shIn]
+        if propertyShape.isSet['qualifiedValueShape']:
+            self.detachPropertyShape(propertyShape.qualifiedValueShape)
+        self.detachOperands(propertyShape)
+
+    def detachOperands(self, shape):
+        """Detach the operands of the logical constraints of a shape, shared ones once."""
+        for operand in self.operands(shape):
+            if id(operand) in self.detachedOperands:
+                continue
+            self.detachedOperands.add(id(operand))
+            if isinstance(operand, NodeShape):
+                self.detachNodeShape(operand)
+            else:
+                self.detachPropertyShape(operand)
+
+    @staticmethod
+    def operands(shape):
+        """Return the operand shapes of sh:and, sh:or, sh:xone and sh:not of a shape."""
+        operands = []
+        for attribute in LOGICAL_LISTS:
+            for members in getattr(shape, attribute):
+                operands.extend(members)
+        operands.extend(shape.sNot)
+        return operands
+
+    def detachPath(self, path):
+        if isinstance(path, dict):
+            return {sys.intern(str(key)): self.detachPath(value) for key, value in path.items()}
+        elif isinstance(path, list):
+            return [self.detachPath(value) for value in path]
+        return sys.intern(str(path))
+
+    @staticmethod
+    def plainValue(term):
+        """Convert an rdflib term into a plain python value.
+
+        IRIs and blank nodes become strings, literals become the python value of their
+        datatype, or their lexical form if rdflib has no mapping for the datatype. Terms of
+        detached shapes are converted like the rdflib terms they stand for, other values are
+        returned unchanged.
+        """
+        if isinstance(term, Term):
+            term = term.toTerm()
+        if isinstance(term, rdflib.Literal):
+            value = term.toPython()
+            if isinstance(value, rdflib.Literal):
+                value = str(term)
+        elif isinstance(term, rdflib.term.Identifier):
+            value = str(term)
+        else:
+            value = term
+        if isinstance(value, str):
+            return sys.intern(value)
+        return value
+
+    def checkTime(self):
+        """Raise a ShapeParserLimitError if the time budget of the current parse is used up."""
+        self.limits.checkDeadline(self.deadline)
+
+    def walkList(self, head):
+        """Yield the members of the RDF list starting at head.
+
+        raises: ShapeParserLimitError for cyclic and too long lists
+        """
+        visited = set()
+        node = head
+        while node != self.rdf.nil:
+            if node is None:
+                raise Exception('RDF list starting at {} is not terminated by rdf:nil'.format(
+                    head))
+            if node in visited:
+                raise ShapeParserLimitError('cycle', len(visited), None, node)
+            visited.add(node)
+            self.limits.check('maxListLength', len(visited), head)
+            self.checkTime()
+            yield self.g.value(subject=node, predicate=self.rdf.first)
+            node = self.g.value(subject=node, predicate=self.rdf.rest)
+
     def getNodeShapeUris(self):
         """Get URIs of all Node shapes.
 
@@ -46,7 +271,7 @@ class ShapeParser:
                 nodeShapeUris.add(stmt)
 
         for stmt in self.g.subjects(self.sh.property, None):
-            if stmt not in nodeShapeUris:
+            if stmt not in nodeShapeUris and not self.isBlankOperand(stmt):
                 nodeShapeUris.add(stmt)
 
         for stmt in self.g.subjects(self.sh.targetClass, None):
@@ -63,7 +288,7 @@ class ShapeParser:
 
         for stmt in self.g.subjects(self.sh.targetSubjectsOf, None):
             if stmt not in nodeShapeUris:
-                nodeShapeUris.append(stmt)
+                nodeShapeUris.add(stmt)
 
         # actually not exactly a nodeshape
         # for stmt in self.g.subjects(rdflib.RDF.type, self.sh.PropertyGroup):
@@ -72,6 +297,40 @@ class ShapeParser:
 
         return set(list(nodeShapeUris))
 
+    def isNodeShape(self, node):
+        """Check if node is a node shape in the same sense as getNodeShapeUris()."""
+        if (node, rdflib.RDF.type, self.sh.NodeShape) in self.g:
+            return True
+        for predicate in [self.sh.targetClass, self.sh.targetNode,
+                          self.sh.targetObjectsOf, self.sh.targetSubjectsOf]:
+            if self.g.value(subject=node, predicate=predicate) is not None:
+                return True
+        return (self.g.value(subject=node, predicate=self.sh.property) is not None and
+                not self.isBlankOperand(node))
+
+    def isBlankOperand(self, node):
+        """Check if node is a blank node used as operand of sh:and, sh:or, sh:xone or sh:not.
+
+        Such shapes are parsed as part of the shapes that use them, not as node shapes.
+        """
+        if not isinstance(node, rdflib.BNode):
+            return False
+        if self.g.value(predicate=self.sh['not'], object=node) is not None:
+            return True
+        for cell in self.g.subjects(self.rdf.first, node):
+            # walk back to the head of the list
+            visited = set()
+            while cell not in visited:
+                visited.add(cell)
+                previous = self.g.value(predicate=self.rdf.rest, object=cell)
+                if previous is None:
+                    break
+                cell = previous
+            for predicate in LOGICAL_PREDICATES:
+                if (None, self.sh[predicate], cell) in self.g:
+                    return True
+        return False
+
     def getPropertyShapeCandidates(self):
         """Get all property shapes.
 
@@ -99,6 +358,7 @@ class ShapeParser:
         """
         nodeShape = NodeShape()
         nodeShape.uri = str(shapeUri)
+        self.profiler.count('nodeShapes')
 
         for stmt in self.g.objects(shapeUri, self.sh.targetClass):
             nodeShape.isSet['targetClass'] = True
@@ -119,17 +379,8 @@ class ShapeParser:
         val = self.g.value(subject=shapeUri, predicate=self.sh.ignoredProperties)
         if val is not None:
             nodeShape.isSet['ignoredProperties'] = True
-            properties = val
-            lastListEntry = False
-
-            while not lastListEntry:
-                nodeShape.ignoredProperties.append(
-                    str(self.g.value(subject=properties, predicate=self.rdf.first))
-                )
-                # check if this was the last entry in the list
-                if self.g.value(subject=properties, predicate=self.rdf.rest) == self.rdf.nil:
-                    lastListEntry = True
-                properties = self.g.value(subject=properties, predicate=self.rdf.rest)
+            for member in self.walkList(val):
+                nodeShape.ignoredProperties.append(str(member))
 
         for stmt in self.g.objects(shapeUri, self.sh.message):
             nodeShape.isSet['message'] = True
@@ -152,10 +403,13 @@ class ShapeParser:
 
         for stmt in self.g.objects(shapeUri, self.sh.property):
             nodeShape.isSet['property'] = True
-            propertyShape = self.parsePropertyShape(stmt)
+            with self.profiler.phase('propertyShape'):
+                propertyShape = self.parsePropertyShape(stmt)
             self.propertyShapes[stmt] = propertyShape
             nodeShape.properties.append(propertyShape)
 
+        self.parseLogicalConstraints(nodeShape, shapeUri)
+
         return nodeShape
 
     def parsePropertyShape(self, shapeUri):
@@ -164,8 +418,10 @@ class ShapeParser:
         args:   string shapeUri
         returns: object PropertyShape
         """
+        self.checkTime()
         propertyShape = PropertyShape()
-        self.logger.debug('Parsing PropertyShape with URI {}'.format(shapeUri))
+        self.profiler.count('propertyShapes')
+        self.logger.debug('Parsing PropertyShape with URI %s', shapeUri)
 
         if shapeUri != rdflib.term.BNode(shapeUri):
             propertyShape.isSet['uri'] = True
@@ -174,7 +430,8 @@ class ShapeParser:
         pathStart = self.g.value(subject=shapeUri, predicate=self.sh.path, any=False)
 
         if pathStart is not None:
-            propertyShape.path = self.getPropertyPath(pathStart)
+            with self.profiler.phase('path'):
+                propertyShape.path = self.getPropertyPath(pathStart)
         else:
             if self.g.subjects(predicate=self.sh.qualifiedValueShape, object=shapeUri) is None:
                 raise Exception('No value for mandatory argument {} found.'.format(self.sh.path))
@@ -187,6 +444,7 @@ class ShapeParser:
         if val is not None:
             propertyShape.isSet['name'] = True
             propertyShape.name = str(val)
+        self.labels.bind(propertyShape, shapeUri)
 
         val = self.g.value(subject=shapeUri, predicate=self.sh['description'])
         if val is not None:
@@ -221,25 +479,26 @@ class ShapeParser:
                     'Conflict found. sh:maxCount {} must be greater or eqal sh:minCount {}'
                     .format(propertyShape.maxCount, propertyShape.minCount))
 
+        # range bounds keep the type of their literal, e.g. decimals or dates
         val = self.g.value(subject=shapeUri, predicate=self.sh.minExclusive)
         if val is not None:
             propertyShape.isSet['minExclusive'] = True
-            propertyShape.minExclusive = int(val)
+            propertyShape.minExclusive = self.plainValue(val)
 
         val = self.g.value(subject=shapeUri, predicate=self.sh.minInclusive)
         if val is not None:
             propertyShape.isSet['minInclusive'] = True
-            propertyShape.minInclusive = int(val)
+            propertyShape.minInclusive = self.plainValue(val)
 
         val = self.g.value(subject=shapeUri, predicate=self.sh.maxExclusive)
         if val is not None:
             propertyShape.isSet['maxExclusive'] = True
-            propertyShape.maxExclusive = int(val)
+            propertyShape.maxExclusive = self.plainValue(val)
 
         val = self.g.value(subject=shapeUri, predicate=self.sh.maxInclusive)
         if val is not None:
             propertyShape.isSet['maxInclusive'] = True
-            propertyShape.maxInclusive = int(val)
+            propertyShape.maxInclusive = self.plainValue(val)
 
         val = self.g.value(subject=shapeUri, predicate=self.sh.minLength)
         if val is not None:
@@ -264,17 +523,8 @@ class ShapeParser:
         val = self.g.value(subject=shapeUri, predicate=self.sh.languageIn)
         if val is not None:
             propertyShape.isSet['languageIn'] = True
-            languages = val
-            lastListEntry = False
-
-            while not lastListEntry:
-                propertyShape.languageIn.append(
-                    str(self.g.value(subject=languages, predicate=self.rdf.first))
-                )
-                # check if this was the last entry in the list
-                if self.g.value(subject=languages, predicate=self.rdf.rest) == self.rdf.nil:
-                    lastListEntry = True
-                languages = self.g.value(subject=languages, predicate=self.rdf.rest)
+            for member in self.walkList(val):
+                propertyShape.languageIn.append(str(member))
 
         val = self.g.value(subject=shapeUri, predicate=self.sh.uniqueLang)
         if val is not None:
@@ -309,16 +559,7 @@ class ShapeParser:
         val = self.g.value(subject=shapeUri, predicate=self.sh['in'])
         if val is not None:
             propertyShape.isSet['shIn'] = True
-            lastListEntry = False
-
-            while True:
-                first_value = self.g.value(subject=val, predicate=self.rdf.first, any=False)
-                rest_value = self.g.value(subject=val, predicate=self.rdf.rest, any=False)
-                propertyShape.shIn.append(first_value)
-                # check if this was the last entry in the list
-                if rest_value == self.rdf.nil:
-                    break
-                val = rest_value
+            propertyShape.shIn.extend(self.walkList(val))
 
         val = self.g.value(subject=shapeUri, predicate=self.sh.order)
         if val is not None:
@@ -329,7 +570,14 @@ class ShapeParser:
         if val is not None:
             propertyShape.isSet['qualifiedValueShape'] = True
             # TODO qualifiedValueShape != propertyShape but well-formed shape
-            propertyShape.qualifiedValueShape = self.parsePropertyShape(val)
+            if val == shapeUri or val in self.qualifiedShapes:
+                raise ShapeParserLimitError('cycle', len(self.qualifiedShapes), None, val)
+            self.qualifiedShapes.append(shapeUri)
+            try:
+                self.limits.check('maxRecursionDepth', len(self.qualifiedShapes), val)
+                propertyShape.qualifiedValueShape = self.parsePropertyShape(val)
+            finally:
+                self.qualifiedShapes.pop()
 
         val = self.g.value(subject=shapeUri, predicate=self.sh.qualifiedValueShapesDisjoint)
         if val is not None:
@@ -358,49 +606,83 @@ class ShapeParser:
             else:
                 propertyShape.message[stmt.language] = str(stmt)
 
+        self.parseLogicalConstraints(propertyShape, shapeUri)
+
         return propertyShape
 
-    def getPropertyPath(self, pathUri):
-        # not enforcing blank nodes here, but stripping the link nodes from the data structure
-        newPathUri = self.g.value(subject=pathUri, predicate=self.rdf.first)
-        if newPathUri is not None:
-            rdfList = []
-            rdfList.append(self.getPropertyPath(newPathUri))
+    def parseLogicalConstraints(self, shape, shapeUri):
+        """Parse sh:and, sh:or, sh:xone and sh:not of a node or property shape."""
+        for attribute, predicate in zip(LOGICAL_LISTS, LOGICAL_PREDICATES):
+            for head in self.g.objects(shapeUri, self.sh[predicate]):
+                shape.isSet[attribute] = True
+                getattr(shape, attribute).append(
+                    [self.parseOperand(member) for member in self.walkList(head)])
+
+        for stmt in self.g.objects(shapeUri, self.sh['not']):
+            shape.isSet['sNot'] = True
+            shape.sNot.append(self.parseOperand(stmt))
 
-            if not (self.g.value(subject=pathUri, predicate=self.rdf.rest) == self.rdf.nil):
-                newPathUri = self.g.value(subject=pathUri, predicate=self.rdf.rest)
-                rest = self.getPropertyPath(newPathUri)
-                if (isinstance(rest, list)):
-                    rdfList += rest
-                else:
-                    rdfList.append(rest)
+    def parseOperand(self, node):
+        """Return the shape of an operand of a logical constraint.
 
-            return rdfList
+        Operands with sh:path are property shapes, all others node shapes. Every operand is
+        parsed once, a shape used by several constraints is shared.
+
+        raises: ShapeParserLimitError for shapes that are operands of themselves
+        """
+        isPropertyShape = (node, self.sh.path, None) in self.g
+        shape = self.operandShapes.get(node)
+        if shape is None and not isPropertyShape:
+            shape = self.nodeShapes.get(str(node))
+        if shape is not None:
+            return shape
+
+        if node in self.logicalShapes:
+            raise ShapeParserLimitError('cycle', len(self.logicalShapes), None, node)
+        self.limits.check('maxRecursionDepth', len(self.logicalShapes) + 1, node)
+        self.logicalShapes.append(node)
+        try:
+            if isPropertyShape:
+                shape = self.parsePropertyShape(node)
+            else:
+                shape = self.parseNodeShape(node)
+        finally:
+            self.logicalShapes.pop()
+        self.operandShapes[node] = shape
+        return shape
+
+    def getPropertyPath(self, pathUri, depth=0):
+        # not enforcing blank nodes here, but stripping the link nodes from the data structure
+        self.limits.check('maxPathDepth', depth, pathUri)
+        self.checkTime()
+        depth += 1
+        if self.g.value(subject=pathUri, predicate=self.rdf.first) is not None:
+            return [self.getPropertyPath(member, depth) for member in self.walkList(pathUri)]
 
         altPath = self.g.value(subject=pathUri, predicate=self.sh.alternativePath)
         if altPath is not None:
             # newPathUri = altPath
-            rdfDict = {self.sh.alternativePath: self.getPropertyPath(altPath)}
+            rdfDict = {self.sh.alternativePath: self.getPropertyPath(altPath, depth)}
             return rdfDict
 
         invPath = self.g.value(subject=pathUri, predicate=self.sh.inversePath)
         if invPath is not None:
-            rdfDict = {self.sh.inversePath: self.getPropertyPath(invPath)}
+            rdfDict = {self.sh.inversePath: self.getPropertyPath(invPath, depth)}
             return rdfDict
 
         zeroOrMorePath = self.g.value(subject=pathUri, predicate=self.sh.zeroOrMorePath)
         if zeroOrMorePath is not None:
-            rdfDict = {self.sh.zeroOrMorePath: self.getPropertyPath(zeroOrMorePath)}
+            rdfDict = {self.sh.zeroOrMorePath: self.getPropertyPath(zeroOrMorePath, depth)}
             return rdfDict
 
         oneOrMorePath = self.g.value(subject=pathUri, predicate=self.sh.oneOrMorePath)
         if oneOrMorePath is not None:
-            rdfDict = {self.sh.oneOrMorePath: self.getPropertyPath(oneOrMorePath)}
+            rdfDict = {self.sh.oneOrMorePath: self.getPropertyPath(oneOrMorePath, depth)}
             return rdfDict
 
         zeroOrOnePath = self.g.value(subject=pathUri, predicate=self.sh.zeroOrOnePath)
         if zeroOrOnePath is not None:
-            rdfDict = {self.sh.zeroOrOnePath: self.getPropertyPath(zeroOrOnePath)}
+            rdfDict = {self.sh.zeroOrOnePath: self.getPropertyPath(zeroOrOnePath, depth)}
             return rdfDict
 
         # last Object in this Pathpart, check if its an Uri and return it
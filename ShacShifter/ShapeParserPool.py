@@ -0,0 +1,59 @@
+import contextlib
+import logging
+import queue
+from .ShapeParser import ShapeParser
+
+
+class ShapeParserPool:
+    """A bounded pool of ShapeParsers shared by threads.
+
+    A ShapeParser keeps the state of its current parse on the instance and is not thread
+    safe, the pool is. The parsers are created once and checked out by one thread at a time,
+    a thread blocks while all parsers are in use. Every checkout starts with a reset parser
+    and the parser is reset again when it is returned, so idle parsers hold no graph. Labels
+    and shapes a thread got from a parser stay valid after the parser was returned.
+    """
+
+    logger = logging.getLogger('ShacShifter.ShapeParserPool')
+
+    def __init__(self, size=4, limits=None):
+        """Create the parsers.
+
+        args: int size number of parsers, i.e. of concurrent parses
+              ParserLimits limits (optional) limits of all parsers
+        """
+        if size < 1:
+            raise Exception('A parser pool needs at least one parser')
+        self.size = size
+        # the most recently used parser is handed out first
+        self.parsers = queue.LifoQueue(maxsize=size)
+        for _ in range(size):
+            self.parsers.put(ShapeParser(limits=limits))
+
+    @contextlib.contextmanager
+    def parser(self, timeout=None):
+        """Check out a parser for the duration of a with block.
+
+        args: float timeout (optional) seconds to wait for a free parser
+        raises: Exception if no parser became free within timeout
+        """
+        try:
+            parser = self.parsers.get(timeout=timeout)
+        except queue.Empty:
+            raise Exception('No parser of the pool became free within {} s'.format(timeout))
+        try:
+            parser.reset()
+            yield parser
+        finally:
+            parser.reset()
+            self.parsers.put(parser)
+
+    def parseShape(self, inputFilePath, timeout=None):
+        """Parse a file with a parser of the pool.
+
+        args: string inputFilePath
+              float timeout (optional) seconds to wait for a free parser
+        returns: dict of detached nodeShapes (see ShapeParser.detach())
+        """
+        with self.parser(timeout) as parser:
+            return parser.parseShape(inputFilePath, detached=True)
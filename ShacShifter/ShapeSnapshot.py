@@ -0,0 +1,525 @@
+"""A compact binary snapshot format for parsed shapes.
+
+Layout (all integers little endian):
+
+    header      magic, version and the offsets/counts of the sections below
+    strings     string index (offset, length) per string id, followed by UTF-8 data
+    lists       one array of uint32 that holds all list contents, lists are
+                referenced by (start, count)
+    paths       fixed width records (kind, a, b) for property paths
+    nodes       fixed width NodeShape records
+    properties  fixed width PropertyShape records
+
+String id 0 is always the empty string. The names of the isSet flags are stored in the
+snapshot, so bitmasks stay readable if the model classes get new attributes.
+
+The node records start with the node shapes of the snapshot, followed by node shapes that
+are only operands of logical constraints. Operands are stored as record number * 2, plus 1
+for property shapes, the lists of sh:and, sh:or and sh:xone as the number of operands
+followed by the operands, for every value.
+
+Values of sh:hasValue, sh:in and the range bounds are stored as triples of a kind and two
+string ids, the range bounds of a property shape as one list in the order of
+PROPERTY_RANGES. The values of sh:hasValue and sh:in are Terms, stored as IRI, blank node
+or literal with the lexical form and the language or datatype, the range bounds are plain
+python values, stored as the kind of the value and its lexical form.
+"""
+import datetime
+import decimal
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+import rdflib
+from .modules.NodeShape import NodeShape
+from .modules.PropertyShape import PropertyShape
+from .modules.Term import Term
+from .ShapeParser import ShapeParser, LOGICAL_LISTS
+
+MAGIC = b'SHSNAP\x00\x00'
+VERSION = 4
+
+HEADER = struct.Struct('<8sI15Q')
+STRING = struct.Struct('<II')
+PATH = struct.Struct('<III')
+# uri, nodeKind, severity, flags, isSet, 11 lists
+NODE = struct.Struct('<IIiIQ22I')
+# uri, path, dataType, name, description, pattern, flags,
+# minCount, maxCount, minLength, maxLength, qualifiedMinCount, qualifiedMaxCount, order,
+# booleans, qualifiedValueShape, isSet, 15 lists
+PROPERTY = struct.Struct('<7I7qIiQ30I')
+
+NODE_LISTS = ['targetClass', 'targetNode', 'targetObjectsOf', 'targetSubjectsOf',
+              'ignoredProperties']
+PROPERTY_STRINGS = ['uri', 'dataType', 'name', 'description', 'pattern', 'flags']
+PROPERTY_INTEGERS = ['minCount', 'maxCount', 'minLength', 'maxLength', 'qualifiedMinCount',
+                     'qualifiedMaxCount', 'order']
+PROPERTY_RANGES = ['minExclusive', 'minInclusive', 'maxExclusive', 'maxInclusive']
+PROPERTY_LISTS = ['classes', 'languageIn', 'equals', 'disjoint', 'lessThan', 'lessThanOrEquals',
+                  'nodes']
+
+PATH_IRI = 0
+PATH_SEQUENCE = 1
+PATH_EMPTY = 2
+PATH_OPERATORS = [
+    'http://www.w3.org/ns/shacl#alternativePath',
+    'http://www.w3.org/ns/shacl#inversePath',
+    'http://www.w3.org/ns/shacl#zeroOrMorePath',
+    'http://www.w3.org/ns/shacl#oneOrMorePath',
+    'http://www.w3.org/ns/shacl#zeroOrOnePath'
+]
+PATH_OPERATOR_OFFSET = 3
+
+VALUE_STRING = 0
+VALUE_INT = 1
+VALUE_FLOAT = 2
+VALUE_BOOL = 3
+VALUE_DECIMAL = 4
+VALUE_DATE = 5
+VALUE_DATETIME = 6
+VALUE_TIME = 7
+VALUE_IRI = 8
+VALUE_BNODE = 9
+VALUE_LITERAL = 10
+VALUE_LANG_LITERAL = 11
+
+XSD = rdflib.Namespace('http://www.w3.org/2001/XMLSchema#')
+# kinds of values that are parsed from their lexical form like rdflib literals
+VALUE_DATATYPES = {VALUE_DECIMAL: XSD.decimal, VALUE_DATE: XSD.date,
+                   VALUE_DATETIME: XSD.dateTime, VALUE_TIME: XSD.time}
+
+
+class ShapeSnapshotError(Exception):
+    """Raised if a file is not a readable shape snapshot."""
+
+
+class ShapeSnapshotWriter:
+    """Write parsed node shapes into a binary snapshot."""
+
+    def __init__(self):
+        self.strings = {'': 0}
+        self.lists = array('I')
+        self.paths = []
+        self.nodeRecords = []
+        self.propertyRecords = []
+        self.propertyIndex = {}
+        self.nodeIndex = {}
+        self.nodeFields = list(NodeShape().isSet)
+        self.propertyFields = list(PropertyShape().isSet)
+
+    def write(self, nodeShapes, outputfile):
+        """Write the dictionary of nodeShapes (as returned by ShapeParser) to outputfile."""
+        # the node shapes come first, operands of logical constraints are appended
+        self.nodeRecords = [None] * len(nodeShapes)
+        for i, nodeShape in enumerate(nodeShapes.values()):
+            self.nodeIndex[id(nodeShape)] = i
+        for nodeShape in nodeShapes.values():
+            self.addNodeShape(nodeShape)
+
+        nodeFields = self.addList(self.addString(field) for field in self.nodeFields)
+        propertyFields = self.addList(self.addString(field) for field in self.propertyFields)
+
+        strings = sorted(self.strings, key=self.strings.get)
+        encoded = [string.encode('utf-8') for string in strings]
+        stringIndex = bytearray()
+        position = 0
+        for data in encoded:
+            stringIndex += STRING.pack(position, len(data))
+            position += len(data)
+        stringData = b''.join(encoded)
+
+        sections = [
+            bytes(stringIndex), stringData, self.lists.tobytes(),
+            b''.join(PATH.pack(*record) for record in self.paths),
+            b''.join(NODE.pack(*record) for record in self.nodeRecords),
+            b''.join(PROPERTY.pack(*record) for record in self.propertyRecords)
+        ]
+        offsets = []
+        position = HEADER.size
+        for section in sections:
+            offsets.append(position)
+            position += len(section)
+
+        header = HEADER.pack(
+            MAGIC, VERSION,
+            len(strings), offsets[0], offsets[1],
+            len(self.lists), offsets[2],
+            len(self.paths), offsets[3],
+            len(nodeShapes), offsets[4],
+            len(self.propertyRecords), offsets[5],
+            nodeFields[0], nodeFields[1], propertyFields[0], propertyFields[1])
+
+        with open(outputfile, 'wb') as fp:
+            fp.write(header)
+            for section in sections:
+                fp.write(section)
+
+    def addString(self, value):
+        value = str(value)
+        index = self.strings.get(value)
+        if index is None:
+            index = len(self.strings)
+            self.strings[value] = index
+        return index
+
+    def addList(self, ids):
+        start = len(self.lists)
+        self.lists.extend(ids)
+        return start, len(self.lists) - start
+
+    def addStringList(self, values):
+        return self.addList([self.addString(value) for value in values])
+
+    def addValueList(self, values):
+        ids = []
+        for value in values:
+            value = ShapeParser.plainValue(value)
+            if isinstance(value, bool):
+                ids += [VALUE_BOOL, self.addString(str(value).lower())]
+            elif isinstance(value, int):
+                ids += [VALUE_INT, self.addString(value)]
+            elif isinstance(value, float):
+                ids += [VALUE_FLOAT, self.addString(repr(value))]
+            elif isinstance(value, decimal.Decimal):
+                ids += [VALUE_DECIMAL, self.addString(value)]
+            elif isinstance(value, datetime.datetime):
+                ids += [VALUE_DATETIME, self.addString(value.isoformat())]
+            elif isinstance(value, datetime.date):
+                ids += [VALUE_DATE, self.addString(value.isoformat())]
+            elif isinstance(value, datetime.time):
+                ids += [VALUE_TIME, self.addString(value.isoformat())]
+            else:
+                ids += [VALUE_STRING, self.addString(value)]
+            ids.append(0)
+        return self.addList(ids)
+
+    def addTermList(self, values):
+        ids = []
+        for value in values:
+            term = Term.fromTerm(value)
+            if term.kind == Term.IRI:
+                ids += [VALUE_IRI, self.addString(term.value), 0]
+            elif term.kind == Term.BNODE:
+                ids += [VALUE_BNODE, self.addString(term.value), 0]
+            elif term.lang:
+                ids += [VALUE_LANG_LITERAL, self.addString(term.value), self.addString(term.lang)]
+            else:
+                ids += [VALUE_LITERAL, self.addString(term.value),
+                        self.addString(term.datatype)]
+        return self.addList(ids)
+
+    def addMessage(self, message):
+        ids = []
+        for language, text in message.items():
+            ids += [self.addString(language), self.addString(text)]
+        return self.addList(ids)
+
+    def addPath(self, path):
+        if isinstance(path, dict):
+            (operator, value), = path.items()
+            record = (PATH_OPERATORS.index(str(operator)) + PATH_OPERATOR_OFFSET,
+                      self.addPath(value), 0)
+        elif isinstance(path, list):
+            record = (PATH_SEQUENCE,) + self.addList([self.addPath(part) for part in path])
+        elif path == '':
+            record = (PATH_EMPTY, 0, 0)
+        else:
+            record = (PATH_IRI, self.addString(path), 0)
+        self.paths.append(record)
+        return len(self.paths) - 1
+
+    def isSetMask(self, fields, isSet):
+        mask = 0
+        for field, value in isSet.items():
+            if field not in fields:
+                # flags the parser sets without a matching attribute, e.g. 'property'
+                fields.append(field)
+            if value:
+                mask |= 1 << fields.index(field)
+        return mask
+
+    def addNodeShape(self, nodeShape):
+        index = self.nodeIndex.get(id(nodeShape))
+        if index is None:
+            index = len(self.nodeRecords)
+            self.nodeRecords.append(None)
+            self.nodeIndex[id(nodeShape)] = index
+        elif self.nodeRecords[index] is not None:
+            return index
+
+        properties = [self.addPropertyShape(propertyShape)
+                      for propertyShape in nodeShape.properties]
+        lists = []
+        for attribute in NODE_LISTS:
+            lists += self.addStringList(getattr(nodeShape, attribute))
+        lists += self.addList(properties)
+        lists += self.addMessage(nodeShape.message)
+        lists += self.addLogicalLists(nodeShape)
+
+        self.nodeRecords[index] = (
+            self.addString(nodeShape.uri), self.addString(nodeShape.nodeKind),
+            nodeShape.severity, 1 if nodeShape.closed else 0,
+            self.isSetMask(self.nodeFields, nodeShape.isSet)) + tuple(lists)
+        return index
+
+    def addPropertyShape(self, propertyShape):
+        index = self.propertyIndex.get(id(propertyShape))
+        if index is not None:
+            return index
+
+        qualifiedValueShape = -1
+        if propertyShape.isSet['qualifiedValueShape']:
+            qualifiedValueShape = self.addPropertyShape(propertyShape.qualifiedValueShape)
+
+        strings = [self.addString(getattr(propertyShape, attribute))
+                   for attribute in PROPERTY_STRINGS]
+        lists = []
+        for attribute in PROPERTY_LISTS:
+            lists += self.addStringList(getattr(propertyShape, attribute))
+        lists += self.addTermList(propertyShape.hasValue)
+        lists += self.addTermList(propertyShape.shIn)
+        lists += self.addMessage(propertyShape.message)
+        lists += self.addValueList(getattr(propertyShape, attribute)
+                                   for attribute in PROPERTY_RANGES)
+        lists += self.addLogicalLists(propertyShape)
+        booleans = ((1 if propertyShape.uniqueLang else 0) |
+                    (2 if propertyShape.qualifiedValueShapesDisjoint else 0))
+
+        record = (
+            (strings[0], self.addPath(propertyShape.path)) + tuple(strings[1:]) +
+            tuple(int(getattr(propertyShape, attribute)) for attribute in PROPERTY_INTEGERS) +
+            (booleans, qualifiedValueShape,
+             self.isSetMask(self.propertyFields, propertyShape.isSet)) + tuple(lists))
+        self.propertyRecords.append(record)
+        index = len(self.propertyRecords) - 1
+        self.propertyIndex[id(propertyShape)] = index
+        return index
+
+    def addOperand(self, operand):
+        if isinstance(operand, NodeShape):
+            return self.addNodeShape(operand) * 2
+        return self.addPropertyShape(operand) * 2 + 1
+
+    def addLogicalLists(self, shape):
+        lists = []
+        for attribute in LOGICAL_LISTS:
+            ids = []
+            for members in getattr(shape, attribute):
+                ids.append(len(members))
+                ids.extend([self.addOperand(member) for member in members])
+            lists += self.addList(ids)
+        lists += self.addList([self.addOperand(operand) for operand in shape.sNot])
+        return lists
+
+
+class ShapeSnapshot(Mapping):
+    """A read only mapping of node shape URIs to NodeShapes backed by a memory mapped snapshot.
+
+    Shapes are materialized on first access and cached. Loaded shapes are detached, i.e.
+    they contain Terms and plain python values like the result of ShapeParser.detach().
+    """
+
+    def __init__(self, inputfile):
+        self.fp = open(inputfile, 'rb')
+        try:
+            self.buffer = mmap.mmap(self.fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.fp.close()
+            raise ShapeSnapshotError('{} is empty'.format(inputfile))
+
+        if len(self.buffer) < HEADER.size:
+            self.close()
+            raise ShapeSnapshotError('{} is no shape snapshot'.format(inputfile))
+        header = HEADER.unpack_from(self.buffer, 0)
+        if header[0] != MAGIC:
+            self.close()
+            raise ShapeSnapshotError('{} is no shape snapshot'.format(inputfile))
+        if header[1] != VERSION:
+            self.close()
+            raise ShapeSnapshotError(
+                'Unsupported snapshot version {} in {}'.format(header[1], inputfile))
+
+        (self.stringCount, self.stringIndexOffset, self.stringDataOffset,
+         self.listCount, self.listOffset, self.pathCount, self.pathOffset,
+         self.nodeCount, self.nodeOffset, self.propertyCount, self.propertyOffset,
+         nodeFieldsStart, nodeFieldsCount,
+         propertyFieldsStart, propertyFieldsCount) = header[2:]
+
+        self.strings = {}
+        self.nodeShapes = {}
+        self.propertyShapes = {}
+        self.uriIndex = None
+        self.nodeFields = [self.string(i) for i in self.uintList(nodeFieldsStart, nodeFieldsCount)]
+        self.propertyFields = [self.string(i)
+                               for i in self.uintList(propertyFieldsStart, propertyFieldsCount)]
+
+    def close(self):
+        self.strings = {}
+        self.buffer.close()
+        self.fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def __getitem__(self, uri):
+        return self.nodeShape(self.index()[uri])
+
+    def __iter__(self):
+        for i in range(self.nodeCount):
+            yield self.nodeUri(i)
+
+    def __len__(self):
+        return self.nodeCount
+
+    def __contains__(self, uri):
+        return uri in self.index()
+
+    def index(self):
+        """Return the dictionary of node shape URIs to record numbers."""
+        if self.uriIndex is None:
+            self.uriIndex = {self.nodeUri(i): i for i in range(self.nodeCount)}
+        return self.uriIndex
+
+    def nodeUri(self, i):
+        offset = self.nodeOffset + i * NODE.size
+        return self.string(struct.unpack_from('<I', self.buffer, offset)[0])
+
+    def string(self, i):
+        value = self.strings.get(i)
+        if value is None:
+            offset, length = STRING.unpack_from(
+                self.buffer, self.stringIndexOffset + i * STRING.size)
+            start = self.stringDataOffset + offset
+            value = sys.intern(self.buffer[start:start + length].decode('utf-8'))
+            self.strings[i] = value
+        return value
+
+    def uintList(self, start, count):
+        if count == 0:
+            return ()
+        return struct.unpack_from('<{}I'.format(count), self.buffer, self.listOffset + start * 4)
+
+    def stringList(self, start, count):
+        return [self.string(i) for i in self.uintList(start, count)]
+
+    def valueList(self, start, count):
+        ids = self.uintList(start, count)
+        values = []
+        for kind, i, j in zip(ids[0::3], ids[1::3], ids[2::3]):
+            value = self.string(i)
+            if kind == VALUE_IRI:
+                value = Term.iri(value)
+            elif kind == VALUE_BNODE:
+                value = Term(Term.BNODE, value, '', '')
+            elif kind == VALUE_LITERAL:
+                value = Term.literal(value, datatype=self.string(j))
+            elif kind == VALUE_LANG_LITERAL:
+                value = Term.literal(value, lang=self.string(j))
+            elif kind == VALUE_INT:
+                value = int(value)
+            elif kind == VALUE_FLOAT:
+                value = float(value)
+            elif kind == VALUE_BOOL:
+                value = value == 'true'
+            elif kind in VALUE_DATATYPES:
+                value = rdflib.Literal(value, datatype=VALUE_DATATYPES[kind]).toPython()
+            values.append(value)
+        return values
+
+    def message(self, start, count):
+        ids = self.uintList(start, count)
+        return {self.string(language): self.string(text)
+                for language, text in zip(ids[0::2], ids[1::2])}
+
+    def updateIsSet(self, isSet, fields, mask):
+        for bit, field in enumerate(fields):
+            if mask & (1 << bit):
+                isSet[field] = True
+
+    def path(self, i):
+        kind, a, b = PATH.unpack_from(self.buffer, self.pathOffset + i * PATH.size)
+        if kind == PATH_IRI:
+            return self.string(a)
+        elif kind == PATH_SEQUENCE:
+            return [self.path(part) for part in self.uintList(a, b)]
+        elif kind == PATH_EMPTY:
+            return ''
+        return {PATH_OPERATORS[kind - PATH_OPERATOR_OFFSET]: self.path(a)}
+
+    def nodeShape(self, i):
+        """Materialize the NodeShape with record number i."""
+        nodeShape = self.nodeShapes.get(i)
+        if nodeShape is not None:
+            return nodeShape
+
+        record = NODE.unpack_from(self.buffer, self.nodeOffset + i * NODE.size)
+        nodeShape = NodeShape()
+        nodeShape.uri = self.string(record[0])
+        nodeShape.nodeKind = self.string(record[1])
+        nodeShape.severity = record[2]
+        nodeShape.closed = bool(record[3] & 1)
+        self.updateIsSet(nodeShape.isSet, self.nodeFields, record[4])
+        lists = record[5:]
+        for n, attribute in enumerate(NODE_LISTS):
+            setattr(nodeShape, attribute, self.stringList(lists[2 * n], lists[2 * n + 1]))
+        nodeShape.properties = [self.propertyShape(j) for j in self.uintList(lists[10], lists[11])]
+        nodeShape.message = self.message(lists[12], lists[13])
+        self.nodeShapes[i] = nodeShape
+        self.readLogicalLists(nodeShape, lists[14:])
+        return nodeShape
+
+    def propertyShape(self, i):
+        """Materialize the PropertyShape with record number i."""
+        propertyShape = self.propertyShapes.get(i)
+        if propertyShape is not None:
+            return propertyShape
+
+        record = PROPERTY.unpack_from(self.buffer, self.propertyOffset + i * PROPERTY.size)
+        propertyShape = PropertyShape()
+        propertyShape.uri = self.string(record[0])
+        propertyShape.path = self.path(record[1])
+        for n, attribute in enumerate(PROPERTY_STRINGS[1:]):
+            setattr(propertyShape, attribute, self.string(record[2 + n]))
+        for n, attribute in enumerate(PROPERTY_INTEGERS):
+            setattr(propertyShape, attribute, record[7 + n])
+        booleans, qualifiedValueShape, isSet = record[14:17]
+        propertyShape.uniqueLang = bool(booleans & 1)
+        propertyShape.qualifiedValueShapesDisjoint = bool(booleans & 2)
+        self.updateIsSet(propertyShape.isSet, self.propertyFields, isSet)
+        if qualifiedValueShape >= 0:
+            propertyShape.qualifiedValueShape = self.propertyShape(qualifiedValueShape)
+        lists = record[17:]
+        for n, attribute in enumerate(PROPERTY_LISTS):
+            setattr(propertyShape, attribute, self.stringList(lists[2 * n], lists[2 * n + 1]))
+        propertyShape.hasValue = self.valueList(lists[14], lists[15])
+        propertyShape.shIn = self.valueList(lists[16], lists[17])
+        propertyShape.message = self.message(lists[18], lists[19])
+        for attribute, value in zip(PROPERTY_RANGES, self.valueList(lists[20], lists[21])):
+            setattr(propertyShape, attribute, value)
+        self.propertyShapes[i] = propertyShape
+        self.readLogicalLists(propertyShape, lists[22:])
+        return propertyShape
+
+    def operand(self, i):
+        return self.propertyShape(i >> 1) if i & 1 else self.nodeShape(i >> 1)
+
+    def readLogicalLists(self, shape, lists):
+        for n, attribute in enumerate(LOGICAL_LISTS):
+            ids = self.uintList(lists[2 * n], lists[2 * n + 1])
+            values = []
+            position = 0
+            while position < len(ids):
+                count = ids[position]
+                values.append([self.operand(j) for j in ids[position + 1:position + 1 + count]])
+                position += 1 + count
+            setattr(shape, attribute, values)
+        shape.sNot = [self.operand(j) for j in self.uintList(lists[6], lists[7])]
+
+    def materializeAll(self):
+        """Materialize all node shapes and return them as a dictionary."""
+        return {self.nodeUri(i): self.nodeShape(i) for i in range(self.nodeCount)}
@@ -0,0 +1,287 @@
+import json
+import logging
+import os
+import tempfile
+from .HTMLSerializer import HTMLSerializer
+from .JSONSchemaSerializer import JSONSchemaSerializer
+from .ParserLimits import ShapeParserLimitError
+from .RDFormsSerializer import RDFormsSerializer
+from .WisskiSerializer import WisskiSerializer
+
+# output format -> method that serializes a sample of node shapes into a file
+FORMATS = {'rdforms': 'writeRDForms', 'html': 'writeHTML', 'wisski': 'writeWisski',
+           'jsonschema': 'writeJSONSchema'}
+
+
+def distribution(values):
+    """Summarize a list of non-negative integers.
+
+    returns: dict with "count", "min", "max", "mean" and a "histogram" of power of two
+             buckets ("0", "1", "2-3", "4-7", ...)
+    """
+    values = list(values)
+    histogram = {}
+    for value in sorted(values):
+        if value < 2:
+            bucket = str(value)
+        else:
+            low = 1 << (value.bit_length() - 1)
+            bucket = '{}-{}'.format(low, 2 * low - 1)
+        histogram[bucket] = histogram.get(bucket, 0) + 1
+    return {
+        'count': len(values),
+        'min': min(values) if values else 0,
+        'max': max(values) if values else 0,
+        'mean': round(sum(values) / len(values), 2) if values else 0,
+        'histogram': histogram
+    }
+
+
+def pathDepth(path):
+    """Return the nesting depth of a path as returned by ShapeParser.getPropertyPath()."""
+    if isinstance(path, list):
+        return 1 + max((pathDepth(member) for member in path), default=0)
+    if isinstance(path, dict):
+        return 1 + max((pathDepth(inner) for inner in path.values()), default=0)
+    return 1
+
+
+class ShapeStatistics:
+    """Statistics of a shapes graph, computed without extracting the shapes.
+
+    Only the discovery of the parser (getNodeShapeUris() and getPropertyShapeCandidates())
+    and the paths and lists of the property shapes are evaluated, so the statistics are
+    cheap compared to a conversion and subject to the same ParserLimits. The output size
+    per format is estimated by serializing a small sample of node shapes.
+    """
+
+    logger = logging.getLogger('ShacShifter.ShapeStatistics')
+
+    def __init__(self, parser, sampleSize=16):
+        """Initialize the statistics.
+
+        args: ShapeParser parser, with the shapes graph loaded (see ShapeParser.loadGraph())
+              int sampleSize, number of node shapes serialized to estimate the output sizes
+        """
+        self.parser = parser
+        self.sampleSize = sampleSize
+
+    def collect(self):
+        """Compute the statistics.
+
+        returns: dict with the counts of "triples", "nodeShapes" and "propertyShapes" (with
+                 the property shapes whose path or sh:in list exceeds a ParserLimit as
+                 "malformed"), the "fanOut" of shared property shapes, "propertiesPerShape",
+                 "pathDepth", the sizes of the "shIn" lists, the "cardinality" (malformed
+                 counts are skipped and counted), the "nodeReferences" and the
+                 "estimatedBytes" per output format
+        raises: ShapeParserLimitError if the time budget is used up
+        """
+        parser = self.parser
+        sh = parser.sh
+        g = parser.g
+        with parser.profiler.phase('discovery'):
+            nodeShapeUris = sorted(parser.getNodeShapeUris())
+            candidates = parser.getPropertyShapeCandidates()
+
+        with parser.profiler.phase('index'):
+            users = {}
+            propertiesPerShape = []
+            for uri in nodeShapeUris:
+                properties = list(g.objects(uri, sh.property))
+                propertiesPerShape.append(len(properties))
+                for propertyShape in properties:
+                    users.setdefault(propertyShape, set()).add(uri)
+            references = sum(propertiesPerShape)
+            propertyShapes = list(users) + sorted(candidates.difference(users))
+
+            depths = []
+            inSizes = []
+            minCounts = []
+            maxCounts = []
+            malformed = {sh.minCount: 0, sh.maxCount: 0}
+            malformedShapes = 0
+            for propertyShape in propertyShapes:
+                # statistics are also wanted for shapes graphs the parser rejects
+                try:
+                    path = g.value(propertyShape, sh.path)
+                    if path is not None:
+                        depths.append(pathDepth(parser.getPropertyPath(path)))
+                    head = g.value(propertyShape, sh['in'])
+                    if head is not None:
+                        inSizes.append(sum(1 for _ in parser.walkList(head)))
+                except ShapeParserLimitError as e:
+                    if e.limit == 'timeBudget':
+                        raise
+                    self.logger.warning('Malformed property shape %s: %s', propertyShape, e)
+                    malformedShapes += 1
+                for predicate, counts in [(sh.minCount, minCounts), (sh.maxCount, maxCounts)]:
+                    value = g.value(propertyShape, predicate)
+                    if value is None:
+                        continue
+                    try:
+                        counts.append(int(value))
+                    except ValueError:
+                        self.logger.warning('Malformed %s %s of %s', predicate, value,
+                                            propertyShape)
+                        malformed[predicate] += 1
+            fanOut = [len(shapes) for shapes in users.values()]
+            nodeReferences = self.nodeReferences(nodeShapeUris)
+
+        with parser.profiler.phase('estimate'):
+            estimates = self.estimateSizes(nodeShapeUris, len(nodeShapeUris) + references)
+
+        return {
+            'triples': len(g),
+            'nodeShapes': len(nodeShapeUris),
+            'propertyShapes': {
+                'count': len(propertyShapes),
+                'standalone': len(candidates),
+                'references': references,
+                'malformed': malformedShapes
+            },
+            'fanOut': {
+                'shared': sum(1 for count in fanOut if count > 1),
+                'max': max(fanOut, default=0),
+                'distribution': distribution(fanOut)
+            },
+            'propertiesPerShape': distribution(propertiesPerShape),
+            'pathDepth': distribution(depths),
+            'shIn': distribution(inSizes),
+            'cardinality': {
+                'maxMinCount': max(minCounts, default=0),
+                'maxMaxCount': max(maxCounts, default=0),
+                'unbounded': len(propertyShapes) - len(maxCounts) - malformed[sh.maxCount],
+                'malformed': sum(malformed.values())
+            },
+            'nodeReferences': nodeReferences,
+            'estimatedBytes': estimates
+        }
+
+    def nodeReferences(self, nodeShapeUris):
+        """Return the number of sh:node references and the longest chain of them.
+
+        A node shape references the shapes of its own sh:node and of the sh:node of its
+        property shapes. References that close a cycle are counted but do not extend the
+        chain.
+
+        returns: dict with "count", "maxDepth" and "cycles"
+        """
+        g = self.parser.g
+        sh = self.parser.sh
+        edges = {}
+        count = 0
+        for uri in nodeShapeUris:
+            targets = list(g.objects(uri, sh.node))
+            for propertyShape in g.objects(uri, sh.property):
+                targets.extend(g.objects(propertyShape, sh.node))
+            count += len(targets)
+            edges[uri] = targets
+
+        depth = {}
+        cycles = 0
+        active = set()
+        for start in nodeShapeUris:
+            if start in depth:
+                continue
+            # iterative depth first search, the chains can be longer than the recursion limit
+            stack = [(start, iter(edges.get(start, ())))]
+            active.add(start)
+            while stack:
+                node, targets = stack[-1]
+                target = next(targets, None)
+                if target is None:
+                    stack.pop()
+                    active.discard(node)
+                    depth[node] = max((depth.get(child, -1) + 1
+                                       for child in edges.get(node, ())
+                                       if child in depth), default=0)
+                elif target in active:
+                    cycles += 1
+                elif target not in depth:
+                    active.add(target)
+                    stack.append((target, iter(edges.get(target, ()))))
+        return {'count': count, 'maxDepth': max(depth.values(), default=0), 'cycles': cycles}
+
+    def sample(self, nodeShapeUris):
+        """Return up to sampleSize node shape URIs, spread evenly over nodeShapeUris."""
+        if self.sampleSize <= 0:
+            return []
+        if len(nodeShapeUris) <= self.sampleSize:
+            return list(nodeShapeUris)
+        step = len(nodeShapeUris) / self.sampleSize
+        return [nodeShapeUris[int(n * step)] for n in range(self.sampleSize)]
+
+    def estimateSizes(self, nodeShapeUris, units):
+        """Estimate the output size of every format in bytes.
+
+        The node shapes of the sample are parsed and serialized, the size per node and
+        property shape of the sample is scaled to all units (node shapes plus references
+        to property shapes). Node shapes the parser rejects are left out of the sample,
+        formats that fail on the sample are estimated as None.
+
+        The sample is parsed with the parser, so its caches of property and operand shapes
+        are filled. The labels of the shapes graph are added to a copy of its LabelIndex,
+        the labels of the parser are not changed.
+
+        returns: dict format -> int bytes or None
+        """
+        parser = self.parser
+        nodeShapes = {}
+        sample = self.sample(nodeShapeUris)
+        for uri in sample:
+            try:
+                nodeShape = parser.operandShapes.get(uri) or parser.parseNodeShape(uri)
+            except Exception as e:
+                self.logger.warning('Could not parse %s for the estimation: %s', uri, e)
+                continue
+            nodeShapes[nodeShape.uri] = nodeShape
+        if sample and not nodeShapes:
+            return {name: None for name in FORMATS}
+        sampleUnits = sum(1 + len(nodeShape.properties) for nodeShape in nodeShapes.values())
+        if not sampleUnits:
+            return {name: 0 for name in FORMATS}
+
+        # labels make up a good part of the output
+        labels = parser.labels.copy()
+        labels.addGraph(parser.g)
+        estimates = {}
+        with tempfile.TemporaryDirectory() as directory:
+            for name in FORMATS:
+                outputfile = os.path.join(directory, 'sample.' + name)
+                try:
+                    getattr(self, FORMATS[name])(nodeShapes, outputfile, labels)
+                except Exception as e:
+                    self.logger.warning('Could not estimate the size of %s: %s', name, e)
+                    estimates[name] = None
+                    continue
+                size = os.path.getsize(outputfile)
+                estimates[name] = int(size * units / sampleUnits)
+        self.logger.debug('Sample of %d shapes with %d units: %s', len(nodeShapes),
+                          sampleUnits, estimates)
+        return estimates
+
+    def writeRDForms(self, nodeShapes, outputfile, labels):
+        serializer = RDFormsSerializer(nodeShapes, labels=labels)
+        # RDFormsSerializer.write() echoes the bundles to sysout
+        with open(outputfile, 'w') as fp:
+            for bundle in serializer.templateBundles:
+                fp.write(bundle.toJson() + '\n')
+
+    def writeHTML(self, nodeShapes, outputfile, labels):
+        HTMLSerializer(nodeShapes, outputfile, labels=labels)
+
+    def writeWisski(self, nodeShapes, outputfile, labels):
+        WisskiSerializer(nodeShapes, outputfile, labels=labels).write()
+
+    def writeJSONSchema(self, nodeShapes, outputfile, labels):
+        JSONSchemaSerializer(nodeShapes, outputfile, labels=labels).write()
+
+    def write(self, outputfile=None):
+        """Write the statistics as JSON to outputfile or sysout."""
+        content = json.dumps(self.collect(), indent=4, default=str)
+        if outputfile:
+            with open(outputfile, 'w') as fp:
+                fp.write(content + '\n')
+        else:
+            print(content)
@@ -0,0 +1,554 @@
+import logging
+import rdflib
+from rdflib.namespace import RDF, RDFS, XSD
+from .ColumnarChecks import ColumnarChecks
+from .PathEvaluator import PathEvaluator
+from .PatternRegistry import PatternRegistry
+from .ShapeNormalizer import ShapeNormalizer
+from .ShapeParser import ShapeParser
+from .TargetIndex import TargetIndex
+from .modules.NodeShape import NodeShape
+from .modules.Term import Term
+
+SH = rdflib.Namespace('http://www.w3.org/ns/shacl#')
+
+NODE_KINDS = {
+    str(SH.IRI): (rdflib.URIRef,),
+    str(SH.BlankNode): (rdflib.BNode,),
+    str(SH.Literal): (rdflib.Literal,),
+    str(SH.BlankNodeOrIRI): (rdflib.BNode, rdflib.URIRef),
+    str(SH.BlankNodeOrLiteral): (rdflib.BNode, rdflib.Literal),
+    str(SH.IRIOrLiteral): (rdflib.URIRef, rdflib.Literal)
+}
+
+
+def termKey(term):
+    """Return a key that is equal for the same RDF term, as rdflib term or Term (detached).
+
+    IRIs and literals with the same text differ, as do literals with different languages or
+    datatypes.
+    """
+    return Term.fromTerm(term)
+
+
+class ValidationResult:
+    """A single result of a validation, i.e. a constraint violation."""
+
+    __slots__ = ('focusNode', 'resultPath', 'value', 'sourceShape', 'sourceConstraintComponent',
+                 'message')
+
+    def __init__(self, focusNode, sourceShape, component, resultPath=None, value=None,
+                 message=None):
+        self.focusNode = focusNode
+        self.resultPath = resultPath
+        self.value = value
+        self.sourceShape = sourceShape
+        self.sourceConstraintComponent = component
+        self.message = message
+
+    def __str__(self):
+        """Print ValidationResult object."""
+        return ', '.join(['%s: %s' % (key, getattr(self, key)) for key in self.__slots__])
+
+    def triples(self, report):
+        """Yield the triples describing this result as sh:result of report."""
+        result = rdflib.BNode()
+        yield report, SH.result, result
+        yield result, RDF.type, SH.ValidationResult
+        yield result, SH.focusNode, self.focusNode
+        yield result, SH.resultSeverity, SH.Violation
+        yield result, SH.sourceConstraintComponent, self.sourceConstraintComponent
+        yield (result, SH.sourceShape,
+               rdflib.URIRef(self.sourceShape) if self.sourceShape else rdflib.BNode())
+        if isinstance(self.resultPath, str):
+            yield result, SH.resultPath, rdflib.URIRef(self.resultPath)
+        if self.value is not None:
+            yield result, SH.value, self.value
+        if self.message is not None:
+            yield result, SH.resultMessage, rdflib.Literal(self.message)
+
+    def addToGraph(self, graph, report):
+        for triple in self.triples(report):
+            graph.add(triple)
+
+
+class ValidationReport:
+    """The result of validating a data graph against shapes."""
+
+    def __init__(self, results=None):
+        self.results = [] if results is None else results
+
+    @property
+    def conforms(self):
+        return len(self.results) == 0
+
+    def toGraph(self):
+        """Return the report as rdflib Graph using the SHACL validation report vocabulary."""
+        graph = rdflib.Graph()
+        graph.bind('sh', SH)
+        report = rdflib.BNode()
+        graph.add((report, RDF.type, SH.ValidationReport))
+        graph.add((report, SH.conforms, rdflib.Literal(self.conforms)))
+        for result in self.results:
+            result.addToGraph(graph, report)
+        return graph
+
+    def write(self, outputfile=None, format='turtle'):
+        """Write the report to outputfile or sysout."""
+        data = self.toGraph().serialize(format=format)
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+        if outputfile:
+            with open(outputfile, 'w') as fp:
+                fp.write(data)
+        else:
+            print(data)
+
+
+class ValidationContext:
+    """Per run state of a validation, i.e. the data graph and caches."""
+
+    def __init__(self, validator, dataGraph):
+        self.validator = validator
+        self.g = dataGraph
+        self.paths = PathEvaluator(dataGraph)
+        self.conformance = {}
+        self.superClasses = {}
+        self.types = {}
+        self.columns = {}
+
+    def values(self, focusNode, path):
+        """Return the value nodes of focusNode for path."""
+        if isinstance(path, str):
+            if path == '':
+                return [focusNode]
+            return list(self.g.objects(focusNode, rdflib.URIRef(path)))
+        return list(self.paths.values(focusNode, path))
+
+    def superClassesOf(self, cls):
+        """Return cls and all its (transitive) rdfs:subClassOf super classes."""
+        closure = self.superClasses.get(cls)
+        if closure is None:
+            closure = set(self.g.transitive_objects(cls, RDFS.subClassOf))
+            self.superClasses[cls] = closure
+        return closure
+
+    def typesOf(self, node):
+        types = self.types.get(node)
+        if types is None:
+            types = set()
+            for cls in self.g.objects(node, RDF.type):
+                types |= self.superClassesOf(cls)
+            self.types[node] = types
+        return types
+
+    def conformsToOperand(self, key, check, node):
+        """Check if node conforms to an operand of a logical constraint, see conforms()."""
+        key = (key, node)
+        conforms = self.conformance.get(key)
+        if conforms is None:
+            self.conformance[key] = True
+            results = []
+            check(node, self, results)
+            conforms = len(results) == 0
+            self.conformance[key] = conforms
+        return conforms
+
+    def conforms(self, shapeUri, focusNode):
+        """Check if focusNode conforms to the node shape shapeUri."""
+        key = (shapeUri, focusNode)
+        conforms = self.conformance.get(key)
+        if conforms is None:
+            check = self.validator.compiled.get(shapeUri)
+            if check is None:
+                return True
+            # assume conformance while checking, this breaks cycles of sh:node references
+            self.conformance[key] = True
+            results = []
+            check(focusNode, self, results)
+            conforms = len(results) == 0
+            self.conformance[key] = conforms
+        return conforms
+
+
+class ShapeValidator:
+    """Validate data graphs against parsed node shapes.
+
+    Every node shape is compiled once into a list of closures, one per constraint, with
+    patterns compiled and sh:in values collected into frozen sets at compile time.
+
+    Logical constraints are compiled from the EffectiveShapes of the ShapeNormalizer, with
+    sh:and flattened. The logical constraints of sh:and operands are reported as results of
+    their own, the conformance of the focus nodes is the same.
+    """
+
+    logger = logging.getLogger('ShacShifter.ShapeValidator')
+
+    def __init__(self, nodeShapes, localOnly=False, patterns=None, normalizer=None):
+        """Compile the node shapes.
+
+        args: dict nodeShapes as returned by ShapeParser.parseShape()
+              bool localOnly, if True only constraints that can be checked with the triples
+              of the focus node itself are compiled (see StreamingValidator)
+              PatternRegistry patterns (optional) shared cache of compiled sh:pattern
+              ShapeNormalizer normalizer (optional) shared cache of EffectiveShapes
+        """
+        self.nodeShapes = nodeShapes
+        self.localOnly = localOnly
+        self.patterns = PatternRegistry() if patterns is None else patterns
+        self.normalizer = ShapeNormalizer() if normalizer is None else normalizer
+        self.targetIndex = TargetIndex(nodeShapes)
+        self.compiled = {}
+        self.batches = {}
+        self.operandChecks = {}
+        for uri, nodeShape in nodeShapes.items():
+            self.compiled[uri] = self.compileNodeShape(
+                nodeShape, self.batches.setdefault(uri, []))
+
+    def validate(self, dataGraph):
+        """Validate dataGraph and return a ValidationReport."""
+        context = ValidationContext(self, dataGraph)
+        focusNodes = self.targetIndex.focusNodes(dataGraph)
+        results = []
+        for uri in self.nodeShapes:
+            self.checkFocusNodes(uri, sorted(focusNodes.get(uri, ())), context, results)
+        return ValidationReport(results)
+
+    def checkFocusNodes(self, shapeUri, focusNodes, context, results):
+        """Check a list of focus nodes against one node shape, appending to results."""
+        check = self.compiled[shapeUri]
+        for propertyShape in self.nodeShapes[shapeUri].properties:
+            if isinstance(propertyShape.path, (list, dict)):
+                # evaluate complex paths for all focus nodes at once
+                context.paths.evaluate(propertyShape.path, focusNodes)
+        for path, columns in self.batches.get(shapeUri, ()):
+            # check range and length constraints for all focus nodes at once
+            valueLists = [context.values(focusNode, path) for focusNode in focusNodes]
+            context.columns[columns] = dict(zip(focusNodes, columns.check(focusNodes, valueLists)))
+        for focusNode in focusNodes:
+            check(focusNode, context, results)
+
+    def isLocalPath(self, path):
+        """Check if the values of path only depend on the triples of the focus node."""
+        if isinstance(path, str):
+            return True
+        if isinstance(path, dict):
+            (operator, inner), = path.items()
+            operator = str(operator)
+            if operator == str(SH.alternativePath):
+                return all(isinstance(part, str) for part in inner)
+            if operator == str(SH.zeroOrOnePath):
+                return isinstance(inner, str)
+        return False
+
+    def compileNodeShape(self, nodeShape, batches=None, logical=True):
+        """Compile nodeShape into a function check(focusNode, context, results).
+
+        args: NodeShape nodeShape
+              list batches (optional), see compilePropertyShape()
+              bool logical, if False the logical constraints are left out
+        """
+        checks = []
+        shapeUri = nodeShape.uri
+
+        if nodeShape.isSet['nodeKind'] and nodeShape.nodeKind in NODE_KINDS:
+            kinds = NODE_KINDS[nodeShape.nodeKind]
+
+            def checkNodeKind(focusNode, context, results):
+                if not isinstance(focusNode, kinds):
+                    results.append(ValidationResult(
+                        focusNode, shapeUri, SH.NodeKindConstraintComponent, value=focusNode))
+            checks.append(checkNodeKind)
+
+        for propertyShape in nodeShape.properties:
+            if self.localOnly and not self.isLocalPath(propertyShape.path):
+                self.logger.warning(
+                    'Skipping property shape with non-local path %s of %s',
+                    propertyShape.path, shapeUri)
+                continue
+            checks.append(self.compilePropertyShape(propertyShape, batches))
+
+        if nodeShape.closed:
+            allowed = frozenset(
+                [rdflib.URIRef(p.path) for p in nodeShape.properties if isinstance(p.path, str)] +
+                [rdflib.URIRef(p) for p in nodeShape.ignoredProperties])
+
+            def checkClosed(focusNode, context, results):
+                for predicate, value in context.g.predicate_objects(focusNode):
+                    if predicate not in allowed:
+                        results.append(ValidationResult(
+                            focusNode, shapeUri, SH.ClosedConstraintComponent,
+                            resultPath=str(predicate), value=value))
+            checks.append(checkClosed)
+
+        if logical and self.localOnly and any(ShapeParser.operands(nodeShape)):
+            self.logger.warning('Skipping logical constraints of %s', shapeUri)
+        elif logical:
+            for component, test in self.compileLogicalTests(nodeShape):
+                def checkLogical(focusNode, context, results, component=component, test=test):
+                    if not test(focusNode, context):
+                        results.append(ValidationResult(
+                            focusNode, shapeUri, component, value=focusNode))
+                checks.append(checkLogical)
+
+        def check(focusNode, context, results):
+            for constraint in checks:
+                constraint(focusNode, context, results)
+        return check
+
+    def compileLogicalTests(self, shape):
+        """Return (component, test(node, context)) pairs for the logical constraints of shape.
+
+        sh:and is checked as one test of the flattened conjuncts, the node shape conjuncts
+        without their logical constraints, which are part of the EffectiveShape.
+        """
+        effective = self.normalizer.effective(shape)
+        tests = []
+        parts = [self.operandCheck(conjunct, logical=not isinstance(conjunct, NodeShape))
+                 for conjunct in effective.conjuncts if conjunct is not shape]
+        if parts:
+            tests.append((SH.AndConstraintComponent,
+                          lambda node, context: all(part(node, context) for part in parts)))
+        for operands in effective.sOr:
+            members = [self.operandCheck(operand) for operand in operands]
+            tests.append((SH.OrConstraintComponent,
+                          lambda node, context, members=members:
+                          any(member(node, context) for member in members)))
+        for operands in effective.sXone:
+            members = [self.operandCheck(operand) for operand in operands]
+            tests.append((SH.XoneConstraintComponent,
+                          lambda node, context, members=members:
+                          sum(1 for member in members if member(node, context)) == 1))
+        for operand in effective.sNot:
+            member = self.operandCheck(operand)
+            tests.append((SH.NotConstraintComponent,
+                          lambda node, context, member=member: not member(node, context)))
+        return tests
+
+    def operandCheck(self, shape, logical=True):
+        """Return a function conforms(node, context) for an operand of a logical constraint.
+
+        Operands are compiled once, also if they are shared by several constraints.
+        """
+        key = (id(shape), logical)
+        entry = self.operandChecks.get(key)
+        if entry is None:
+            if isinstance(shape, NodeShape):
+                check = self.compileNodeShape(shape, logical=logical)
+            else:
+                check = self.compilePropertyShape(shape)
+
+            def conforms(node, context):
+                return context.conformsToOperand(key, check, node)
+            # the shape is kept, so its id is not reused
+            entry = (shape, conforms)
+            self.operandChecks[key] = entry
+        return entry[1]
+
+    def compilePropertyShape(self, propertyShape, batches=None):
+        """Compile propertyShape into a function check(focusNode, context, results).
+
+        args: PropertyShape propertyShape
+              list batches (optional), (path, ColumnarChecks) pairs are appended for the
+              constraints checked in batches by checkFocusNodes()
+        """
+        path = propertyShape.path
+        checks = self.compileValueChecks(propertyShape, batches)
+
+        def check(focusNode, context, results):
+            values = context.values(focusNode, path)
+            for constraint in checks:
+                constraint(focusNode, values, context, results)
+        return check
+
+    def compileValueChecks(self, propertyShape, batches=None):
+        """Return the constraint closures check(focusNode, values, context, results)."""
+        isSet = propertyShape.isSet
+        source = propertyShape.uri or None
+        path = propertyShape.path
+        message = propertyShape.message.get('default', propertyShape.message.get('en'))
+        checks = []
+
+        # sh:class, sh:node and qualified value shapes need the triples of the value nodes
+        classes = propertyShape.classes
+        nodes = propertyShape.nodes
+        qualified = isSet['qualifiedValueShape']
+        if self.localOnly and (classes or nodes or qualified):
+            self.logger.warning(
+                'Skipping non-local constraints of property shape with path %s', path)
+            classes, nodes, qualified = [], [], False
+
+        def violation(focusNode, component, value=None):
+            return ValidationResult(focusNode, source, component, path, value, message)
+
+        def eachValue(component, test):
+            def checkValues(focusNode, values, context, results):
+                for value in values:
+                    if not test(value, context):
+                        results.append(violation(focusNode, component, value))
+            checks.append(checkValues)
+
+        if isSet['minCount']:
+            minCount = propertyShape.minCount
+
+            def checkMinCount(focusNode, values, context, results):
+                if len(values) < minCount:
+                    results.append(violation(focusNode, SH.MinCountConstraintComponent))
+            checks.append(checkMinCount)
+
+        if isSet['maxCount']:
+            maxCount = propertyShape.maxCount
+
+            def checkMaxCount(focusNode, values, context, results):
+                if len(values) > maxCount:
+                    results.append(violation(focusNode, SH.MaxCountConstraintComponent))
+            checks.append(checkMaxCount)
+
+        if isSet['dataType']:
+            datatype = rdflib.URIRef(propertyShape.dataType)
+
+            def hasDatatype(value, context):
+                if not isinstance(value, rdflib.Literal):
+                    return False
+                if value.language is not None:
+                    return datatype == RDF.langString
+                valueType = XSD.string if value.datatype is None else value.datatype
+                return valueType == datatype and not getattr(value, 'ill_typed', False)
+            eachValue(SH.DatatypeConstraintComponent, hasDatatype)
+
+        for cls in classes:
+            def isInstance(value, context, cls=rdflib.URIRef(cls)):
+                return not isinstance(value, rdflib.Literal) and cls in context.typesOf(value)
+            eachValue(SH.ClassConstraintComponent, isInstance)
+
+        columns = ColumnarChecks(propertyShape)
+        if columns:
+            if batches is not None:
+                batches.append((path, columns))
+
+            def checkColumns(focusNode, values, context, results):
+                batch = context.columns.get(columns)
+                found = batch.pop(focusNode, None) if batch is not None else None
+                if found is None:
+                    found = columns.check([focusNode], [values])[0]
+                for component, value in found:
+                    results.append(violation(focusNode, component, value))
+            checks.append(checkColumns)
+
+        if isSet['pattern']:
+            search = self.patterns.get(propertyShape.pattern, propertyShape.flags).search
+            eachValue(SH.PatternConstraintComponent,
+                      lambda value, context: not isinstance(value, rdflib.BNode) and
+                      search(str(value)))
+
+        if isSet['languageIn']:
+            ranges = [language.lower() for language in propertyShape.languageIn]
+
+            def languageIn(value, context):
+                language = getattr(value, 'language', None)
+                if not language:
+                    return False
+                language = language.lower()
+                return any(r == '*' or language == r or language.startswith(r + '-')
+                           for r in ranges)
+            eachValue(SH.LanguageInConstraintComponent, languageIn)
+
+        if isSet['uniqueLang'] and propertyShape.uniqueLang:
+            def checkUniqueLang(focusNode, values, context, results):
+                seen = set()
+                duplicates = []
+                for value in values:
+                    language = getattr(value, 'language', None)
+                    if language:
+                        if language.lower() in seen and language.lower() not in duplicates:
+                            duplicates.append(language.lower())
+                        seen.add(language.lower())
+                for language in duplicates:
+                    results.append(violation(focusNode, SH.UniqueLangConstraintComponent))
+            checks.append(checkUniqueLang)
+
+        for other in propertyShape.equals:
+            def checkEquals(focusNode, values, context, results, other=rdflib.URIRef(other)):
+                otherValues = set(context.g.objects(focusNode, other))
+                for value in set(values) ^ otherValues:
+                    results.append(violation(focusNode, SH.EqualsConstraintComponent, value))
+            checks.append(checkEquals)
+
+        for other in propertyShape.disjoint:
+            def checkDisjoint(focusNode, values, context, results, other=rdflib.URIRef(other)):
+                otherValues = set(context.g.objects(focusNode, other))
+                for value in values:
+                    if value in otherValues:
+                        results.append(violation(focusNode, SH.DisjointConstraintComponent, value))
+            checks.append(checkDisjoint)
+
+        for attribute, component, accept in [
+                ('lessThan', SH.LessThanConstraintComponent, lambda a, b: a < b),
+                ('lessThanOrEquals', SH.LessThanOrEqualsConstraintComponent,
+                 lambda a, b: a <= b)]:
+            for other in getattr(propertyShape, attribute):
+                def checkLessThan(focusNode, values, context, results,
+                                  other=rdflib.URIRef(other), accept=accept, component=component):
+                    otherValues = list(context.g.objects(focusNode, other))
+                    for value in values:
+                        for otherValue in otherValues:
+                            try:
+                                ok = accept(value.toPython(), otherValue.toPython())
+                            except (TypeError, AttributeError):
+                                ok = False
+                            if not ok:
+                                results.append(violation(focusNode, component, value))
+                                break
+                checks.append(checkLessThan)
+
+        for shapeUri in nodes:
+            eachValue(SH.NodeConstraintComponent,
+                      lambda value, context, shapeUri=shapeUri: context.conforms(shapeUri, value))
+
+        if isSet['hasValue']:
+            required = [(termKey(value), value) for value in propertyShape.hasValue]
+
+            def checkHasValue(focusNode, values, context, results):
+                keys = {termKey(value) for value in values}
+                for key, value in required:
+                    if key not in keys:
+                        results.append(violation(focusNode, SH.HasValueConstraintComponent))
+            checks.append(checkHasValue)
+
+        if self.localOnly and any(ShapeParser.operands(propertyShape)):
+            self.logger.warning(
+                'Skipping logical constraints of property shape with path %s', path)
+        else:
+            for component, test in self.compileLogicalTests(propertyShape):
+                eachValue(component, test)
+
+        if isSet['shIn']:
+            allowedValues = frozenset(termKey(value) for value in propertyShape.shIn)
+            eachValue(SH.InConstraintComponent,
+                      lambda value, context: termKey(value) in allowedValues)
+
+        if qualified:
+            qualifiedShape = propertyShape.qualifiedValueShape
+            qualifiedChecks = self.compileValueChecks(qualifiedShape)
+            qualifiedPath = qualifiedShape.path
+            qualifiedMinCount = propertyShape.qualifiedMinCount
+            qualifiedMaxCount = propertyShape.qualifiedMaxCount
+
+            def conformsToQualifiedShape(value, context):
+                results = []
+                values = context.values(value, qualifiedPath)
+                for constraint in qualifiedChecks:
+                    constraint(value, values, context, results)
+                return len(results) == 0
+
+            def checkQualified(focusNode, values, context, results):
+                count = sum(1 for value in values if conformsToQualifiedShape(value, context))
+                if isSet['qualifiedMinCount'] and count < qualifiedMinCount:
+                    results.append(violation(
+                        focusNode, SH.QualifiedMinCountConstraintComponent))
+                if isSet['qualifiedMaxCount'] and count > qualifiedMaxCount:
+                    results.append(violation(
+                        focusNode, SH.QualifiedMaxCountConstraintComponent))
+            checks.append(checkQualified)
+
+        return checks
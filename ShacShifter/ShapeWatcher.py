@@ -0,0 +1,380 @@
+import bisect
+import logging
+import os
+import re
+import time
+from collections import Counter
+import rdflib
+from rdflib.namespace import RDF
+from .HierarchyIndex import HierarchyIndex
+from .RDFormsSerializer import RDFormsSerializer
+from .ShapeParser import ShapeParser
+
+SH_NODE = rdflib.URIRef('http://www.w3.org/ns/shacl#node')
+
+# the tokens that decide where a top-level Turtle statement ends, everything else is skipped
+TOKENS = re.compile(r'''
+    """(?:[^"\\]|\\.|"(?!""))*"""
+    | \'\'\'(?:[^'\\]|\\.|'(?!''))*\'\'\'
+    | "(?:[^"\\\n]|\\.)*"
+    | '(?:[^'\\\n]|\\.)*'
+    | <[^>\s]*>
+    | \#[^\n]*
+    | [\[\]()]
+    | \.(?=\s|\#|$) | (?<=[\s\])>"'])\.
+''', re.VERBOSE)
+COMMENTS = re.compile(r'#[^\n]*')
+DIRECTIVE = re.compile(r'(?:\s|#[^\n]*)*(?:@prefix|@base|prefix|base)\s', re.IGNORECASE)
+SPARQL_DIRECTIVE = re.compile(r'(?:\s|#[^\n]*)*(?:prefix|base)\s[^<.]*<[^>]*>', re.IGNORECASE)
+
+BLOCK = 65536
+
+
+def splitStatements(text, start=0):
+    """Yield the end offsets of the top-level statements of Turtle text, starting at start.
+
+    A statement runs from the end of the previous one (including whitespace and comments)
+    to its final dot, SPARQL style PREFIX and BASE directives end with their IRI. Trailing
+    text without a final dot is yielded as a last, incomplete statement.
+    """
+    pos = start
+    while True:
+        directive = SPARQL_DIRECTIVE.match(text, pos)
+        if directive:
+            pos = directive.end()
+            yield pos
+            continue
+        depth = 0
+        for token in TOKENS.finditer(text, pos):
+            value = token.group()
+            if value == '[' or value == '(':
+                depth += 1
+            elif value == ']' or value == ')':
+                depth -= 1
+            elif value == '.' and depth <= 0:
+                pos = token.end()
+                yield pos
+                break
+        else:
+            if COMMENTS.sub('', text[pos:]).strip():
+                yield len(text)
+            return
+
+
+def commonPrefix(a, b):
+    """Return the length of the common prefix of the strings a and b."""
+    limit = min(len(a), len(b))
+    pos = 0
+    while pos + BLOCK <= limit and a[pos:pos + BLOCK] == b[pos:pos + BLOCK]:
+        pos += BLOCK
+    # bisect the first differing block
+    high = min(limit, pos + BLOCK)
+    while pos < high:
+        middle = (pos + high + 1) // 2
+        if a[pos:middle] == b[pos:middle]:
+            pos = middle
+        else:
+            high = middle - 1
+    return pos
+
+
+def commonSuffix(a, b, limit):
+    """Return the length of the common suffix of the strings a and b, at most limit."""
+    lengthA, lengthB = len(a), len(b)
+    pos = 0
+    while (pos + BLOCK <= limit and
+           a[lengthA - pos - BLOCK:lengthA - pos] == b[lengthB - pos - BLOCK:lengthB - pos]):
+        pos += BLOCK
+    high = min(limit, pos + BLOCK)
+    while pos < high:
+        middle = (pos + high + 1) // 2
+        if a[lengthA - middle:lengthA - pos] == b[lengthB - middle:lengthB - pos]:
+            pos = middle
+        else:
+            high = middle - 1
+    return pos
+
+
+class ShapeWatcher:
+    """Keep the shapes of a Turtle file resident and update them incrementally on changes.
+
+    The file is split into its top-level statements, every statement is parsed on its own
+    and its triples are kept in one resident graph. After a change only the statements that
+    differ from the last version are parsed, and only the node shapes that reach a changed
+    subject (through their property shapes, blank nodes, list cells, paths, labelled IRIs
+    and the operands of logical constraints) are extracted again and written as new RDForms
+    bundles. Changed prefixes or blank node labels, which are shared between statements,
+    cause a full reload.
+    """
+
+    logger = logging.getLogger('ShacShifter.ShapeWatcher')
+
+    def __init__(self, inputFilePath, outputfile, profiler=None, limits=None,
+                 ontology=None, ontologyUrl=''):
+        """Initialize the watcher, nothing is read before load() or watch().
+
+        args: string inputFilePath the shapes graph in Turtle
+              string outputfile the RDForms output
+              Profiler profiler (optional)
+              ParserLimits limits (optional)
+              rdflib Graph ontology (optional) labels and sh:class choices
+              string ontologyUrl (optional) the source of the ontology
+        """
+        if not outputfile:
+            raise Exception('The watch mode requires an output file')
+        self.inputFilePath = inputFilePath
+        self.outputfile = outputfile
+        self.profiler = profiler
+        self.limits = limits
+        self.ontology = ontology
+        self.ontologyUrl = ontologyUrl
+        self.hierarchy = None if ontology is None else HierarchyIndex(ontology)
+        self.reset()
+
+    def reset(self):
+        """Forget the resident model."""
+        self.parser = ShapeParser(profiler=self.profiler, limits=self.limits)
+        if self.ontology is not None:
+            self.parser.labels.addGraph(self.ontology)
+        self.serializer = RDFormsSerializer({}, self.outputfile, labels=self.parser.labels,
+                                            hierarchy=self.hierarchy,
+                                            ontologyUrl=self.ontologyUrl)
+        self.text = ''
+        self.ends = []
+        self.prolog = ''
+        # statement text -> [number of occurrences, triples]
+        self.statements = {}
+        # triple -> number of statements asserting it
+        self.assertions = Counter()
+        # node shape -> nodes its bundle depends on, and the reverse
+        self.closures = {}
+        self.dependents = {}
+        self.bundles = {}
+
+    def load(self):
+        """Read the whole file and write all bundles."""
+        self.reset()
+        return self.update()
+
+    def read(self):
+        with open(self.inputFilePath, encoding='utf-8') as fp:
+            return fp.read()
+
+    def stamp(self):
+        try:
+            stat = os.stat(self.inputFilePath)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def watch(self, interval=0.2):
+        """Load the file and update the output after every change, until interrupted."""
+        stamp = self.stamp()
+        self.safeUpdate()
+        try:
+            while True:
+                time.sleep(interval)
+                current = self.stamp()
+                if current is not None and current != stamp:
+                    stamp = current
+                    self.safeUpdate()
+        except KeyboardInterrupt:
+            self.logger.info('Stopped watching %s', self.inputFilePath)
+
+    def safeUpdate(self):
+        """Update and log errors instead of raising them, the old model stays resident."""
+        try:
+            start = time.perf_counter()
+            changed = self.update()
+            self.logger.info('Updated %d shapes in %.1f ms', len(changed),
+                             (time.perf_counter() - start) * 1000)
+        except Exception as e:
+            self.logger.error('Could not update %s: %s', self.inputFilePath, e)
+
+    def update(self):
+        """Apply the changes of the file since the last update.
+
+        returns: set of the URIs of the node shapes that were extracted again or removed
+        """
+        text = self.read()
+        if text == self.text and self.ends:
+            return set()
+        ends, removed, added = self.diffStatements(text)
+        if self.text and not all(self.isLocal(key) for key in removed + added):
+            self.logger.debug('Prefixes or blank node labels changed, reloading')
+            self.reset()
+            ends, removed, added = self.diffStatements(text)
+        reload = not self.text
+
+        if reload:
+            self.prolog = '\n'.join(key for key in added if DIRECTIVE.match(key))
+        parsed = {}
+        for key in added:
+            if key not in self.statements and key not in parsed and not DIRECTIVE.match(key):
+                parsed[key] = self.parseStatement(key)
+
+        # nothing is changed before all new statements are parsed without errors
+        touched = set()
+        graph = self.parser.g
+        for key in removed:
+            if DIRECTIVE.match(key):
+                continue
+            entry = self.statements[key]
+            entry[0] -= 1
+            if entry[0] == 0:
+                del self.statements[key]
+                for triple in entry[1]:
+                    self.assertions[triple] -= 1
+                    if self.assertions[triple] == 0:
+                        del self.assertions[triple]
+                        graph.remove(triple)
+                        touched.add(triple[0])
+        for key in added:
+            if DIRECTIVE.match(key):
+                continue
+            entry = self.statements.get(key)
+            if entry is None:
+                entry = self.statements[key] = [0, parsed[key]]
+                for triple in entry[1]:
+                    self.assertions[triple] += 1
+                    if self.assertions[triple] == 1:
+                        graph.add(triple)
+                        touched.add(triple[0])
+            entry[0] += 1
+        self.text = text
+        self.ends = ends
+        self.parser.limits.check('maxTriples', len(graph))
+
+        if reload:
+            self.parser.labels.addGraph(graph)
+        else:
+            graphs = [graph] if self.ontology is None else [graph, self.ontology]
+            self.parser.labels.update(touched, *graphs)
+
+        changed = self.updateShapes(touched, reload)
+        self.write()
+        return changed
+
+    def diffStatements(self, text):
+        """Split the part of text that differs from the last version into statements.
+
+        returns: (new end offsets of all statements, removed and added statement texts)
+        """
+        old, ends = self.text, self.ends
+        prefix = commonPrefix(old, text)
+        suffix = commonSuffix(old, text, min(len(old), len(text)) - prefix)
+        delta = len(text) - len(old)
+
+        # statements that end right at the change may end differently now
+        first = bisect.bisect_left(ends, prefix)
+        start = ends[first - 1] if first > 0 else 0
+        newEnds = []
+        last = len(ends) - 1
+        for end in splitStatements(text, start):
+            newEnds.append(end)
+            if end >= len(text) - suffix:
+                index = bisect.bisect_left(ends, end - delta)
+                if index < len(ends) and ends[index] == end - delta:
+                    last = index
+                    break
+
+        removed = [old[begin:end].strip() for begin, end in
+                   zip([start] + ends[first:last], ends[first:last + 1])]
+        added = [text[begin:end].strip() for begin, end in zip([start] + newEnds, newEnds)]
+        # statements that only moved are neither removed nor added
+        common = Counter(removed) & Counter(added)
+        if common:
+            removed = list((Counter(removed) - common).elements())
+            added = list((Counter(added) - common).elements())
+        ends = ends[:first] + newEnds + [end + delta for end in ends[last + 1:]]
+        return ends, removed, added
+
+    @staticmethod
+    def isLocal(key):
+        """Check if a statement can be replaced on its own."""
+        return not DIRECTIVE.match(key) and '_:' not in key
+
+    def parseStatement(self, key):
+        """Return the triples of a single statement."""
+        graph = rdflib.Graph()
+        graph.parse(data=self.prolog + '\n' + key, format='turtle')
+        return list(graph)
+
+    def closure(self, shapeUri, shapes):
+        """Return the nodes whose triples are used to extract the node shape shapeUri.
+
+        These are reached over all objects except literals, classes of rdf:type and node
+        shapes referenced with sh:node. Node shapes that are operands of sh:and, sh:or,
+        sh:xone and sh:not are part of the extracted shape (sh:and operands are even
+        flattened into its bundle), so they and their nodes are included.
+        """
+        nodes = {shapeUri}
+        stack = [shapeUri]
+        while stack:
+            for predicate, value in self.parser.g.predicate_objects(stack.pop()):
+                if (isinstance(value, rdflib.Literal) or value in nodes or predicate == RDF.type
+                        or (predicate == SH_NODE and value in shapes)):
+                    continue
+                nodes.add(value)
+                stack.append(value)
+        return nodes
+
+    def updateShapes(self, touched, reload=False):
+        """Extract the node shapes that depend on a touched node again.
+
+        returns: set of the URIs of the extracted and removed node shapes
+        """
+        if reload:
+            affected = self.parser.getNodeShapeUris()
+        else:
+            affected = set()
+            for node in touched:
+                affected.update(self.dependents.get(node, ()))
+                if node not in self.closures and self.parser.isNodeShape(node):
+                    affected.add(node)
+        removed = {shapeUri for shapeUri in affected if not self.parser.isNodeShape(shapeUri)}
+        shapes = set(self.closures).union(affected).difference(removed)
+
+        # all affected shapes are dropped before any is extracted again, so a shape does not
+        # pick up the outdated version of an operand that is extracted after it
+        nodeShapes = self.parser.nodeShapes
+        order = list(nodeShapes)
+        for shapeUri in affected:
+            for node in self.closures.pop(shapeUri, ()):
+                self.dependents[node].discard(shapeUri)
+                if not self.dependents[node]:
+                    # nodes that unaffected shapes still use did not change
+                    del self.dependents[node]
+                    self.parser.propertyShapes.pop(node, None)
+                    self.parser.operandShapes.pop(node, None)
+            self.parser.operandShapes.pop(shapeUri, None)
+            oldShape = nodeShapes.pop(str(shapeUri), None)
+            if oldShape is not None:
+                for propertyShape in oldShape.properties:
+                    self.parser.labels.shapeNames.pop(propertyShape, None)
+            if shapeUri in removed:
+                self.bundles.pop(str(shapeUri), None)
+
+        for shapeUri in sorted(affected.difference(removed), key=str):
+            nodeShape = self.parser.extractNodeShape(shapeUri)
+            self.bundles[nodeShape.uri] = \
+                self.serializer.createTemplateBundle(nodeShape).toJson()
+            closure = self.closure(shapeUri, shapes)
+            self.closures[shapeUri] = closure
+            for node in closure:
+                self.dependents.setdefault(node, set()).add(shapeUri)
+        # replaced shapes keep their position in the output
+        extracted = dict(nodeShapes)
+        nodeShapes.clear()
+        for uri in order + list(extracted):
+            if uri in extracted and uri not in nodeShapes:
+                nodeShapes[uri] = extracted[uri]
+        return {str(shapeUri) for shapeUri in affected}
+
+    def write(self):
+        """Write all bundles, the file is replaced at once."""
+        temporary = self.outputfile + '.tmp'
+        with open(temporary, 'w') as fp:
+            for bundle in self.bundles.values():
+                fp.write(bundle + '\n')
+        os.replace(temporary, self.outputfile)
@@ -0,0 +1,103 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+
+MANIFEST = 'manifest.json'
+HASH_LENGTH = 20
+SHARD_NAME = re.compile(r'^[0-9a-f]{%d}\.json(\.gz)?$' % HASH_LENGTH)
+CHUNK = 65536
+
+
+class ShardedWriter:
+    """Write one file per node shape into a directory, plus a manifest.
+
+    Files are named after the SHA-256 hash of their (uncompressed) content, so a file never
+    changes once it is written and can be cached forever. Files that already exist are not
+    written again, files that are no longer in the manifest are removed.
+
+    The manifest maps every shape URI to its file, the size of the file in bytes and the
+    content hash, and every target class to the entries of its shapes.
+    """
+
+    logger = logging.getLogger('ShacShifter.ShardedWriter')
+
+    def __init__(self, directory, compress=False):
+        """Initialize the writer.
+
+        args: string directory, created if it does not exist
+              bool compress, write gzip compressed files
+        """
+        self.directory = directory
+        self.compress = compress
+        self.written = 0
+        self.unchanged = 0
+        self.removed = 0
+
+    def write(self, shards):
+        """Write the shards and the manifest.
+
+        args: iterable of (shape URI, list of target classes, JSON serializable content)
+        returns: dict manifest
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        shapes = {}
+        targetClasses = {}
+        for uri, classes, content in shards:
+            entry = self.writeShard(content)
+            shapes[uri] = entry
+            for cls in classes:
+                targetClasses.setdefault(cls, []).append(dict(entry, shape=uri))
+
+        manifest = {
+            'compression': 'gzip' if self.compress else None,
+            'shapes': shapes,
+            'targetClasses': targetClasses
+        }
+        self.writeManifest(manifest)
+        self.prune({entry['file'] for entry in shapes.values()})
+        self.logger.info('%d files written, %d unchanged, %d removed',
+                         self.written, self.unchanged, self.removed)
+        return manifest
+
+    def writeShard(self, content):
+        """Write content into its file, unless the file exists, and return its manifest entry."""
+        data = json.dumps(content, separators=(',', ':')).encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        name = digest[:HASH_LENGTH] + ('.json.gz' if self.compress else '.json')
+        path = os.path.join(self.directory, name)
+        if os.path.exists(path):
+            self.unchanged += 1
+        else:
+            temporary = path + '.tmp'
+            with open(temporary, 'wb') as fp:
+                # mtime 0 makes compressed files reproducible
+                stream = gzip.GzipFile(fileobj=fp, mode='wb', mtime=0) if self.compress else fp
+                for start in range(0, len(data), CHUNK):
+                    stream.write(data[start:start + CHUNK])
+                if self.compress:
+                    stream.close()
+            os.replace(temporary, path)
+            self.written += 1
+        return {'file': name, 'size': os.path.getsize(path), 'hash': digest}
+
+    def writeManifest(self, manifest):
+        """Write the manifest, unless it did not change."""
+        data = json.dumps(manifest, indent=4, sort_keys=True).encode('utf-8')
+        path = os.path.join(self.directory, MANIFEST)
+        if os.path.exists(path):
+            with open(path, 'rb') as fp:
+                if fp.read() == data:
+                    return
+        with open(path + '.tmp', 'wb') as fp:
+            fp.write(data)
+        os.replace(path + '.tmp', path)
+
+    def prune(self, files):
+        """Remove shard files of earlier runs that are not in files."""
+        for name in os.listdir(self.directory):
+            if SHARD_NAME.match(name) and name not in files:
+                os.remove(os.path.join(self.directory, name))
+                self.removed += 1
@@ -0,0 +1,189 @@
+import heapq
+import itertools
+import logging
+import os
+import shutil
+import tempfile
+import rdflib
+from rdflib.namespace import RDF
+from .NTriples import openNTriples, parseLine, subjectKey
+from .ShapeValidator import ShapeValidator, ValidationContext, SH
+
+
+class SubjectGraph:
+    """The triples of a single subject.
+
+    Offers the part of the rdflib Graph API the validator uses, lookups for other subjects
+    return nothing.
+    """
+
+    def __init__(self, subject, triples=()):
+        self.subject = subject
+        self.index = {}
+        for _, predicate, obj in triples:
+            values = self.index.setdefault(predicate, [])
+            if obj not in values:
+                values.append(obj)
+
+    def objects(self, subject=None, predicate=None):
+        if subject is not None and subject != self.subject:
+            return iter(())
+        if predicate is None:
+            return iter([obj for values in self.index.values() for obj in values])
+        return iter(self.index.get(predicate, ()))
+
+    def subjects(self, predicate=None, object=None):
+        for obj in self.objects(self.subject, predicate):
+            if object is None or obj == object:
+                return iter([self.subject])
+        return iter(())
+
+    def predicate_objects(self, subject=None):
+        if subject is not None and subject != self.subject:
+            return iter(())
+        return iter([(predicate, obj) for predicate, values in self.index.items()
+                     for obj in values])
+
+    def triples(self, pattern):
+        subject, predicate, obj = pattern
+        for p, o in self.predicate_objects(subject):
+            if (predicate is None or p == predicate) and (obj is None or o == obj):
+                yield self.subject, p, o
+
+    def __len__(self):
+        return sum(len(values) for values in self.index.values())
+
+
+class SubjectGrouper:
+    """Group the lines of an N-Triples file by subject using an external merge sort.
+
+    The input is read in chunks of chunkSize lines, every chunk is sorted by subject and
+    spilled to a temporary run file, the runs are merged afterwards. Only one chunk and
+    the description of the current subject are held in memory.
+    """
+
+    def __init__(self, chunkSize=500000, tempDir=None):
+        self.chunkSize = chunkSize
+        self.tempDir = tempDir
+
+    def groups(self, inputFilePath):
+        """Yield (subject, list of lines) for every subject of the input file."""
+        directory = tempfile.mkdtemp(prefix='shacshifter-', dir=self.tempDir)
+        runs = []
+        try:
+            with openNTriples(inputFilePath) as fp:
+                while True:
+                    lines = list(itertools.islice(fp, self.chunkSize))
+                    if not lines:
+                        break
+                    chunk = [line if line.endswith('\n') else line + '\n' for line in lines
+                             if line.strip() and not line.lstrip().startswith('#')]
+                    chunk.sort(key=subjectKey)
+                    if len(lines) < self.chunkSize and not runs:
+                        # everything fits into one chunk, no need to spill
+                        runs.append(chunk)
+                        break
+                    runs.append(self.spill(chunk, directory, len(runs)))
+
+            files = [open(run) if isinstance(run, str) else None for run in runs]
+            try:
+                streams = [run if fp is None else fp for run, fp in zip(runs, files)]
+                merged = heapq.merge(*streams, key=subjectKey)
+                for subject, lines in itertools.groupby(merged, key=subjectKey):
+                    yield subject, list(lines)
+            finally:
+                for fp in files:
+                    if fp is not None:
+                        fp.close()
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def spill(self, chunk, directory, number):
+        path = os.path.join(directory, 'run{}.nt'.format(number))
+        with open(path, 'w') as fp:
+            fp.writelines(chunk)
+        return path
+
+
+class StreamingValidator:
+    """Validate N-Triples data that does not fit into memory.
+
+    Triples are grouped by subject (see SubjectGrouper) and every subject is validated on its
+    own, so the peak memory depends on the largest subject description and not on the size
+    of the data. Therefore only constraints that can be checked with the triples of the focus
+    node are evaluated, and sh:targetObjectsOf is not supported.
+    """
+
+    logger = logging.getLogger('ShacShifter.StreamingValidator')
+
+    def __init__(self, nodeShapes, hierarchyGraphs=(), chunkSize=500000, tempDir=None):
+        """Compile the node shapes.
+
+        args: dict nodeShapes as returned by ShapeParser.parseShape()
+              list of rdflib Graphs hierarchyGraphs with rdfs:subClassOf triples used for
+              sh:targetClass
+              int chunkSize number of lines sorted in memory
+              string tempDir directory for spill files
+        """
+        self.validator = ShapeValidator(nodeShapes, localOnly=True)
+        self.targetIndex = self.validator.targetIndex
+        self.classes = self.targetIndex.classIndex(*hierarchyGraphs)
+        self.grouper = SubjectGrouper(chunkSize, tempDir)
+        if self.targetIndex.objectsOf:
+            self.logger.warning('sh:targetObjectsOf is not supported by streaming validation')
+
+    def validate(self, inputFilePath):
+        """Yield the ValidationResults for an N-Triples file (optionally gzip compressed)."""
+        targetNodes = set(self.targetIndex.nodes)
+        for _, lines in self.grouper.groups(inputFilePath):
+            triples = [triple for triple in map(parseLine, lines) if triple is not None]
+            if not triples:
+                continue
+            subject = triples[0][0]
+            targetNodes.discard(subject)
+            for result in self.validateSubject(subject, SubjectGraph(subject, triples)):
+                yield result
+
+        # target nodes are focus nodes even if the data has no triples about them
+        for subject in sorted(targetNodes):
+            for result in self.validateSubject(subject, SubjectGraph(subject)):
+                yield result
+
+    def validateSubject(self, subject, graph):
+        types = graph.objects(subject, RDF.type)
+        shapes = self.targetIndex.shapesFor(
+            subject, types=types, subjectOf=list(graph.index), classes=self.classes)
+        if not shapes:
+            return []
+        context = ValidationContext(self.validator, graph)
+        results = []
+        for shapeUri in shapes:
+            self.validator.compiled[shapeUri](subject, context, results)
+        return results
+
+    def write(self, inputFilePath, outputfile=None):
+        """Validate inputFilePath and stream the report as N-Triples to outputfile or sysout.
+
+        returns: number of validation results
+        """
+        report = rdflib.BNode()
+        count = 0
+        fp = open(outputfile, 'w') if outputfile else None
+        try:
+            def emit(triples):
+                data = ''.join('{} {} {} .\n'.format(s.n3(), p.n3(), o.n3())
+                               for s, p, o in triples)
+                if fp is None:
+                    print(data, end='')
+                else:
+                    fp.write(data)
+
+            emit([(report, RDF.type, SH.ValidationReport)])
+            for result in self.validate(inputFilePath):
+                emit(result.triples(report))
+                count += 1
+            emit([(report, SH.conforms, rdflib.Literal(count == 0))])
+        finally:
+            if fp is not None:
+                fp.close()
+        return count
@@ -0,0 +1,116 @@
+import rdflib
+from rdflib.namespace import RDF, RDFS
+
+
+class TargetIndex:
+    """An index from targets to the node shapes that declare them.
+
+    The index maps classes (sh:targetClass), nodes (sh:targetNode) and predicates
+    (sh:targetSubjectsOf, sh:targetObjectsOf) to node shape URIs. With it the focus nodes
+    of all node shapes are found in one sweep over a data graph.
+    """
+
+    def __init__(self, nodeShapes):
+        """Build the index.
+
+        args: dict nodeShapes as returned by ShapeParser.parseShape()
+        """
+        self.classes = {}
+        self.nodes = {}
+        self.subjectsOf = {}
+        self.objectsOf = {}
+
+        for uri, nodeShape in nodeShapes.items():
+            for cls in nodeShape.targetClass:
+                self.add(self.classes, rdflib.URIRef(cls), uri)
+            for node in nodeShape.targetNode:
+                self.add(self.nodes, rdflib.URIRef(node), uri)
+            for predicate in nodeShape.targetSubjectsOf:
+                self.add(self.subjectsOf, rdflib.URIRef(predicate), uri)
+            for predicate in nodeShape.targetObjectsOf:
+                self.add(self.objectsOf, rdflib.URIRef(predicate), uri)
+
+    def add(self, index, key, shapeUri):
+        shapes = index.setdefault(key, [])
+        if shapeUri not in shapes:
+            shapes.append(shapeUri)
+
+    def classIndex(self, *graphs):
+        """Return the class index extended to all rdfs:subClassOf descendants.
+
+        args: rdflib Graphs that contain the class hierarchy
+        returns: dict class -> list of shape URIs
+        """
+        subClasses = {}
+        for graph in graphs:
+            for subClass, _, superClass in graph.triples((None, RDFS.subClassOf, None)):
+                subClasses.setdefault(superClass, set()).add(subClass)
+
+        index = {}
+        for cls, shapes in self.classes.items():
+            # walk the hierarchy downwards, the visited set makes cycles harmless
+            visited = {cls}
+            stack = [cls]
+            while stack:
+                current = stack.pop()
+                for shapeUri in shapes:
+                    self.add(index, current, shapeUri)
+                for subClass in subClasses.get(current, ()):
+                    if subClass not in visited:
+                        visited.add(subClass)
+                        stack.append(subClass)
+        return index
+
+    def focusNodes(self, dataGraph, *hierarchyGraphs):
+        """Find the focus nodes of all node shapes in one sweep over dataGraph.
+
+        Only triples with rdf:type or a targeted predicate are visited, each of them once.
+
+        args: rdflib Graph dataGraph
+              rdflib Graphs hierarchyGraphs (optional) with additional rdfs:subClassOf
+              triples, e.g. an ontology
+        returns: dict shape URI -> set of focus nodes
+        """
+        focusNodes = {}
+        for node, shapes in self.nodes.items():
+            for shapeUri in shapes:
+                focusNodes.setdefault(shapeUri, set()).add(node)
+
+        classes = self.classIndex(dataGraph, *hierarchyGraphs)
+        if classes:
+            for s, _, o in dataGraph.triples((None, RDF.type, None)):
+                for shapeUri in classes.get(o, ()):
+                    focusNodes.setdefault(shapeUri, set()).add(s)
+
+        # every relevant triple is visited once, using the predicate index of the store
+        for predicate in set(self.subjectsOf) | set(self.objectsOf):
+            subjectShapes = self.subjectsOf.get(predicate, ())
+            objectShapes = self.objectsOf.get(predicate, ())
+            for s, _, o in dataGraph.triples((None, predicate, None)):
+                for shapeUri in subjectShapes:
+                    focusNodes.setdefault(shapeUri, set()).add(s)
+                for shapeUri in objectShapes:
+                    focusNodes.setdefault(shapeUri, set()).add(o)
+
+        return focusNodes
+
+    def shapesFor(self, node, types=(), subjectOf=(), objectOf=(), classes=None):
+        """Return the URIs of the node shapes that target a single resource.
+
+        args: node the resource
+              types the (transitive) classes of node
+              subjectOf predicates of triples with node as subject
+              objectOf predicates of triples with node as object
+              dict classes (optional) a class index returned by classIndex()
+        returns: list of shape URIs
+        """
+        if classes is None:
+            classes = self.classes
+        shapes = []
+        for key, index in [([node], self.nodes), (types, classes),
+                           (subjectOf, self.subjectsOf), (objectOf, self.objectsOf)]:
+            for value in key:
+                for shapeUri in index.get(value, ()):
+                    if shapeUri not in shapes:
+                        shapes.append(shapeUri)
+        return shapes
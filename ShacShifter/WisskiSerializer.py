@@ -0,0 +1,246 @@
+import hashlib
+import logging
+import re
+import sys
+from xml.sax.saxutils import XMLGenerator
+from .LabelIndex import LabelIndex
+from .Profiler import NULL_PROFILER
+from .ShapeNormalizer import ShapeNormalizer
+
+RDFS_RESOURCE = 'http://www.w3.org/2000/01/rdf-schema#Resource'
+XSD = 'http://www.w3.org/2001/XMLSchema#'
+
+# WissKI field type, display widget and formatter per datatype
+FIELD_TYPES = {
+    XSD + 'integer': ('integer', 'number', 'number_integer'),
+    XSD + 'int': ('integer', 'number', 'number_integer'),
+    XSD + 'long': ('integer', 'number', 'number_integer'),
+    XSD + 'decimal': ('decimal', 'number', 'number_decimal'),
+    XSD + 'float': ('float', 'number', 'number_decimal'),
+    XSD + 'double': ('float', 'number', 'number_decimal'),
+    XSD + 'boolean': ('boolean', 'boolean_checkbox', 'boolean'),
+    XSD + 'anyURI': ('link', 'link_default', 'link'),
+}
+STRING_FIELD = ('string', 'string_textfield', 'string')
+REFERENCE_FIELD = ('entity_reference', 'entity_reference_autocomplete',
+                   'entity_reference_label')
+GROUP_FIELD = ('entity_reference', 'inline_entity_form_complex', 'inline_entity_form_simple')
+
+
+class WisskiField:
+    """The pathbuilder description of one property shape, computed once per property shape.
+
+    kind is "field" for a datatype property, "reference" for an object property without a
+    nested shape and "group" for an object property whose values are described by the
+    nested shape.
+    """
+
+    def __init__(self, kind, steps, datatypeProperty, label, fieldType, cardinality,
+                 shape=None):
+        self.kind = kind
+        self.steps = steps
+        self.datatypeProperty = datatypeProperty
+        self.label = label
+        self.fieldType = fieldType
+        self.cardinality = cardinality
+        self.shape = shape
+
+
+class WisskiSerializer:
+    """A serializer for WissKI pathbuilder XML.
+
+    Every node shape with a target class becomes a group, its property shapes and those of
+    its sh:and operands (see ShapeNormalizer) become fields of the group. Property shapes
+    with sh:node are expanded into sub groups that contain the fields of the nested shape,
+    recursively. The fields of every shape are computed once and reused wherever the shape
+    is nested, and the XML is written element by element, so memory does not grow with the
+    size of the export.
+    """
+
+    logger = logging.getLogger('ShacShifter.WisskiSerializer')
+
+    def __init__(self, nodeShapes, outputfile=None, labels=None, language=None, maxDepth=10,
+                 profiler=None, normalizer=None):
+        """Initialize the serializer.
+
+        args: dict nodeShapes
+              string outputfile, sysout if None
+              LabelIndex labels (optional), e.g. ShapeParser.labels
+              string language (optional) preferred language of the labels
+              int maxDepth, nested shapes deeper than this become references
+              Profiler profiler (optional)
+              ShapeNormalizer normalizer (optional) shared cache of EffectiveShapes
+        """
+        self.nodeShapes = nodeShapes
+        self.outputfile = outputfile
+        self.labels = LabelIndex() if labels is None else labels
+        self.language = language
+        self.maxDepth = maxDepth
+        self.profiler = NULL_PROFILER if profiler is None else profiler
+        self.normalizer = ShapeNormalizer() if normalizer is None else normalizer
+        self.fields = {}
+        self.paths = 0
+
+    def write(self):
+        """Write the pathbuilder XML.
+
+        returns: int number of written paths
+        """
+        fp = sys.stdout if self.outputfile is None else open(
+            self.outputfile, 'w', encoding='utf-8')
+        try:
+            with self.profiler.phase('serialize'):
+                self.xml = XMLGenerator(fp, 'utf-8', short_empty_elements=True)
+                self.xml.startDocument()
+                self.xml.startElement('pathbuilderinterface', {})
+                weight = 0
+                for uri in self.topShapes():
+                    nodeShape = self.nodeShapes[uri]
+                    cls = nodeShape.targetClass[0] if nodeShape.targetClass else RDFS_RESOURCE
+                    label = LabelIndex.pick(self.labels.forResource(uri), self.language)
+                    groupId = self.writeGroup(label, [cls], '0', GROUP_FIELD, -1, weight)
+                    self.writeShape(uri, [cls], groupId, [uri])
+                    weight += 1
+                self.xml.endElement('pathbuilderinterface')
+                self.xml.endDocument()
+        finally:
+            if fp is not sys.stdout:
+                fp.close()
+        self.profiler.count('wisskiPaths', self.paths)
+        return self.paths
+
+    def topShapes(self):
+        """Return the node shapes that become top level groups.
+
+        These are the shapes with a target class and the shapes that are not nested in
+        other shapes.
+        """
+        nested = set()
+        for nodeShape in self.nodeShapes.values():
+            for propertyShape in self.normalizer.effective(nodeShape).properties:
+                nested.update(propertyShape.nodes)
+        return [uri for uri, nodeShape in self.nodeShapes.items()
+                if nodeShape.targetClass or uri not in nested]
+
+    def shapeFields(self, uri):
+        """Return the WisskiFields of the effective property shapes of a node shape (memoized)."""
+        fields = self.fields.get(uri)
+        if fields is None:
+            fields = []
+            for propertyShape in self.normalizer.effective(self.nodeShapes[uri]).properties:
+                field = self.field(propertyShape)
+                if field is not None:
+                    fields.append(field)
+            self.fields[uri] = fields
+        return fields
+
+    def field(self, propertyShape):
+        """Translate a property shape into a WisskiField, None if its path is not supported."""
+        path = propertyShape.path
+        if isinstance(path, list) and all(isinstance(step, str) for step in path) and path:
+            predicates = [str(step) for step in path]
+        elif isinstance(path, str) and path:
+            predicates = [str(path)]
+        else:
+            self.logger.info('Path %s not supported by the pathbuilder', path)
+            return None
+
+        label = LabelIndex.pick(self.labels.forPropertyShape(propertyShape), self.language)
+        cardinality = propertyShape.maxCount if propertyShape.isSet['maxCount'] else -1
+        nested = [uri for uri in propertyShape.nodes if uri in self.nodeShapes]
+        if nested:
+            shape = nested[0]
+            cls = propertyShape.classes[0] if propertyShape.classes else (
+                self.nodeShapes[shape].targetClass or [RDFS_RESOURCE])[0]
+            return WisskiField('group', self.steps(predicates, cls), '', label, GROUP_FIELD,
+                               cardinality, shape)
+        if propertyShape.classes:
+            return WisskiField('reference', self.steps(predicates, propertyShape.classes[0]),
+                               '', label, REFERENCE_FIELD, cardinality)
+        fieldType = FIELD_TYPES.get(propertyShape.dataType, STRING_FIELD)
+        return WisskiField('field', self.steps(predicates[:-1], None), predicates[-1], label,
+                           fieldType, cardinality)
+
+    @staticmethod
+    def steps(predicates, cls):
+        """Return the x/y steps of a path of predicates ending in instances of cls.
+
+        Intermediate classes are unknown and become rdfs:Resource.
+        """
+        steps = []
+        for n, predicate in enumerate(predicates):
+            steps.append(predicate)
+            last = n == len(predicates) - 1
+            steps.append(cls if last and cls else RDFS_RESOURCE)
+        return tuple(steps)
+
+    def writeShape(self, uri, pathArray, groupId, stack):
+        """Write the fields of the node shape uri below the path pathArray of group groupId."""
+        for weight, field in enumerate(self.shapeFields(uri)):
+            fieldPath = pathArray + list(field.steps)
+            if field.kind == 'group':
+                if field.shape in stack or len(stack) > self.maxDepth:
+                    # cycles and too deep nesting end in a reference
+                    self.writePath(field.label, fieldPath, field.datatypeProperty, groupId,
+                                   REFERENCE_FIELD, field.cardinality, weight)
+                    continue
+                subGroupId = self.writeGroup(field.label, fieldPath, groupId, field.fieldType,
+                                             field.cardinality, weight)
+                stack.append(field.shape)
+                self.writeShape(field.shape, fieldPath, subGroupId, stack)
+                stack.pop()
+            else:
+                self.writePath(field.label, fieldPath, field.datatypeProperty, groupId,
+                               field.fieldType, field.cardinality, weight)
+
+    def writeGroup(self, label, pathArray, groupId, fieldType, cardinality, weight):
+        return self.writePath(label, pathArray, '', groupId, fieldType, cardinality, weight,
+                              isGroup=True)
+
+    def writePath(self, label, pathArray, datatypeProperty, groupId, fieldType, cardinality,
+                  weight, isGroup=False):
+        """Write one path element and return its id."""
+        pathId = self.pathId(label)
+        digest = hashlib.md5(pathId.encode('utf-8')).hexdigest()
+        bundle = 'b' + digest[:31]
+        field = bundle if isGroup else 'f' + digest[:31]
+        values = [
+            ('id', pathId),
+            ('weight', str(weight)),
+            ('enabled', '1'),
+            ('group_id', groupId),
+            ('bundle', bundle if isGroup else ''),
+            ('field', field),
+            ('fieldtype', fieldType[0]),
+            ('displaywidget', fieldType[1]),
+            ('formatterwidget', fieldType[2]),
+            ('cardinality', str(cardinality)),
+            ('field_type_informative', fieldType[0]),
+        ]
+        self.xml.startElement('path', {})
+        for name, value in values:
+            self.element(name, value)
+        self.xml.startElement('path_array', {})
+        for n, step in enumerate(pathArray):
+            self.element('y' if n % 2 else 'x', step)
+        self.xml.endElement('path_array')
+        for name, value in [('datatype_property', datatypeProperty or 'empty'),
+                            ('short_name', pathId), ('disamb', '0'), ('description', ''),
+                            ('uuid', ''), ('is_group', '1' if isGroup else '0'),
+                            ('name', label)]:
+            self.element(name, value)
+        self.xml.endElement('path')
+        self.xml.ignorableWhitespace('\n')
+        self.paths += 1
+        return pathId
+
+    def element(self, name, value):
+        self.xml.startElement(name, {})
+        if value:
+            self.xml.characters(value)
+        self.xml.endElement(name)
+
+    def pathId(self, label):
+        """Return a unique machine name for the next path, made of its label and number."""
+        base = re.sub(r'[^a-z0-9]+', '_', label.lower()).strip('_')[:24] or 'path'
+        return '{}_{}'.format(base, self.paths)
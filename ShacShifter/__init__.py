@@ -1,6 +1,7 @@
 import argparse
 import logging
 from .ShacShifter import ShacShifter
+from .Profiler import Profiler
 
 
 def main(args=None):
@@ -21,11 +22,42 @@ def main(args=None):
     parser.add_argument('-f', '--format', type=str, choices=[
         'rdforms',
         'wisski',
-        'html'
+        'html',
+        'jsonschema',
+        'report'
     ], help="The output format")
+    parser.add_argument('-d', '--data', type=str,
+                        help="A data graph to validate or to pre-fill the forms with")
+    parser.add_argument('--stream', action="store_true",
+                        help="Validate N-Triples data (optionally gzip compressed) as a stream")
+    parser.add_argument('--ontology', type=str,
+                        help="An ontology or vocabulary with labels and choices")
+    parser.add_argument('--language', type=str, help="The preferred language of the labels")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="Number of processes used for validation, imports and N-Triples "
+                             "input, 0 for all cores")
+    parser.add_argument('--watch', action="store_true",
+                        help="Update the RDForms output incrementally whenever the input changes")
+    parser.add_argument('--diff', type=str,
+                        help="An older version of the shapes, write the delta to it as JSON")
+    parser.add_argument('--shards', action="store_true",
+                        help="Write one RDForms or JSON Schema file per node shape and a "
+                             "manifest into the output directory")
+    parser.add_argument('--gzip', action="store_true", help="Compress the shards with gzip")
+    parser.add_argument('--catalog', type=str,
+                        help="An XML catalog of the files imported with owl:imports")
+    parser.add_argument('--mirror', type=str,
+                        help="A directory with the files imported with owl:imports")
+    parser.add_argument('--importcache', type=str,
+                        help="A directory to cache the parsed imported files in")
+    parser.add_argument('--stats', action="store_true",
+                        help="Write statistics and estimated output sizes of the shapes as JSON")
     parser.add_argument('-l', '--logfile', type=str, help="The log file")
     parser.add_argument('-v', '--verbose', action="store_true")
     parser.add_argument('-vv', '--verboseverbose', action="store_true")
+    parser.add_argument('--profile', type=str, help="Write a JSON profiling report to this file")
+    parser.add_argument('--profilememory', action="store_true",
+                        help="Record the peak of traced memory per phase in the profiling report")
 
     args = parser.parse_args()
 
@@ -49,5 +81,15 @@ def main(args=None):
             logger.info('Could not initialize FileHandler for logging.')
     logger.debug('Logger initialized')
 
+    profiler = None
+    if args.profile:
+        profiler = Profiler(traceMemory=args.profilememory)
+        profiler.addHook(lambda report: profiler.write(args.profile))
+
     shifter = ShacShifter()
-    shifter.shift(args.shacl, args.output, args.format)
+    shifter.shift(args.shacl, args.output, args.format, profiler=profiler, data=args.data,
+                  stream=args.stream, jobs=args.jobs,
+                  ontology=args.ontology, language=args.language, watch=args.watch,
+                  diff=args.diff, shards=args.shards, compress=args.gzip,
+                  catalog=args.catalog, mirror=args.mirror, importCache=args.importcache,
+                  stats=args.stats)
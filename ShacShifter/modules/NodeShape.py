@@ -11,10 +11,12 @@ class NodeShape:
         self.properties = []
         self.closed = False
         self.ignoredProperties = []
-        # self.sOr = []
-        # self.sNot = []
-        # self.sAnd = []
-        # self.sXone = []
+        # sh:or, sh:and and sh:xone hold one list of operand shapes per value, sh:not the
+        # operand shapes, operands are NodeShapes or PropertyShapes
+        self.sOr = []
+        self.sNot = []
+        self.sAnd = []
+        self.sXone = []
         self.message = {}
         self.severity = -1
         isSet = {}
@@ -13,7 +13,7 @@ class PropertyShape:
         self.minExclusive = -1
         self.minInclusive = -1
         self.maxExclusive = -1
-        self.MaxInclusive = -1
+        self.maxInclusive = -1
         self.minLength = -1
         self.maxLength = -1
         self.pattern = ''
@@ -33,10 +33,12 @@ class PropertyShape:
         self.shIn = []
         self.order = -1
         self.message = {}
-        # self.sOr = []
-        # self.sNot = []
-        # self.sAnd = []
-        # self.sXone = []
+        # sh:or, sh:and and sh:xone hold one list of operand shapes per value, sh:not the
+        # operand shapes, operands are NodeShapes or PropertyShapes
+        self.sOr = []
+        self.sNot = []
+        self.sAnd = []
+        self.sXone = []
         isSet = {}
         for var in vars(self):
             if not var.startswith('__'):
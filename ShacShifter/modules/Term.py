@@ -0,0 +1,64 @@
+import sys
+from collections import namedtuple
+import rdflib
+
+XSD_STRING = 'http://www.w3.org/2001/XMLSchema#string'
+RDF_LANG_STRING = 'http://www.w3.org/1999/02/22-rdf-syntax-ns#langString'
+
+
+class Term(namedtuple('Term', ['kind', 'value', 'lang', 'datatype'])):
+    """An immutable RDF term of a detached shape, e.g. a value of sh:hasValue or sh:in.
+
+    kind is "iri", "bnode" or "literal" and value the IRI, the blank node label or the
+    lexical form. Literals have a datatype, xsd:string for simple literals and
+    rdf:langString for literals with a (lower case) language tag, IRIs and blank nodes have
+    neither. Two terms are equal if they are the same RDF term.
+    """
+
+    __slots__ = ()
+
+    IRI = 'iri'
+    BNODE = 'bnode'
+    LITERAL = 'literal'
+
+    @classmethod
+    def fromTerm(cls, term):
+        """Return the Term of an rdflib term, Terms are returned unchanged."""
+        if isinstance(term, Term):
+            return term
+        if isinstance(term, rdflib.Literal):
+            if term.language:
+                return cls.literal(str(term), lang=term.language)
+            return cls.literal(str(term), datatype=term.datatype)
+        if isinstance(term, rdflib.BNode):
+            return cls(cls.BNODE, sys.intern(str(term)), '', '')
+        if isinstance(term, rdflib.URIRef):
+            return cls.iri(term)
+        raise TypeError('Not an RDF term: {!r}'.format(term))
+
+    @classmethod
+    def iri(cls, value):
+        return cls(cls.IRI, sys.intern(str(value)), '', '')
+
+    @classmethod
+    def literal(cls, value, lang=None, datatype=None):
+        if lang:
+            return cls(cls.LITERAL, sys.intern(str(value)), sys.intern(lang.lower()),
+                       RDF_LANG_STRING)
+        return cls(cls.LITERAL, sys.intern(str(value)), '',
+                   sys.intern(str(datatype)) if datatype else XSD_STRING)
+
+    def toTerm(self):
+        """Return the rdflib term."""
+        if self.kind == self.IRI:
+            return rdflib.URIRef(self.value)
+        if self.kind == self.BNODE:
+            return rdflib.BNode(self.value)
+        if self.lang:
+            return rdflib.Literal(self.value, lang=self.lang)
+        if self.datatype == XSD_STRING:
+            return rdflib.Literal(self.value)
+        return rdflib.Literal(self.value, datatype=rdflib.URIRef(self.datatype))
+
+    def __str__(self):
+        return self.value
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Compare the columnar range and length checks with a per-value loop.
+
+usage: benchmarks/columnar.py [number of values] [values per focus node]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import rdflib
+from ShacShifter import ColumnarChecks as columnar
+from ShacShifter.ColumnarChecks import ColumnarChecks, RANGES, LENGTHS
+from ShacShifter.modules.PropertyShape import PropertyShape
+
+
+def perValueLoop(propertyShape, focusNodes, valueLists):
+    """Check every value on its own, as the validator did before."""
+    ranges = [(component, getattr(propertyShape, attribute), accept)
+              for attribute, component, accept in RANGES if propertyShape.isSet[attribute]]
+    lengths = [(component, getattr(propertyShape, attribute), accept)
+               for attribute, component, accept in LENGTHS if propertyShape.isSet[attribute]]
+    violations = []
+    for values in valueLists:
+        found = []
+        for component, bound, accept in ranges:
+            for value in values:
+                if not ColumnarChecks.inRange(value, bound, accept):
+                    found.append((component, value))
+        for component, bound, accept in lengths:
+            for value in values:
+                if isinstance(value, rdflib.BNode) or not accept(len(value), bound):
+                    found.append((component, value))
+        violations.append(found)
+    return violations
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    perNode = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    random.seed(42)
+
+    propertyShape = PropertyShape()
+    for attribute, value in [('minInclusive', 0), ('maxExclusive', 1000),
+                             ('minExclusive', -1), ('maxInclusive', 999),
+                             ('minLength', 1), ('maxLength', 3)]:
+        setattr(propertyShape, attribute, value)
+        propertyShape.isSet[attribute] = True
+
+    values = [rdflib.Literal(random.randint(-10, 1010)) for _ in range(count)]
+    focusNodes = [rdflib.URIRef('http://example.org/node{}'.format(i))
+                  for i in range(0, count, perNode)]
+    valueLists = [values[i:i + perNode] for i in range(0, count, perNode)]
+
+    print('values: {}, focus nodes: {}, constraints: 6'.format(count, len(focusNodes)))
+    runs = [('per-value loop', lambda: perValueLoop(propertyShape, focusNodes, valueLists)),
+            ('columnar, pure Python', lambda: ColumnarChecks(
+                propertyShape, vectorized=False).check(focusNodes, valueLists))]
+    if columnar.numpy is not None:
+        runs.append(('columnar, NumPy', lambda: ColumnarChecks(propertyShape).check(
+            focusNodes, valueLists)))
+    else:
+        print('NumPy is not installed, skipping the vectorized run')
+
+    expected = None
+    for name, run in runs:
+        start = time.perf_counter()
+        violations = run()
+        elapsed = time.perf_counter() - start
+        expected = expected or violations
+        assert violations == expected
+        print('{:<24} {:>8.2f} s ({:.0f} values/s, {} violations)'.format(
+            name, elapsed, count / elapsed, sum(len(found) for found in violations)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Measure the comparison of two versions of a large shapes library.
+
+usage: benchmarks/diff.py [number of node shapes] [number of changed shapes]
+"""
+import copy
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ShacShifter.ShapeDiff import ShapeDiff
+from ShacShifter.ShapeParser import ShapeParser
+from synthetic import writeShapesGraph
+
+TEMPLATES = 100
+
+
+def main():
+    nodeShapes = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    changes = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    directory = tempfile.mkdtemp()
+    shapesFile = writeShapesGraph(os.path.join(directory, 'shapes.ttl'), TEMPLATES)
+    try:
+        templates = list(ShapeParser().parseShape(shapesFile, detached=True).values())
+    finally:
+        os.remove(shapesFile)
+        os.rmdir(directory)
+
+    # parsing 50k shapes takes minutes, so the versions are copies of parsed shapes
+    old = {}
+    for i in range(nodeShapes):
+        nodeShape = copy.deepcopy(templates[i % TEMPLATES])
+        nodeShape.uri = 'http://www.example.org/Shape{}'.format(i)
+        old[nodeShape.uri] = nodeShape
+    new = dict(old)
+    for i in range(0, nodeShapes, max(1, nodeShapes // changes)):
+        nodeShape = copy.deepcopy(old['http://www.example.org/Shape{}'.format(i)])
+        nodeShape.properties[0].maxCount += 1
+        new[nodeShape.uri] = nodeShape
+
+    start = time.perf_counter()
+    oldHashes = ShapeDiff.hashes(old)
+    hashed = time.perf_counter() - start
+    start = time.perf_counter()
+    delta = ShapeDiff(old, new, oldHashes=oldHashes).delta()
+    compared = time.perf_counter() - start
+
+    print('node shapes:       {}'.format(nodeShapes))
+    print('modified shapes:   {}'.format(len(delta['modified'])))
+    print('hash one version:  {:.2f} s'.format(hashed))
+    print('diff (new hashes): {:.2f} s'.format(compared))
+
+
+if __name__ == '__main__':
+    main()
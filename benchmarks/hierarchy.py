@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Measure building choice trees from a large SKOS vocabulary.
+
+usage: benchmarks/hierarchy.py [number of concepts] [number of node shapes]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import rdflib
+from rdflib.namespace import RDF, SKOS
+from ShacShifter.HierarchyIndex import HierarchyIndex
+from ShacShifter.LabelIndex import LabelIndex
+from ShacShifter.RDFormsSerializer import RDFormsSerializer
+from ShacShifter.ShapeParser import ShapeParser
+from synthetic import shapesGraph
+
+EX = rdflib.Namespace('http://example.org/vocabulary/')
+
+
+def vocabulary(concepts, branching=10):
+    """Return a SKOS vocabulary that is a tree with branching narrower concepts per concept."""
+    graph = rdflib.Graph()
+    for i in range(concepts):
+        concept = EX['c{}'.format(i)]
+        graph.add((concept, RDF.type, SKOS.Concept))
+        graph.add((concept, SKOS.prefLabel, rdflib.Literal('Concept {}'.format(i), lang='en')))
+        if i > 0:
+            graph.add((concept, SKOS.broader, EX['c{}'.format((i - 1) // branching)]))
+    return graph
+
+
+def main():
+    concepts = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    nodeShapes = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    graph = vocabulary(concepts)
+    shapes = shapesGraph(nodeShapes).replace(
+        'sh:property [', 'sh:property [ sh:path <http://example.org/subject> ; '
+        'sh:class <{}> ] ;\n    sh:property ['.format(SKOS.Concept), 1)
+    fd, shapesFile = tempfile.mkstemp(suffix='.ttl')
+    try:
+        with os.fdopen(fd, 'w') as fp:
+            fp.write(shapes)
+        nodeShapesDict = ShapeParser().parseShape(shapesFile)
+    finally:
+        os.remove(shapesFile)
+
+    start = time.perf_counter()
+    hierarchy = HierarchyIndex(graph)
+    labels = LabelIndex(graph)
+    indexTime = time.perf_counter() - start
+
+    start = time.perf_counter()
+    serializer = RDFormsSerializer(nodeShapesDict, labels=labels, hierarchy=hierarchy)
+    serializeTime = time.perf_counter() - start
+
+    print('concepts:         {}'.format(concepts))
+    print('bundles:          {}'.format(len(serializer.templateBundles)))
+    print('build indexes:    {:.2f} s'.format(indexTime))
+    print('create bundles:   {:.2f} s'.format(serializeTime))
+    print('choice trees:     {}'.format(len(hierarchy.trees)))
+
+
+if __name__ == '__main__':
+    main()
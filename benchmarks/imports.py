@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Measure loading a shapes graph that is split into many files linked by owl:imports.
+
+The main file imports all other files from a mirror directory. The files are loaded
+sequentially, in parallel, from a warm cache and after one file changed.
+
+usage: benchmarks/imports.py [number of files] [node shapes per file] [jobs]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import rdflib
+from ShacShifter.ImportResolver import ImportResolver
+from synthetic import shapesGraph
+
+BASE = 'http://www.example.org/shapes/'
+
+
+def writeFiles(directory, files, shapesPerFile):
+    """Write the main file and the mirror directory, return the path of the main file."""
+    mirror = os.path.join(directory, 'mirror')
+    os.makedirs(mirror)
+    for i in range(files):
+        text = shapesGraph(shapesPerFile).replace('ex:Shape', 'ex:Shape{}_'.format(i))
+        with open(os.path.join(mirror, 'part{}.ttl'.format(i)), 'w') as fp:
+            fp.write(text)
+    mainFile = os.path.join(directory, 'main.ttl')
+    with open(mainFile, 'w') as fp:
+        fp.write('@prefix owl: <http://www.w3.org/2002/07/owl#> .\n')
+        fp.write('<{}main> a owl:Ontology .\n'.format(BASE))
+        for i in range(files):
+            fp.write('<{}main> owl:imports <{}part{}> .\n'.format(BASE, BASE, i))
+    return mainFile
+
+
+def measure(mainFile, mirror, cache, jobs):
+    resolver = ImportResolver(mirror=mirror, cacheDirectory=cache, jobs=jobs)
+    graph = rdflib.Graph()
+    start = time.perf_counter()
+    resolver.load(mainFile, graph)
+    return time.perf_counter() - start, resolver, len(graph)
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    shapesPerFile = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    jobs = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count() or 1
+    directory = tempfile.mkdtemp()
+    try:
+        mainFile = writeFiles(directory, files, shapesPerFile)
+        mirror = os.path.join(directory, 'mirror')
+        cache = os.path.join(directory, 'cache')
+
+        print('files:           {}'.format(files + 1))
+        runs = [('sequential', None, 1), ('parallel', None, jobs), ('cache cold', cache, jobs),
+                ('cache warm', cache, jobs)]
+        for name, cacheDirectory, runJobs in runs:
+            duration, resolver, triples = measure(mainFile, mirror, cacheDirectory, runJobs)
+            print('{:<16} {:.2f} s  ({} triples, {} parsed)'.format(
+                name + ':', duration, triples, resolver.parsed))
+
+        with open(os.path.join(mirror, 'part0.ttl'), 'a') as fp:
+            fp.write('ex:Changed a ex:Class0 .\n')
+        duration, resolver, triples = measure(mainFile, mirror, cache, jobs)
+        print('{:<16} {:.2f} s  ({} triples, {} parsed)'.format(
+            'one changed:', duration, triples, resolver.parsed))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Measure the time to the first RDForms bundle with eager and lazy extraction.
+
+A form endpoint that serves one shape per request only needs the shapes it serves, the
+lazy result extracts a shape when it is accessed.
+
+usage: benchmarks/lazy.py [number of node shapes]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ShacShifter.RDFormsSerializer import RDFormsSerializer
+from ShacShifter.ShapeParser import ShapeParser
+from synthetic import EX, writeShapesGraph
+
+
+def firstForm(shapesFile, lazy):
+    """Return the seconds until parseShape() returned and until the first form is ready."""
+    parser = ShapeParser()
+    start = time.perf_counter()
+    nodeShapes = parser.parseShape(shapesFile, lazy=lazy)
+    parsed = time.perf_counter()
+    uri = EX + 'Shape0'
+    serializer = RDFormsSerializer({uri: nodeShapes[uri]}, labels=parser.labels)
+    serializer.templateBundles[0].toJson()
+    return parsed - start, time.perf_counter() - start
+
+
+def main():
+    nodeShapes = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    directory = tempfile.mkdtemp()
+    shapesFile = os.path.join(directory, 'shapes.ttl')
+    try:
+        writeShapesGraph(shapesFile, nodeShapes)
+        print('node shapes:  {}'.format(nodeShapes))
+        for name, lazy in (('eager', False), ('lazy', True)):
+            parsed, first = firstForm(shapesFile, lazy)
+            print('{:>5}: parseShape {:.2f} s, first form after {:.2f} s'.format(
+                name, parsed, first))
+    finally:
+        os.remove(shapesFile)
+        os.rmdir(directory)
+
+
+if __name__ == '__main__':
+    main()
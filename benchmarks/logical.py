@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Measure parsing, normalizing and validating shapes composed with sh:and and sh:or.
+
+Every node shape is the sh:and of a nested chain of shared operand shapes, so without
+memoization the operands would be resolved once per use.
+
+usage: benchmarks/logical.py [number of node shapes] [depth of the sh:and chain]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import rdflib
+from ShacShifter.ShapeNormalizer import ShapeNormalizer
+from ShacShifter.ShapeParser import ShapeParser
+from ShacShifter.ShapeValidator import ShapeValidator
+from synthetic import PREFIXES, dataTriples
+
+CHAIN = """
+ex:Part{i} a sh:NodeShape ;
+\tsh:property [ sh:path ex:property{j} ; sh:minCount 1 ] ;
+\tsh:and ( ex:Part{next} ) .
+"""
+LAST = """
+ex:Part{i} a sh:NodeShape ;
+\tsh:or ( [ sh:path ex:link0 ; sh:minCount 1 ] [ sh:path ex:missing ; sh:minCount 1 ] ) .
+"""
+SHAPE = """
+ex:Shape{i} a sh:NodeShape ;
+\tsh:targetClass ex:Class{i} ;
+\tsh:and ( ex:Part0 [ sh:path ex:property0 ; sh:maxCount 1 ] ) .
+"""
+
+
+def main():
+    nodeShapes = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    directory = tempfile.mkdtemp()
+    shapesFile = os.path.join(directory, 'shapes.ttl')
+    try:
+        with open(shapesFile, 'w') as fp:
+            fp.write(PREFIXES)
+            for i in range(depth):
+                fp.write(CHAIN.format(i=i, j=i % 5, next=i + 1))
+            fp.write(LAST.format(i=depth))
+            for i in range(nodeShapes):
+                fp.write(SHAPE.format(i=i))
+
+        start = time.perf_counter()
+        shapes = ShapeParser().parseShape(shapesFile, detached=True)
+        parseTime = time.perf_counter() - start
+    finally:
+        os.remove(shapesFile)
+        os.rmdir(directory)
+
+    dataGraph = rdflib.Graph()
+    dataGraph.parse(data=''.join(dataTriples(10 * nodeShapes, nodeShapes=nodeShapes)),
+                    format='nt')
+
+    normalizer = ShapeNormalizer()
+    start = time.perf_counter()
+    normalizer.normalizeAll(shapes)
+    normalizeTime = time.perf_counter() - start
+
+    start = time.perf_counter()
+    validator = ShapeValidator(shapes, normalizer=normalizer)
+    compileTime = time.perf_counter() - start
+
+    start = time.perf_counter()
+    report = validator.validate(dataGraph)
+    validationTime = time.perf_counter() - start
+
+    print('node shapes:       {} (and chains of {})'.format(nodeShapes, depth))
+    print('parse shapes:      {:.2f} s'.format(parseTime))
+    print('normalize:         {:.4f} s'.format(normalizeTime))
+    print('compile shapes:    {:.4f} s'.format(compileTime))
+    print('validate:          {:.2f} s ({} focus nodes, {} results)'.format(
+        validationTime, 10 * nodeShapes, len(report.results)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Measure the load throughput of N-Triples shapes graphs per number of workers.
+
+The input is a synthetic shapes graph in N-Triples followed by instance data, like an
+export of a triple store. rdflib loads all triples on one core, the NTriplesLoader splits
+the file into chunks and only keeps the triples relevant for the shapes.
+
+usage: benchmarks/ntriples.py [number of node shapes] [number of instances]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import rdflib
+from ShacShifter.NTriplesLoader import NTriplesLoader
+from synthetic import dataTriples, shapesGraph
+
+
+def main():
+    nodeShapes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    instances = int(sys.argv[2]) if len(sys.argv) > 2 else 50000
+    directory = tempfile.mkdtemp()
+    inputFile = os.path.join(directory, 'export.nt')
+    try:
+        graph = rdflib.Graph()
+        graph.parse(data=shapesGraph(nodeShapes), format='turtle')
+        with open(inputFile, 'w', encoding='utf-8') as fp:
+            fp.write(graph.serialize(format='nt'))
+            fp.writelines(dataTriples(instances, nodeShapes))
+        with open(inputFile, 'rb') as fp:
+            lines = sum(1 for _ in fp)
+        print('lines:   {}  ({:.1f} MiB, {} cores)'.format(
+            lines, os.path.getsize(inputFile) / 2 ** 20, os.cpu_count()))
+
+        start = time.perf_counter()
+        graph = rdflib.Graph()
+        graph.parse(inputFile, format='nt')
+        duration = time.perf_counter() - start
+        print('rdflib:     {:.2f} s  {:>9.0f} lines/s  {} triples'.format(
+            duration, lines / duration, len(graph)))
+
+        for jobs in (1, 2, 4, 8):
+            loader = NTriplesLoader(jobs, chunkBytes=2 ** 20)
+            start = time.perf_counter()
+            graph = rdflib.Graph()
+            loader.load(inputFile, graph)
+            duration = time.perf_counter() - start
+            print('{} workers:  {:.2f} s  {:>9.0f} lines/s  {} triples'.format(
+                jobs, duration, lines / duration, len(graph)))
+    finally:
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Measure how validation scales with the number of worker processes.
+
+usage: benchmarks/parallel.py [number of focus nodes] [number of node shapes] [max jobs]
+
+The number of jobs is doubled from 1 up to max jobs (default: all cores).
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import rdflib
+from ShacShifter.ParallelValidator import ParallelValidator
+from ShacShifter.ShapeParser import ShapeParser
+from synthetic import writeDataGraph, writeShapesGraph
+
+
+def jobCounts(maxJobs):
+    jobs = 1
+    while jobs < maxJobs:
+        yield jobs
+        jobs *= 2
+    yield maxJobs
+
+
+def main():
+    focusNodes = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    nodeShapes = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    maxJobs = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count() or 1
+    directory = tempfile.mkdtemp()
+    shapesFile = writeShapesGraph(os.path.join(directory, 'shapes.ttl'), nodeShapes)
+    dataFile = writeDataGraph(os.path.join(directory, 'data.nt'), focusNodes,
+                              nodeShapes=nodeShapes)
+
+    try:
+        shapes = ShapeParser().parseShape(shapesFile, detached=True)
+        dataGraph = rdflib.Graph()
+        dataGraph.parse(dataFile, format='nt')
+
+        print('focus nodes: {}, data triples: {}'.format(focusNodes, len(dataGraph)))
+        print('{:>5} {:>10} {:>14} {:>8} {:>8}'.format(
+            'jobs', 'time (s)', 'focus nodes/s', 'speedup', 'results'))
+        baseline = None
+        for jobs in jobCounts(maxJobs):
+            start = time.perf_counter()
+            report = ParallelValidator(shapes, jobs=jobs).validate(dataFile, dataGraph)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print('{:>5} {:>10.2f} {:>14.0f} {:>8.2f} {:>8}'.format(
+                jobs, elapsed, focusNodes / elapsed, baseline / elapsed, len(report.results)))
+    finally:
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+
+
+if __name__ == '__main__':
+    main()
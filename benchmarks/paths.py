@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Compare naive per focus node traversal of sh:zeroOrMorePath with the PathEvaluator.
+
+The data is a SKOS concept hierarchy, every concept is a focus node.
+
+usage: benchmarks/paths.py [number of concepts] [branching factor]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import rdflib
+from ShacShifter.PathEvaluator import PathEvaluator, SH
+
+SKOS = rdflib.Namespace('http://www.w3.org/2004/02/skos/core#')
+EX = rdflib.Namespace('http://www.example.org/')
+
+
+def naive(graph, focusNodes, predicate):
+    """Breadth first search from every focus node on its own."""
+    result = {}
+    for node in focusNodes:
+        reached = {node}
+        frontier = [node]
+        while frontier:
+            frontier = [value for current in frontier for value in graph.objects(current, predicate)
+                        if value not in reached]
+            reached.update(frontier)
+        result[node] = reached
+    return result
+
+
+def main():
+    concepts = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    branching = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    graph = rdflib.Graph()
+    nodes = [EX['concept{}'.format(i)] for i in range(concepts)]
+    for i in range(1, concepts):
+        graph.add((nodes[i], SKOS.broader, nodes[(i - 1) // branching]))
+
+    start = time.perf_counter()
+    expected = naive(graph, nodes, SKOS.broader)
+    naiveTime = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = PathEvaluator(graph).evaluate({SH.zeroOrMorePath: str(SKOS.broader)}, nodes)
+    evaluatorTime = time.perf_counter() - start
+
+    assert all(result[node] == expected[node] for node in nodes)
+    print('concepts:            {} (branching {})'.format(concepts, branching))
+    print('naive traversal:     {:.2f} s'.format(naiveTime))
+    print('PathEvaluator:       {:.2f} s'.format(evaluatorTime))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Measure pre-filling RDForms forms from a data graph.
+
+usage: benchmarks/prefill.py [number of instances] [number of node shapes]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import rdflib
+from ShacShifter.FormPrefiller import FormPrefiller
+from ShacShifter.Profiler import Profiler, CountingGraph
+from ShacShifter.ShapeParser import ShapeParser
+from synthetic import writeDataGraph, writeShapesGraph
+
+
+def main():
+    instances = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    nodeShapes = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    directory = tempfile.mkdtemp()
+    shapesFile = writeShapesGraph(os.path.join(directory, 'shapes.ttl'), nodeShapes)
+    dataFile = writeDataGraph(os.path.join(directory, 'data.nt'), instances,
+                              nodeShapes=nodeShapes)
+
+    try:
+        shapes = ShapeParser().parseShape(shapesFile, detached=True)
+        dataGraph = rdflib.Graph()
+        dataGraph.parse(dataFile, format='nt')
+
+        profiler = Profiler()
+        start = time.perf_counter()
+        prefiller = FormPrefiller(shapes, CountingGraph(dataGraph, profiler))
+        forms = sum(1 for form in prefiller.forms())
+        elapsed = time.perf_counter() - start
+    finally:
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+
+    print('instances:     {}'.format(instances))
+    print('data triples:  {}'.format(len(dataGraph)))
+    print('forms:         {}'.format(forms))
+    print('graph lookups: {}'.format(profiler.counters.get('graphLookups', 0)))
+    print('time:          {:.2f} s ({:.0f} forms/s)'.format(elapsed, forms / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Compare pickling parsed shapes with the binary snapshot format.
+
+usage: benchmarks/snapshot.py [number of node shapes]
+"""
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ShacShifter.ShapeParser import ShapeParser
+from ShacShifter.ShapeSnapshot import ShapeSnapshot, ShapeSnapshotWriter
+from synthetic import writeShapesGraph
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main():
+    nodeShapes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    directory = tempfile.mkdtemp()
+    inputFile = writeShapesGraph(os.path.join(directory, 'shapes.ttl'), nodeShapes)
+    snapshotFile = os.path.join(directory, 'shapes.snapshot')
+    lookup = 'http://www.example.org/Shape{}'.format(nodeShapes // 2)
+
+    try:
+        shapes, parseTime = timed(lambda: ShapeParser().parseShape(inputFile, detached=True))
+
+        payload, dumpTime = timed(lambda: pickle.dumps(shapes, pickle.HIGHEST_PROTOCOL))
+        _, loadTime = timed(lambda: pickle.loads(payload)[lookup])
+
+        _, writeTime = timed(lambda: ShapeSnapshotWriter().write(shapes, snapshotFile))
+
+        def loadOne():
+            with ShapeSnapshot(snapshotFile) as snapshot:
+                return snapshot[lookup]
+        _, openTime = timed(loadOne)
+
+        def loadAll():
+            with ShapeSnapshot(snapshotFile) as snapshot:
+                return snapshot.materializeAll()
+        _, materializeTime = timed(loadAll)
+        snapshotSize = os.path.getsize(snapshotFile)
+    finally:
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+
+    print('node shapes:                 {}'.format(nodeShapes))
+    print('parse (turtle):              {:.3f} s'.format(parseTime))
+    print('pickle size:                 {} bytes'.format(len(payload)))
+    print('pickle dump / load:          {:.3f} s / {:.3f} s'.format(dumpTime, loadTime))
+    print('snapshot size:               {} bytes'.format(snapshotSize))
+    print('snapshot write:              {:.3f} s'.format(writeTime))
+    print('snapshot open + one shape:   {:.4f} s'.format(openTime))
+    print('snapshot materialize all:    {:.3f} s'.format(materializeTime))
+
+
+if __name__ == '__main__':
+    main()
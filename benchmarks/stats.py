@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Compare the statistics of a shapes graph with a full conversion.
+
+The statistics only run discovery and indexing plus a sample of the serializers, the
+conversion extracts every shape. The estimated output size is compared with the real one.
+
+usage: benchmarks/stats.py [number of node shapes]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ShacShifter.ShapeParser import ShapeParser
+from ShacShifter.ShapeStatistics import ShapeStatistics
+from ShacShifter.WisskiSerializer import WisskiSerializer
+from synthetic import writeShapesGraph
+
+
+def main():
+    nodeShapes = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    directory = tempfile.mkdtemp()
+    shapesFile = os.path.join(directory, 'shapes.ttl')
+    outputfile = os.path.join(directory, 'pathbuilder.xml')
+    try:
+        writeShapesGraph(shapesFile, nodeShapes)
+        print('node shapes:  {}'.format(nodeShapes))
+
+        parser = ShapeParser()
+        parser.loadGraph(shapesFile)
+        start = time.perf_counter()
+        stats = ShapeStatistics(parser).collect()
+        print('statistics:   {:.2f} s'.format(time.perf_counter() - start))
+
+        parser = ShapeParser()
+        parser.loadGraph(shapesFile)
+        start = time.perf_counter()
+        for uri in parser.getNodeShapeUris():
+            parser.nodeShapes[uri] = parser.parseNodeShape(uri)
+        WisskiSerializer(parser.nodeShapes, outputfile, labels=parser.labels).write()
+        print('conversion:   {:.2f} s (extraction and wisski)'.format(
+            time.perf_counter() - start))
+        print('wisski size:  {} estimated, {} written'.format(
+            stats['estimatedBytes']['wisski'], os.path.getsize(outputfile)))
+    finally:
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Generators for synthetic shapes and data graphs used by the benchmarks."""
+
+PREFIXES = """@prefix rdf:  <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix sh:   <http://www.w3.org/ns/shacl#> .
+@prefix xsd:  <http://www.w3.org/2001/XMLSchema#> .
+@prefix ex: <http://www.example.org/> .
+"""
+
+EX = 'http://www.example.org/'
+
+
+def shapesGraph(nodeShapes, propertiesPerShape=5, inSize=5):
+    """Return a Turtle shapes graph with nodeShapes node shapes."""
+    lines = [PREFIXES]
+    for i in range(nodeShapes):
+        lines.append('ex:Shape{i} a sh:NodeShape ;\n\tsh:targetClass ex:Class{i} ;'.format(i=i))
+        for j in range(propertiesPerShape):
+            choices = ' '.join('"value{}"'.format(k) for k in range(inSize))
+            lines.append(
+                '\tsh:property [\n'
+                '\t\tsh:path ex:property{j} ;\n'
+                '\t\tsh:name "Property {j}"@en ;\n'
+                '\t\tsh:minCount 1 ;\n'
+                '\t\tsh:maxCount {max} ;\n'
+                '\t\tsh:maxLength 20 ;\n'
+                '\t\tsh:pattern "^value" ;\n'
+                '\t\tsh:in ( {choices} ) ;\n'
+                '\t] ;\n'
+                '\tsh:property [\n'
+                '\t\tsh:path ex:link{j} ;\n'
+                '\t\tsh:hasValue ex:Value{j} ;\n'
+                '\t] ;'.format(j=j, max=j + 1, choices=choices))
+        lines.append('\tsh:closed false .\n')
+    return '\n'.join(lines)
+
+
+def writeShapesGraph(path, nodeShapes, **kwargs):
+    with open(path, 'w') as fp:
+        fp.write(shapesGraph(nodeShapes, **kwargs))
+    return path
+
+
+def dataTriples(focusNodes, nodeShapes=1, propertiesPerShape=5, invalidEvery=10):
+    """Yield N-Triples lines for focusNodes instances spread over nodeShapes classes.
+
+    Every invalidEvery-th instance gets a value that violates sh:in and sh:maxLength.
+    """
+    typeUri = '<http://www.w3.org/1999/02/22-rdf-syntax-ns#type>'
+    for i in range(focusNodes):
+        subject = '<{}instance{}>'.format(EX, i)
+        yield '{} {} <{}Class{}> .\n'.format(subject, typeUri, EX, i % nodeShapes)
+        for j in range(propertiesPerShape):
+            if invalidEvery and i % invalidEvery == 0:
+                value = 'a value that is much too long'
+            else:
+                value = 'value{}'.format(j % 5)
+            yield '{} <{}property{}> "{}" .\n'.format(subject, EX, j, value)
+            yield '{} <{}link{}> <{}Value{}> .\n'.format(subject, EX, j, EX, j)
+
+
+def writeDataGraph(path, focusNodes, **kwargs):
+    with open(path, 'w') as fp:
+        fp.writelines(dataTriples(focusNodes, **kwargs))
+    return path
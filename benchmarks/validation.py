@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Measure validation throughput of the compiled ShapeValidator.
+
+usage: benchmarks/validation.py [number of focus nodes] [number of node shapes]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import rdflib
+from ShacShifter.ShapeParser import ShapeParser
+from ShacShifter.ShapeValidator import ShapeValidator
+from synthetic import writeDataGraph, writeShapesGraph
+
+
+def main():
+    focusNodes = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    nodeShapes = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    directory = tempfile.mkdtemp()
+    shapesFile = writeShapesGraph(os.path.join(directory, 'shapes.ttl'), nodeShapes)
+    dataFile = writeDataGraph(os.path.join(directory, 'data.nt'), focusNodes,
+                              nodeShapes=nodeShapes)
+
+    try:
+        shapes = ShapeParser().parseShape(shapesFile, detached=True)
+
+        start = time.perf_counter()
+        dataGraph = rdflib.Graph()
+        dataGraph.parse(dataFile, format='nt')
+        loadTime = time.perf_counter() - start
+
+        start = time.perf_counter()
+        validator = ShapeValidator(shapes)
+        compileTime = time.perf_counter() - start
+
+        start = time.perf_counter()
+        report = validator.validate(dataGraph)
+        validationTime = time.perf_counter() - start
+    finally:
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+
+    print('focus nodes:       {}'.format(focusNodes))
+    print('data triples:      {}'.format(len(dataGraph)))
+    print('load data:         {:.2f} s'.format(loadTime))
+    print('compile shapes:    {:.4f} s'.format(compileTime))
+    print('validate:          {:.2f} s ({:.0f} focus nodes/s)'.format(
+        validationTime, focusNodes / validationTime))
+    print('results:           {}'.format(len(report.results)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Measure the latency from an edit of a shapes file to the updated RDForms output.
+
+usage: benchmarks/watch.py [number of node shapes] [number of edits]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ShacShifter.ShapeWatcher import ShapeWatcher
+from synthetic import shapesGraph
+
+
+def main():
+    nodeShapes = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    edits = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    directory = tempfile.mkdtemp()
+    shapesFile = os.path.join(directory, 'shapes.ttl')
+    outputFile = os.path.join(directory, 'forms.json')
+    text = shapesGraph(nodeShapes, propertiesPerShape=1)
+
+    try:
+        with open(shapesFile, 'w') as fp:
+            fp.write(text)
+        watcher = ShapeWatcher(shapesFile, outputFile)
+        start = time.perf_counter()
+        watcher.load()
+        loaded = time.perf_counter() - start
+
+        latencies = []
+        for edit in range(edits):
+            # change the maximum cardinality of one shape somewhere in the file
+            shape = (edit * 7919) % nodeShapes
+            old = 'ex:Shape{} a sh:NodeShape ;\n\tsh:targetClass ex:Class{} ;'.format(shape, shape)
+            new = old + '\n\tsh:description "edit {}" ;'.format(edit)
+            text = text.replace(old, new)
+            with open(shapesFile, 'w') as fp:
+                fp.write(text)
+            start = time.perf_counter()
+            changed = watcher.update()
+            latencies.append(time.perf_counter() - start)
+            assert changed == {'http://www.example.org/Shape{}'.format(shape)}, changed
+    finally:
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+
+    print('node shapes:    {}'.format(nodeShapes))
+    print('triples:        {}'.format(len(watcher.parser.g)))
+    print('initial load:   {:.2f} s'.format(loaded))
+    print('edit latency:   median {:.1f} ms, max {:.1f} ms'.format(
+        statistics.median(latencies) * 1000, max(latencies) * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Measure time and peak memory of the WissKI pathbuilder export of nested shapes.
+
+Every top level shape nests a chain of shared event, place and address shapes, so the
+export grows with the number of shapes while the memoized translations do not.
+
+usage: benchmarks/wisski.py [number of node shapes]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ShacShifter.ShapeParser import ShapeParser
+from ShacShifter.WisskiSerializer import WisskiSerializer
+
+PREFIXES = """@prefix sh: <http://www.w3.org/ns/shacl#> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+@prefix ex: <http://www.example.org/> .
+
+ex:EventShape a sh:NodeShape ;
+\tsh:property [ sh:path ex:date ; sh:datatype xsd:integer ] ;
+\tsh:property [ sh:path ex:place ; sh:node ex:PlaceShape ] .
+
+ex:PlaceShape a sh:NodeShape ;
+\tsh:property [ sh:path ex:placeName ] ;
+\tsh:property [ sh:path ex:address ; sh:node ex:AddressShape ] .
+
+ex:AddressShape a sh:NodeShape ;
+\tsh:property [ sh:path ex:street ] ;
+\tsh:property [ sh:path ( ex:city ex:cityName ) ] .
+"""
+
+SHAPE = """
+ex:Shape{0} a sh:NodeShape ;
+\tsh:targetClass ex:Class{0} ;
+\tsh:property [ sh:path ex:name{0} ; sh:maxCount 1 ] ;
+\tsh:property [ sh:path ex:event{0} ; sh:node ex:EventShape ] .
+"""
+
+
+def export(nodeShapes, labels, outputfile):
+    serializer = WisskiSerializer(nodeShapes, outputfile, labels=labels)
+    tracemalloc.start()
+    start = time.perf_counter()
+    paths = serializer.write()
+    duration = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return paths, duration, peak
+
+
+def main():
+    nodeShapes = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    directory = tempfile.mkdtemp()
+    shapesFile = os.path.join(directory, 'shapes.ttl')
+    outputfile = os.path.join(directory, 'pathbuilder.xml')
+    try:
+        with open(shapesFile, 'w') as fp:
+            fp.write(PREFIXES)
+            for i in range(nodeShapes):
+                fp.write(SHAPE.format(i))
+        parser = ShapeParser()
+        shapes = parser.parseShape(shapesFile, detached=True)
+        small = {uri: shapes[uri] for uri in list(shapes)[:max(1, nodeShapes // 100)]}
+        for name in ('EventShape', 'PlaceShape', 'AddressShape'):
+            uri = 'http://www.example.org/' + name
+            small[uri] = shapes[uri]
+
+        print('node shapes:  {}'.format(nodeShapes))
+        for name, subset in (('1%', small), ('all', shapes)):
+            paths, duration, peak = export(subset, parser.labels, outputfile)
+            print('{:>4}: {:>7} paths  {:.2f} s  peak {:.1f} MiB  output {:.1f} MiB'.format(
+                name, paths, duration, peak / 2 ** 20, os.path.getsize(outputfile) / 2 ** 20))
+    finally:
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -14,6 +14,10 @@ setup(
     install_requires=[
         'rdflib==4.2.1'
     ],
+    extras_require={
+        # vectorized range and length checks of the validator
+        'numpy': ['numpy']
+    },
     dependency_links=[
         'rdflib==4.2.1'
     ],
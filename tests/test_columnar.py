@@ -0,0 +1,128 @@
+import unittest
+import datetime
+import operator
+from decimal import Decimal
+import rdflib
+from rdflib.namespace import XSD
+from context import ShacShifter
+from ShacShifter import ColumnarChecks as columnar
+from ShacShifter.ColumnarChecks import ColumnarChecks, exactFloat, SH
+from ShacShifter.modules.PropertyShape import PropertyShape
+
+
+class ColumnarChecksTests(unittest.TestCase):
+
+    ex = rdflib.Namespace('http://www.example.org/')
+
+    def setUp(self):
+        self.propertyShape = PropertyShape()
+        for attribute, value in [('minInclusive', 0), ('maxExclusive', 150),
+                                 ('minLength', 1), ('maxLength', 3)]:
+            setattr(self.propertyShape, attribute, value)
+            self.propertyShape.isSet[attribute] = True
+        self.focusNodes = [self.ex.a, self.ex.b, self.ex.c]
+        self.valueLists = [
+            [rdflib.Literal(42), rdflib.Literal(-1), rdflib.Literal(Decimal('149.5'))],
+            [rdflib.Literal(2 ** 70), rdflib.Literal(1e3), rdflib.BNode()],
+            [rdflib.Literal('abc', datatype=XSD.integer), rdflib.Literal(''), self.ex.d,
+             rdflib.Literal(datetime.date(2017, 1, 1))]
+        ]
+
+    def tearDown(self):
+        self.propertyShape = None
+
+    def expected(self, ranges=None):
+        """Check every value on its own, like the per-value closures of the validator."""
+        if ranges is None:
+            ranges = [(0, SH.MinInclusiveConstraintComponent, operator.ge),
+                      (150, SH.MaxExclusiveConstraintComponent, operator.lt)]
+        lengths = [(1, SH.MinLengthConstraintComponent, operator.ge),
+                   (3, SH.MaxLengthConstraintComponent, operator.le)]
+        violations = []
+        for values in self.valueLists:
+            found = []
+            for bound, component, accept in ranges:
+                found += [(component, value) for value in values
+                          if not ColumnarChecks.inRange(value, bound, accept)]
+            for bound, component, accept in lengths:
+                found += [(component, value) for value in values
+                          if isinstance(value, rdflib.BNode) or not accept(len(value), bound)]
+            violations.append(found)
+        return violations
+
+    def testExactFloat(self):
+        self.assertEqual(exactFloat(3), 3.0)
+        self.assertEqual(exactFloat(Decimal('0.5')), 0.5)
+        self.assertIsNone(exactFloat(Decimal('0.1')))
+        self.assertIsNone(exactFloat(2 ** 70 + 1))
+        self.assertIsNone(exactFloat(True))
+        self.assertIsNone(exactFloat('1'))
+
+    def testFallback(self):
+        checks = ColumnarChecks(self.propertyShape, vectorized=False)
+        self.assertEqual(checks.check(self.focusNodes, self.valueLists), self.expected())
+
+    @unittest.skipIf(columnar.numpy is None, 'NumPy is not installed')
+    def testVectorized(self):
+        checks = ColumnarChecks(self.propertyShape)
+        self.assertIsNotNone(checks.numpy)
+        self.assertEqual(checks.check(self.focusNodes, self.valueLists), self.expected())
+
+    def setDecimalBounds(self):
+        self.propertyShape.isSet['minInclusive'] = False
+        self.propertyShape.isSet['maxExclusive'] = False
+        for attribute, value in [('minExclusive', Decimal('-0.1')),
+                                 ('maxInclusive', Decimal('149.5'))]:
+            setattr(self.propertyShape, attribute, value)
+            self.propertyShape.isSet[attribute] = True
+        return [(Decimal('-0.1'), SH.MinExclusiveConstraintComponent, operator.gt),
+                (Decimal('149.5'), SH.MaxInclusiveConstraintComponent, operator.le)]
+
+    def testDecimalBoundsFallback(self):
+        ranges = self.setDecimalBounds()
+        checks = ColumnarChecks(self.propertyShape, vectorized=False)
+        violations = checks.check(self.focusNodes, self.valueLists)
+        self.assertEqual(violations, self.expected(ranges))
+        # 149.5 is in range, -1 is not
+        self.assertNotIn((SH.MaxInclusiveConstraintComponent, rdflib.Literal(Decimal('149.5'))),
+                         violations[0])
+        self.assertIn((SH.MinExclusiveConstraintComponent, rdflib.Literal(-1)), violations[0])
+
+    @unittest.skipIf(columnar.numpy is None, 'NumPy is not installed')
+    def testDecimalBoundsVectorized(self):
+        ranges = self.setDecimalBounds()
+        checks = ColumnarChecks(self.propertyShape)
+        self.assertEqual(checks.check(self.focusNodes, self.valueLists), self.expected(ranges))
+
+    def testDateBounds(self):
+        self.propertyShape.minInclusive = datetime.date(2017, 1, 1)
+        ranges = [(datetime.date(2017, 1, 1), SH.MinInclusiveConstraintComponent, operator.ge),
+                  (150, SH.MaxExclusiveConstraintComponent, operator.lt)]
+        for vectorized in [False, True]:
+            checks = ColumnarChecks(self.propertyShape, vectorized=vectorized)
+            self.assertEqual(checks.check(self.focusNodes, self.valueLists),
+                             self.expected(ranges))
+
+    def testMissingNumPyIsLoggedOnce(self):
+        numpy = columnar.numpy
+        reported = ColumnarChecks.reportedFallback
+        columnar.numpy = None
+        ColumnarChecks.reportedFallback = False
+        try:
+            with self.assertLogs('ShacShifter.ColumnarChecks', 'WARNING') as logs:
+                ColumnarChecks(self.propertyShape)
+                ColumnarChecks(self.propertyShape)
+            ColumnarChecks(self.propertyShape, vectorized=False)
+        finally:
+            columnar.numpy = numpy
+            ColumnarChecks.reportedFallback = reported
+        self.assertEqual(len(logs.output), 1)
+
+    def testEmpty(self):
+        self.assertFalse(ColumnarChecks(PropertyShape()))
+        checks = ColumnarChecks(self.propertyShape)
+        self.assertEqual(checks.check([self.ex.a], [[]]), [[]])
+
+
+if __name__ == '__main__':
+    unittest.main()
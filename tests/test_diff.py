@@ -0,0 +1,101 @@
+import unittest
+import json
+import os
+import tempfile
+from os import path
+from context import ShacShifter
+from ShacShifter.ShacShifter import ShacShifter
+from ShacShifter.ShapeDiff import ShapeDiff, shapeHash
+from ShacShifter.ShapeParser import ShapeParser
+from ShacShifter.ShapeSnapshot import ShapeSnapshot, ShapeSnapshotWriter
+
+EX = 'http://www.example.org/'
+
+
+class ShapeDiffTests(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = path.abspath('tests/_files/diff')
+        self.old = ShapeParser().parseShape(path.join(self.dir, 'old.ttl'))
+        self.new = ShapeParser().parseShape(path.join(self.dir, 'new.ttl'))
+        self.delta = ShapeDiff(self.old, self.new).delta()
+
+    def tearDown(self):
+        self.old = None
+        self.new = None
+
+    def testShapes(self):
+        self.assertEqual(self.delta['added'], [EX + 'OfferShape'])
+        self.assertEqual(self.delta['removed'], [EX + 'ProductShape'])
+        # the company shape only differs in the order of its triples
+        self.assertEqual(self.delta['modified'], [EX + 'PersonShape'])
+        self.assertEqual(self.delta['bundles'], [EX + 'OfferShape', EX + 'PersonShape'])
+
+    def testChanges(self):
+        changes = self.delta['changes'][EX + 'PersonShape']
+        self.assertEqual(changes['fields'], {'closed': [None, True]})
+        self.assertEqual(changes['properties']['added'], [EX + 'birthDate'])
+        self.assertEqual(changes['properties']['removed'], [EX + 'email'])
+        modified = changes['properties']['modified']
+        self.assertEqual(modified[EX + 'name'], {'maxCount': [1, 2]})
+        # sh:in is an RDF list, so its order counts
+        self.assertEqual(modified[EX + 'status'],
+                         {'shIn': [('"active"', '"retired"'), ('"retired"', '"active"')]})
+
+    def testTerms(self):
+        """IRIs and literals with the same text and different languages differ."""
+        old = ShapeParser().parseShape(path.join(self.dir, 'termsOld.ttl'), detached=True)
+        new = ShapeParser().parseShape(path.join(self.dir, 'termsNew.ttl'), detached=True)
+        delta = ShapeDiff(old, new).delta()
+        self.assertEqual(delta['modified'], [EX + 'ColorShape'])
+        modified = delta['changes'][EX + 'ColorShape']['properties']['modified']
+        self.assertEqual(modified, {
+            EX + 'color': {'shIn': [('<http://www.example.org/Pink>', '"rot"@de'),
+                                    ('"http://www.example.org/Pink"', '"rot"@en')]},
+            EX + 'tag': {'hasValue': [('<http://www.example.org/T>',),
+                                      ('"http://www.example.org/T"',)]}})
+        # attached shapes have the same hashes
+        self.assertEqual(ShapeDiff.hashes(new), ShapeDiff.hashes(
+            ShapeParser().parseShape(path.join(self.dir, 'termsNew.ttl'))))
+
+    def testIdentical(self):
+        delta = ShapeDiff(self.old, ShapeParser().parseShape(path.join(self.dir, 'old.ttl')))
+        self.assertEqual(delta.delta()['bundles'], [])
+
+    def testSnapshot(self):
+        """Shapes of a snapshot have the same hashes as the parsed shapes."""
+        fd, snapshotFile = tempfile.mkstemp(suffix='.snapshot')
+        os.close(fd)
+        try:
+            ShapeSnapshotWriter().write(self.new, snapshotFile)
+            with ShapeSnapshot(snapshotFile) as snapshot:
+                for uri in self.new:
+                    self.assertEqual(shapeHash(snapshot[uri]), shapeHash(self.new[uri]))
+                delta = ShapeDiff(self.old, snapshot).delta()
+            self.assertEqual(delta, self.delta)
+        finally:
+            os.remove(snapshotFile)
+
+    def testPrecomputedHashes(self):
+        oldHashes = ShapeDiff.hashes(self.old)
+        delta = ShapeDiff(self.old, self.new, oldHashes=oldHashes).delta()
+        self.assertEqual(delta, self.delta)
+
+    def testShift(self):
+        fd, outputfile = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        try:
+            ShacShifter().shift(path.join(self.dir, 'new.ttl'), outputfile, None,
+                                diff=path.join(self.dir, 'old.ttl'))
+            with open(outputfile) as fp:
+                delta = json.load(fp)
+        finally:
+            os.remove(outputfile)
+        self.assertEqual(delta['bundles'], [EX + 'OfferShape', EX + 'PersonShape'])
+        self.assertEqual(
+            delta['changes'][EX + 'PersonShape']['properties']['modified'][EX + 'name'],
+            {'maxCount': [1, 2]})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import json
+from os import path
+import rdflib
+from context import ShacShifter
+from ShacShifter.HierarchyIndex import HierarchyIndex
+from ShacShifter.RDFormsSerializer import RDFormsSerializer, RDFormsChoiceItem
+from ShacShifter.ShapeParser import ShapeParser
+from ShacShifter.Profiler import Profiler, CountingGraph
+
+SKOS_CONCEPT = 'http://www.w3.org/2004/02/skos/core#Concept'
+
+
+class HierarchyIndexTests(unittest.TestCase):
+
+    ex = rdflib.Namespace('http://www.example.org/')
+
+    def setUp(self):
+        self.dir = path.abspath('tests/_files/hierarchy')
+        self.vocabulary = rdflib.Graph().parse(path.join(self.dir, 'vocabulary.ttl'),
+                                               format='turtle')
+
+    def tearDown(self):
+        self.vocabulary = None
+
+    def testTree(self):
+        tree = HierarchyIndex(self.vocabulary).tree(SKOS_CONCEPT)
+        nodes = {str(node).rsplit('/', 1)[-1]: (top, [str(child).rsplit('/', 1)[-1]
+                                                      for child in children])
+                 for node, top, children in tree}
+
+        self.assertEqual(nodes['Science'], (True, ['Physics']))
+        self.assertEqual(nodes['Physics'], (False, ['Optics']))
+        self.assertEqual(nodes['Optics'], (False, []))
+        self.assertEqual(nodes['Arts'], (True, []))
+        # exactly one member of the cycle becomes a root
+        self.assertEqual(sorted(nodes['Yang'][0:1] + nodes['Yin'][0:1]), [False, True])
+
+    def testSubClasses(self):
+        index = HierarchyIndex(self.vocabulary)
+        self.assertEqual(index.instancesOf(self.ex.Genre), {self.ex.Poetry, self.ex.Crime})
+        self.assertEqual(index.instancesOf(self.ex.Unknown), set())
+
+    def testIndexBuiltOnce(self):
+        profiler = Profiler()
+        index = HierarchyIndex(CountingGraph(self.vocabulary, profiler))
+        lookups = profiler.counters['graphLookups']
+        self.assertIs(index.tree(SKOS_CONCEPT), index.tree(SKOS_CONCEPT))
+        self.assertEqual(profiler.counters['graphLookups'], lookups)
+
+    def testRDForms(self):
+        parser = ShapeParser()
+        nodeShapes = parser.parseShape(path.join(self.dir, 'shapes.ttl'))
+        parser.labels.addGraph(self.vocabulary)
+        serializer = RDFormsSerializer(nodeShapes, labels=parser.labels,
+                                       hierarchy=HierarchyIndex(self.vocabulary),
+                                       ontologyUrl='vocabulary.ttl')
+        bundles = {bundle.root: bundle for bundle in serializer.templateBundles}
+        book = bundles[str(self.ex.BookShape)]
+        article = bundles[str(self.ex.ArticleShape)]
+
+        items = {item.id: item for item in book.templates}
+        subject = items[str(self.ex.subject)]
+        self.assertIsInstance(subject, RDFormsChoiceItem)
+        self.assertEqual(subject.constraints,
+                         {'http://www.w3.org/1999/02/22-rdf-syntax-ns#type': SKOS_CONCEPT})
+        self.assertEqual(subject.ontologyUrl, 'vocabulary.ttl')
+        self.assertEqual(sorted(book.cachedCoices), [str(self.ex.Genre), SKOS_CONCEPT])
+        # the choices are shared, not computed per bundle
+        self.assertIs(book.cachedCoices[SKOS_CONCEPT], article.cachedCoices[SKOS_CONCEPT])
+        # ex:Person has no instances, so ex:author stays a text field
+        self.assertNotIsInstance(
+            {item.id: item for item in article.templates}[str(self.ex.author)],
+            RDFormsChoiceItem)
+
+        science = [choice for choice in json.loads(book.toJson())['cachedCoices'][SKOS_CONCEPT]
+                   if choice['value'] == str(self.ex.Science)][0]
+        self.assertEqual(science['label'], {'en': 'Science', 'de': 'Wissenschaft'})
+        self.assertTrue(science['top'])
+        self.assertEqual(science['children'], [{'_reference': str(self.ex.Physics)}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import os
+import shutil
+import tempfile
+from os import path
+import rdflib
+from rdflib.compare import isomorphic
+from context import ShacShifter
+from ShacShifter.ImportResolver import ImportResolver
+from ShacShifter.ShacShifter import ShacShifter
+from ShacShifter.ShapeParser import ShapeParser
+
+EX = 'http://www.example.org/'
+
+
+class ImportResolverTests(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = path.abspath('tests/_files/imports')
+        self.mainFile = path.join(self.dir, 'main.ttl')
+        self.catalog = path.join(self.dir, 'catalog-v001.xml')
+        self.mirror = path.join(self.dir, 'mirror')
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def resolver(self, **kwargs):
+        return ImportResolver(catalog=self.catalog, mirror=self.mirror, **kwargs)
+
+    def testResolve(self):
+        resolver = self.resolver()
+        self.assertEqual(resolver.resolve(EX + 'shapes/address'),
+                         path.join(self.dir, 'address.ttl'))
+        # host and path of the IRI in the mirror
+        self.assertEqual(resolver.resolve(EX + 'shapes/person'),
+                         path.join(self.mirror, 'www.example.org', 'shapes', 'person.ttl'))
+        # last segment of the IRI in the mirror
+        self.assertEqual(resolver.resolve(EX + 'shapes/common'),
+                         path.join(self.mirror, 'common.ttl'))
+        self.assertIsNone(resolver.resolve(EX + 'shapes/missing'))
+
+    def testParseShape(self):
+        self.assertEqual(list(ShapeParser().parseShape(self.mainFile)), [EX + 'CompanyShape'])
+
+        resolver = self.resolver()
+        parser = ShapeParser(imports=resolver)
+        nodeShapes = parser.parseShape(self.mainFile)
+        self.assertEqual(sorted(nodeShapes),
+                         [EX + 'AddressShape', EX + 'CompanyShape', EX + 'PersonShape'])
+        # the main file is imported again by the address file, but loaded once
+        self.assertEqual(len(resolver.loaded), 4)
+        self.assertEqual(resolver.loaded[0], self.mainFile)
+        self.assertEqual(resolver.missing, [EX + 'shapes/missing'])
+        self.assertEqual(parser.labels.forResource(rdflib.URIRef(EX + 'address'))['de'],
+                         'Adresse')
+
+    def testSameGraph(self):
+        expected = rdflib.Graph()
+        for name in ('main.ttl', 'address.ttl', 'mirror/common.ttl',
+                     'mirror/www.example.org/shapes/person.ttl'):
+            expected.parse(path.join(self.dir, name), format='turtle')
+        for jobs in (1, 2):
+            graph = rdflib.Graph()
+            self.resolver(jobs=jobs).load(self.mainFile, graph)
+            self.assertTrue(isomorphic(graph, expected))
+
+    def testCache(self):
+        # a copy of the fixtures that can be changed
+        shutil.copytree(self.dir, path.join(self.tmp, 'imports'))
+        directory = path.join(self.tmp, 'imports')
+        cache = path.join(self.tmp, 'cache')
+
+        def load():
+            resolver = ImportResolver(path.join(directory, 'catalog-v001.xml'),
+                                      path.join(directory, 'mirror'), cache, jobs=2)
+            graph = rdflib.Graph()
+            resolver.load(path.join(directory, 'main.ttl'), graph)
+            return resolver, graph
+
+        resolver, first = load()
+        self.assertEqual((resolver.parsed, resolver.cached), (4, 0))
+        self.assertEqual(len(os.listdir(cache)), 4)
+
+        resolver, second = load()
+        self.assertEqual((resolver.parsed, resolver.cached), (0, 4))
+        self.assertTrue(isomorphic(first, second))
+
+        with open(path.join(directory, 'address.ttl'), 'a') as fp:
+            fp.write('ex:AddressShape sh:targetClass ex:Address .\n')
+        resolver, third = load()
+        self.assertEqual((resolver.parsed, resolver.cached), (1, 3))
+        self.assertEqual(len(third), len(first) + 1)
+
+    def testShift(self):
+        outputfile = path.join(self.tmp, 'forms.json')
+        ShacShifter().shift(self.mainFile, outputfile, 'rdforms', catalog=self.catalog,
+                            mirror=self.mirror)
+        with open(outputfile) as fp:
+            forms = fp.read()
+        self.assertIn('"root": "http://www.example.org/PersonShape"', forms)
+        self.assertIn('"root": "http://www.example.org/AddressShape"', forms)
+
+
+if __name__ == '__main__':
+    unittest.main()
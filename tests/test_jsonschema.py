@@ -0,0 +1,124 @@
+import unittest
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from os import path
+from context import ShacShifter
+from ShacShifter.ShacShifter import ShacShifter
+from ShacShifter.JSONSchemaSerializer import JSONSchemaSerializer, SCHEMA
+from ShacShifter.ShapeParser import ShapeParser
+
+EX = 'http://www.example.org/'
+
+
+class JSONSchemaSerializerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.shapesFile = path.abspath('tests/_files/jsonschema/shapes.ttl')
+        self.parser = ShapeParser()
+        self.nodeShapes = self.parser.parseShape(self.shapesFile)
+        self.serializer = JSONSchemaSerializer(self.nodeShapes, labels=self.parser.labels)
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def testConstraints(self):
+        document = self.serializer.document(EX + 'PersonShape')
+        self.assertEqual(document['$schema'], SCHEMA)
+        self.assertEqual(document['title'], 'Person')
+        properties = document['properties']
+        name = properties[EX + 'name']
+        self.assertEqual((name['title'], name['minItems'], name['maxItems']), ('Name', 1, 1))
+        self.assertEqual(name['items'], {'type': 'string', 'minLength': 2, 'maxLength': 20,
+                                         'x-shacl-pattern': {'pattern': '^[a-z]', 'flags': 'i'}})
+        self.assertEqual(properties[EX + 'age']['items'],
+                         {'type': 'integer', 'minimum': 0, 'exclusiveMaximum': 150})
+        self.assertEqual(properties[EX + 'height']['items'],
+                         {'type': 'number', 'exclusiveMinimum': 0, 'maximum': 2.75})
+        self.assertEqual(properties[EX + 'gender']['items'],
+                         {'enum': [EX + 'female', EX + 'male', 'other', 3]})
+        self.assertEqual(properties[EX + 'email']['items'], {'pattern': '^[^@]+@[^@]+$'})
+        self.assertEqual(document['required'], [EX + 'name'])
+        # closed shapes allow the ignored properties only
+        self.assertFalse(document['additionalProperties'])
+        self.assertIn('http://www.w3.org/1999/02/22-rdf-syntax-ns#type', properties)
+        # complex paths are left out
+        self.assertEqual(len(properties), 8)
+
+    def testLogicalAndUnsupported(self):
+        document = self.serializer.document(EX + 'CompanyShape')
+        properties = document['properties']
+        # property shapes of sh:and operands, JSON Schema has no date ranges
+        self.assertEqual(properties[EX + 'founded']['items'], {'type': 'string', 'format': 'date'})
+        tag = properties[EX + 'tag']
+        self.assertEqual(tag['contains'], {'const': 'company'})
+        # the flag x can not be expressed
+        self.assertEqual(tag['items'], {})
+        self.assertNotIn('additionalProperties', document)
+
+    @unittest.skipIf(shutil.which('node') is None, 'Node.js is not installed')
+    def testPatternsAreECMAScript(self):
+        def patterns(schema):
+            if isinstance(schema, list):
+                for item in schema:
+                    yield from patterns(item)
+            elif isinstance(schema, dict):
+                for key, value in schema.items():
+                    if key == 'x-shacl-pattern':
+                        yield [value['pattern'], value['flags']]
+                    elif key == 'pattern' and isinstance(value, str):
+                        # the pattern keyword is an ECMAScript regular expression
+                        yield [value, 'u']
+                    else:
+                        yield from patterns(value)
+
+        found = [pattern for uri in sorted(self.nodeShapes)
+                 for pattern in patterns(self.serializer.document(uri))]
+        self.assertIn(['^[a-z]', 'i'], found)
+        script = ('console.log(JSON.stringify(JSON.parse(process.argv[1]).map(([p, f]) => '
+                  'new RegExp(p, f).test("Alice"))));')
+        output = subprocess.check_output(['node', '-e', script, json.dumps(found)])
+        # every pattern compiles, ^[a-z] matches because of the flag i
+        matches = json.loads(output.decode('utf-8'))
+        self.assertTrue(matches[found.index(['^[a-z]', 'i'])])
+
+    def testDefinitions(self):
+        person = self.serializer.document(EX + 'PersonShape')
+        company = self.serializer.document(EX + 'CompanyShape')
+        self.assertEqual(person['properties'][EX + 'address']['items'],
+                         {'$ref': '#/$defs/AddressShape'})
+        # transitive references, the root only because it references itself
+        self.assertEqual(sorted(person['$defs']), ['AddressShape', 'CityShape', 'PersonShape'])
+        self.assertEqual(sorted(company['$defs']), ['AddressShape', 'CityShape'])
+        # shared shapes are computed once
+        self.assertIs(person['$defs']['AddressShape'], company['$defs']['AddressShape'])
+        self.assertNotIn('$defs', self.serializer.document(EX + 'CityShape'))
+        for document in [person, company]:
+            for reference in re.findall(r'"#/\$defs/([^"]+)"', json.dumps(document)):
+                self.assertIn(reference, document['$defs'])
+
+    def testWrite(self):
+        outputfile = path.join(self.dir, 'schemas.json')
+        ShacShifter().shift(self.shapesFile, outputfile, 'jsonschema')
+        with open(outputfile) as fp:
+            documents = json.load(fp)
+        self.assertEqual(sorted(documents), sorted(self.nodeShapes))
+        self.assertEqual(documents[EX + 'PersonShape'],
+                         json.loads(json.dumps(self.serializer.document(EX + 'PersonShape'))))
+
+        directory = path.join(self.dir, 'shards')
+        ShacShifter().shift(self.shapesFile, directory, 'jsonschema', shards=True)
+        with open(path.join(directory, 'manifest.json')) as fp:
+            manifest = json.load(fp)
+        entry = manifest['shapes'][EX + 'CompanyShape']
+        with open(path.join(directory, entry['file'])) as fp:
+            self.assertEqual(json.load(fp)['title'], 'CompanyShape')
+        self.assertEqual(len(os.listdir(directory)), len(self.nodeShapes) + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import os
+import tempfile
+from os import path
+import rdflib
+from context import ShacShifter
+from ShacShifter.HTMLSerializer import HTMLSerializer
+from ShacShifter.LabelIndex import LabelIndex
+from ShacShifter.RDFormsSerializer import RDFormsSerializer
+from ShacShifter.ShapeParser import ShapeParser
+
+
+class LabelIndexTests(unittest.TestCase):
+
+    ex = rdflib.Namespace('http://www.example.org/')
+
+    def setUp(self):
+        self.dir = path.abspath('tests/_files/labels')
+        self.parser = ShapeParser()
+        self.nodeShapes = self.parser.parseShape(path.join(self.dir, 'shapes.ttl'))
+        self.ontology = rdflib.Graph().parse(path.join(self.dir, 'ontology.ttl'), format='turtle')
+        self.parser.labels.addGraph(self.ontology)
+        self.properties = {
+            propertyShape.path: propertyShape
+            for propertyShape in self.nodeShapes[str(self.ex.PersonShape)].properties}
+
+    def tearDown(self):
+        self.parser = None
+        self.nodeShapes = None
+
+    def testLabels(self):
+        labels = self.parser.labels
+        self.assertEqual(labels.forPropertyShape(self.properties[str(self.ex.name)]),
+                         {'en': 'Name', 'de': 'Name', 'fr': 'Nom'})
+        # skos:prefLabel is preferred over rdfs:label
+        self.assertEqual(labels.forPropertyShape(self.properties[str(self.ex.birthDate)]),
+                         {'en': 'Date of birth', 'de': 'Geburtsdatum'})
+        self.assertEqual(labels.forPropertyShape(self.properties[str(self.ex.gender)]),
+                         {'default': 'gender'})
+        self.assertEqual(labels.forPropertyShape(self.properties[str(self.ex.nickname)]),
+                         {'default': 'nickname'})
+        self.assertEqual(labels.forResource(self.ex.Person), {'en': 'Person', 'fr': 'Personne'})
+        self.assertEqual(labels.forResource(rdflib.Literal('a/b')), {'default': 'a/b'})
+
+    def testPick(self):
+        labels = {'en': 'Name', 'de': 'Name DE', 'default': 'name'}
+        self.assertEqual(LabelIndex.pick(labels, 'de-AT'), 'Name DE')
+        self.assertEqual(LabelIndex.pick(labels, 'fr'), 'name')
+        self.assertEqual(LabelIndex.pick({'fr': 'Nom', 'de': 'Name'}), 'Name')
+        self.assertEqual(LabelIndex.pick({}), '')
+
+    def testDetached(self):
+        parser = ShapeParser()
+        nodeShapes = parser.parseShape(path.join(self.dir, 'shapes.ttl'), detached=True)
+        name = [propertyShape for propertyShape in nodeShapes[str(self.ex.PersonShape)].properties
+                if propertyShape.path == str(self.ex.name)][0]
+        self.assertEqual(parser.labels.forPropertyShape(name)['fr'], 'Nom')
+        self.assertFalse([resource for resource in parser.labels.labels
+                          if isinstance(resource, rdflib.BNode)])
+
+    def testRDForms(self):
+        serializer = RDFormsSerializer(self.nodeShapes, labels=self.parser.labels)
+        bundle, = serializer.templateBundles
+        items = {item.id: item for item in bundle.templates}
+
+        self.assertEqual(bundle.label, {'en': 'Create new Instance of: Person'})
+        self.assertEqual(items[str(self.ex.name)].label, {'en': 'Name', 'de': 'Name', 'fr': 'Nom'})
+        self.assertEqual(items[str(self.ex.gender)].label, {'': 'gender'})
+        choices = {choice.value: choice.label for choice in items[str(self.ex.gender)].choices}
+        self.assertEqual(choices, {str(self.ex.Female): {'en': 'female', 'de': 'weiblich'},
+                                   str(self.ex.Male): {'en': 'male', 'de': 'männlich'}})
+
+    def testHTML(self):
+        outputfile = tempfile.mkstemp(suffix='.html')[1]
+        try:
+            HTMLSerializer(self.nodeShapes, outputfile, labels=self.parser.labels, language='fr')
+            with open(outputfile) as fp:
+                html = fp.read()
+        finally:
+            os.remove(outputfile)
+        self.assertIn('Create new Personne', html)
+        self.assertIn('Nom:', html)
+        self.assertIn('Date of birth:', html)
+
+
+if __name__ == '__main__':
+    unittest.main()
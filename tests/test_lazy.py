@@ -0,0 +1,73 @@
+import unittest
+from os import path
+from context import ShacShifter
+from ShacShifter.LazyNodeShapes import LazyNodeShapes
+from ShacShifter.ParserLimits import ParserLimits
+from ShacShifter.RDFormsSerializer import RDFormsSerializer
+from ShacShifter.ShapeDiff import ShapeDiff
+from ShacShifter.ShapeParser import ShapeParser
+
+EX = 'http://www.example.org/'
+
+
+class LazyNodeShapesTests(unittest.TestCase):
+
+    def setUp(self):
+        self.shapesFile = path.abspath('tests/_files/logical/shapes.ttl')
+        self.expected = ShapeDiff.hashes(ShapeParser().parseShape(self.shapesFile))
+
+    def testKeys(self):
+        parser = ShapeParser()
+        nodeShapes = parser.parseShape(self.shapesFile, lazy=True)
+        self.assertIsInstance(nodeShapes, LazyNodeShapes)
+        self.assertEqual(list(nodeShapes), sorted(self.expected))
+        self.assertEqual(list(nodeShapes), list(nodeShapes))
+        self.assertEqual(len(nodeShapes), len(self.expected))
+        self.assertIn(EX + 'PersonShape', nodeShapes)
+        self.assertNotIn(EX + 'Missing', nodeShapes)
+        # discovery only
+        self.assertEqual(nodeShapes.materialized(), [])
+        self.assertEqual(parser.propertyShapes, {})
+
+    def testFirstAccess(self):
+        parser = ShapeParser()
+        nodeShapes = parser.parseShape(self.shapesFile, lazy=True)
+        contactShape = nodeShapes[EX + 'ContactShape']
+        self.assertEqual(nodeShapes.materialized(), [EX + 'ContactShape'])
+        self.assertIs(nodeShapes[EX + 'ContactShape'], contactShape)
+        self.assertEqual(ShapeDiff.hashes({EX + 'ContactShape': contactShape}),
+                         {EX + 'ContactShape': self.expected[EX + 'ContactShape']})
+        with self.assertRaises(KeyError):
+            nodeShapes[EX + 'Missing']
+
+    def testMaterializeAll(self):
+        parser = ShapeParser()
+        nodeShapes = parser.parseShape(self.shapesFile, lazy=True)
+        # BaseShape is an operand of CompanyShape and shared with it
+        company = nodeShapes[EX + 'CompanyShape']
+        result = nodeShapes.materializeAll()
+        self.assertEqual(ShapeDiff.hashes(result), self.expected)
+        self.assertIs(company.sAnd[0][0], result[EX + 'BaseShape'])
+        self.assertEqual(nodeShapes.materialized(), list(nodeShapes))
+        # serializers take the mapping like a dictionary
+        self.assertEqual(len(RDFormsSerializer(nodeShapes).templateBundles), len(result))
+
+    def testInvalidation(self):
+        parser = ShapeParser()
+        nodeShapes = parser.parseShape(self.shapesFile, lazy=True)
+        parser.parseShape(path.abspath('tests/_files/stats/simple.ttl'))
+        with self.assertRaises(Exception):
+            nodeShapes[EX + 'PersonShape']
+        with self.assertRaises(Exception):
+            parser.parseShape(self.shapesFile, lazy=True, detached=True)
+
+    def testTimeBudget(self):
+        # the budget starts again for every extraction
+        parser = ShapeParser(limits=ParserLimits(timeBudget=60))
+        nodeShapes = parser.parseShape(self.shapesFile, lazy=True)
+        parser.deadline = 0
+        self.assertEqual(nodeShapes[EX + 'BaseShape'].uri, EX + 'BaseShape')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import unittest
+import os
+import tempfile
+from os import path
+import rdflib
+from context import ShacShifter
+from ShacShifter.NTriplesLoader import NTriplesLoader
+from ShacShifter.ParserLimits import LimitedGraph, ParserLimits, ShapeParserLimitError, UNLIMITED
+from ShacShifter.ShapeParser import ShapeParser
+
+SH = rdflib.Namespace('http://www.w3.org/ns/shacl#')
+
+PREFIXES = """@prefix ex: <http://www.example.org/> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+"""
+
+
+class ParserLimitsTests(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = path.abspath('tests/_files/limits')
+        self.files = []
+
+    def tearDown(self):
+        for fileName in self.files:
+            os.remove(fileName)
+
+    def writeShapes(self, body):
+        with tempfile.NamedTemporaryFile('w', suffix='.ttl', delete=False) as fp:
+            fp.write(PREFIXES + body)
+        self.files.append(fp.name)
+        return fp.name
+
+    def pathShapes(self, depth):
+        # flat triples, nested brackets would hit the recursion limit of the Turtle parser
+        steps = ''.join('_:p{} sh:inversePath _:p{} .\n'.format(i, i + 1) for i in range(depth))
+        return self.writeShapes(
+            'ex:S a sh:NodeShape ; sh:targetClass ex:C ; sh:property [ sh:path _:p0 ] .\n' +
+            steps + '_:p{} sh:inversePath ex:p .\n'.format(depth))
+
+    def listShapes(self, length):
+        values = ' '.join('"v{}"'.format(i) for i in range(length))
+        return self.writeShapes(
+            'ex:S a sh:NodeShape ; sh:targetClass ex:C ; '
+            'sh:property [ sh:path ex:p ; sh:in ( {} ) ] .\n'.format(values))
+
+    def testCyclicList(self):
+        with self.assertRaises(ShapeParserLimitError) as cm:
+            ShapeParser().parseShape(path.join(self.dir, 'cyclicList.ttl'))
+        self.assertEqual(cm.exception.limit, 'cycle')
+        self.assertEqual(cm.exception.node, 'http://www.example.org/list1')
+
+    def testOpenList(self):
+        with self.assertRaises(Exception) as cm:
+            ShapeParser().parseShape(path.join(self.dir, 'openList.ttl'))
+        self.assertIn('not terminated by rdf:nil', str(cm.exception))
+
+    def testSelfReferencingQualifiedValueShape(self):
+        with self.assertRaises(ShapeParserLimitError) as cm:
+            ShapeParser().parseShape(path.join(self.dir, 'selfQualified.ttl'))
+        self.assertEqual(cm.exception.limit, 'cycle')
+        self.assertEqual(cm.exception.node, 'http://www.example.org/ParentProperty')
+
+    def testQualifiedValueShapeLoop(self):
+        with self.assertRaises(ShapeParserLimitError) as cm:
+            ShapeParser().parseShape(path.join(self.dir, 'qualifiedLoop.ttl'))
+        self.assertEqual(cm.exception.limit, 'cycle')
+
+    def testLogicalOperandDepth(self):
+        # every shape is the sh:not operand of the one before
+        operands = ''.join('ex:N{} sh:not ex:N{} .\n'.format(i, i + 1) for i in range(5))
+        shapesFile = self.writeShapes('ex:N0 a sh:NodeShape ; sh:targetClass ex:C .\n' +
+                                      operands + 'ex:N5 sh:class ex:D .\n')
+        ShapeParser(limits=ParserLimits(maxRecursionDepth=5)).parseShape(shapesFile)
+        with self.assertRaises(ShapeParserLimitError) as cm:
+            ShapeParser(limits=ParserLimits(maxRecursionDepth=4)).parseShape(shapesFile)
+        self.assertEqual(cm.exception.limit, 'maxRecursionDepth')
+
+    def testPathDepth(self):
+        nodeShapes = ShapeParser().parseShape(self.pathShapes(5))
+        path = nodeShapes['http://www.example.org/S'].properties[0].path
+        for i in range(6):
+            path = path[SH.inversePath]
+        self.assertEqual(str(path), 'http://www.example.org/p')
+
+        with self.assertRaises(ShapeParserLimitError) as cm:
+            ShapeParser(limits=ParserLimits(maxPathDepth=4)).parseShape(self.pathShapes(5))
+        self.assertEqual(cm.exception.limit, 'maxPathDepth')
+        self.assertEqual(cm.exception.maximum, 4)
+
+    def testDeepPathWithDefaults(self):
+        # the default depth limit triggers long before the Python recursion limit
+        with self.assertRaises(ShapeParserLimitError) as cm:
+            ShapeParser().parseShape(self.pathShapes(2000))
+        self.assertEqual(cm.exception.limit, 'maxPathDepth')
+
+    def testListLength(self):
+        nodeShapes = ShapeParser().parseShape(self.listShapes(20))
+        self.assertEqual(len(nodeShapes['http://www.example.org/S'].properties[0].shIn), 20)
+
+        with self.assertRaises(ShapeParserLimitError) as cm:
+            ShapeParser(limits=ParserLimits(maxListLength=10)).parseShape(self.listShapes(20))
+        self.assertEqual(cm.exception.limit, 'maxListLength')
+        self.assertEqual(cm.exception.value, 11)
+
+    def testMaxTriples(self):
+        with self.assertRaises(ShapeParserLimitError) as cm:
+            ShapeParser(limits=ParserLimits(maxTriples=10)).parseShape(self.listShapes(20))
+        self.assertEqual(cm.exception.limit, 'maxTriples')
+        self.assertIn('maxTriples', str(cm.exception))
+
+    def testMaxTriplesWhileLoading(self):
+        # the load stops shortly after the limit, not after all 20000 triples
+        parser = ShapeParser(limits=ParserLimits(maxTriples=1000))
+        with self.assertRaises(ShapeParserLimitError) as cm:
+            parser.parseShape(self.listShapes(10000))
+        self.assertEqual(cm.exception.limit, 'maxTriples')
+        self.assertLessEqual(len(parser.g), 1000 + LimitedGraph.CHECK_INTERVAL)
+
+        lines = ''.join('<http://www.example.org/S> <http://www.w3.org/ns/shacl#property> '
+                        '_:p{} .\n'.format(i) for i in range(20000))
+        with tempfile.NamedTemporaryFile('w', suffix='.nt', delete=False) as fp:
+            fp.write(lines)
+        self.files.append(fp.name)
+        parser = ShapeParser(limits=ParserLimits(maxTriples=1000),
+                             loader=NTriplesLoader(chunkBytes=4096))
+        with self.assertRaises(ShapeParserLimitError):
+            parser.parseShape(fp.name)
+        self.assertLess(len(parser.g), 20000)
+
+    def testTimeBudgetWhileLoading(self):
+        parser = ShapeParser(limits=ParserLimits(timeBudget=0))
+        with self.assertRaises(ShapeParserLimitError) as cm:
+            parser.parseShape(self.listShapes(10000))
+        self.assertEqual(cm.exception.limit, 'timeBudget')
+        self.assertEqual(len(parser.g), LimitedGraph.CHECK_INTERVAL - 1)
+
+    def testTimeBudget(self):
+        with self.assertRaises(ShapeParserLimitError) as cm:
+            ShapeParser(limits=ParserLimits(timeBudget=0)).parseShape(self.listShapes(20))
+        self.assertEqual(cm.exception.limit, 'timeBudget')
+
+    def testUnlimited(self):
+        nodeShapes = ShapeParser(limits=UNLIMITED).parseShape(self.listShapes(200))
+        self.assertEqual(len(nodeShapes['http://www.example.org/S'].properties[0].shIn), 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+import os
+import tempfile
+from os import path
+import rdflib
+from context import ShacShifter
+from ShacShifter.ParserLimits import ShapeParserLimitError
+from ShacShifter.RDFormsSerializer import RDFormsSerializer
+from ShacShifter.ShapeNormalizer import ShapeNormalizer
+from ShacShifter.ShapeParser import ShapeParser
+from ShacShifter.ShapeSnapshot import ShapeSnapshot, ShapeSnapshotWriter
+from ShacShifter.ShapeValidator import ShapeValidator
+from ShacShifter.modules.NodeShape import NodeShape
+
+EX = 'http://www.example.org/'
+SH = rdflib.Namespace('http://www.w3.org/ns/shacl#')
+
+
+class LogicalConstraintTests(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = path.abspath('tests/_files/logical')
+        self.nodeShapes = ShapeParser().parseShape(path.join(self.dir, 'shapes.ttl'))
+
+    def tearDown(self):
+        self.nodeShapes = None
+
+    def testParser(self):
+        # the blank node operands are no node shapes of their own
+        self.assertEqual(sorted(self.nodeShapes), [
+            EX + 'BaseShape', EX + 'CompanyShape', EX + 'ContactShape', EX + 'PersonShape'])
+
+        person = self.nodeShapes[EX + 'PersonShape']
+        self.assertTrue(person.isSet['sAnd'])
+        self.assertFalse(person.isSet['sOr'])
+        (operands,) = person.sAnd
+        self.assertEqual(len(operands), 2)
+        # named operands are the parsed node shapes, shared by all constraints
+        self.assertIs(operands[0], self.nodeShapes[EX + 'BaseShape'])
+        self.assertIs(self.nodeShapes[EX + 'CompanyShape'].sAnd[0][0], operands[0])
+        nested = operands[1]
+        self.assertIsInstance(nested, NodeShape)
+        self.assertEqual(nested.sAnd[0][0].path, EX + 'age')
+        self.assertIs(nested.sAnd[0][1], self.nodeShapes[EX + 'ContactShape'])
+
+        company = self.nodeShapes[EX + 'CompanyShape']
+        self.assertEqual(company.sNot[0].path, EX + 'age')
+        ceo, identifier = company.properties
+        self.assertEqual([shape.nodeKind for shape in ceo.sOr[0]],
+                         [str(SH.IRI), str(SH.BlankNode)])
+        self.assertEqual(len(identifier.sXone[0]), 2)
+
+    def testCycle(self):
+        with self.assertRaises(ShapeParserLimitError) as context:
+            ShapeParser().parseShape(path.join(self.dir, 'cycle.ttl'))
+        self.assertEqual(context.exception.limit, 'cycle')
+
+    def testNormalizer(self):
+        normalizer = ShapeNormalizer()
+        person = self.nodeShapes[EX + 'PersonShape']
+        effective = normalizer.effective(person)
+        self.assertIs(normalizer.effective(person), effective)
+
+        base = self.nodeShapes[EX + 'BaseShape']
+        contact = self.nodeShapes[EX + 'ContactShape']
+        nested = person.sAnd[0][1]
+        age = nested.sAnd[0][0]
+        self.assertEqual(effective.conjuncts, [person, base, nested, age, contact])
+        self.assertEqual([shape.path for shape in effective.properties],
+                         [EX + 'name', EX + 'age'])
+        self.assertEqual(effective.sOr, contact.sOr)
+        self.assertEqual(effective.sNot, [])
+
+        # the effective shapes of shared operands are computed once
+        company = normalizer.effective(self.nodeShapes[EX + 'CompanyShape'])
+        self.assertIs(normalizer.effective(base), normalizer.effective(base))
+        self.assertEqual(company.conjuncts[1], base)
+        self.assertEqual(len(normalizer.normalizeAll(self.nodeShapes)), 4)
+
+    def testValidation(self):
+        dataGraph = rdflib.Graph()
+        dataGraph.parse(path.join(self.dir, 'data.ttl'), format='turtle')
+        report = ShapeValidator(self.nodeShapes).validate(dataGraph)
+        results = sorted((str(result.focusNode), str(result.sourceConstraintComponent))
+                         for result in report.results)
+        self.assertEqual(results, [
+            (EX + 'bob', str(SH.AndConstraintComponent)),
+            (EX + 'bob', str(SH.OrConstraintComponent)),
+            (EX + 'initech', str(SH.NotConstraintComponent)),
+            (EX + 'initech', str(SH.OrConstraintComponent)),
+            (EX + 'initech', str(SH.XoneConstraintComponent)),
+        ])
+
+    def testRDForms(self):
+        serializer = RDFormsSerializer(self.nodeShapes)
+        bundles = {bundle.root: bundle for bundle in serializer.templateBundles}
+        # the fields of the sh:and operands
+        self.assertEqual([template.id for template in bundles[EX + 'PersonShape'].templates],
+                         [EX + 'name', EX + 'age'])
+
+    def testSnapshot(self):
+        fd, snapshotFile = tempfile.mkstemp(suffix='.snapshot')
+        os.close(fd)
+        try:
+            nodeShapes = ShapeParser().parseShape(path.join(self.dir, 'shapes.ttl'),
+                                                  detached=True)
+            ShapeSnapshotWriter().write(nodeShapes, snapshotFile)
+            with ShapeSnapshot(snapshotFile) as snapshot:
+                self.assertEqual(sorted(snapshot), sorted(nodeShapes))
+                person = snapshot[EX + 'PersonShape']
+                self.assertIs(person.sAnd[0][0], snapshot[EX + 'BaseShape'])
+                self.assertEqual(person.sAnd[0][1].sAnd[0][0].maxCount, 1)
+                company = snapshot[EX + 'CompanyShape']
+                self.assertEqual(company.sNot[0].path, EX + 'age')
+                self.assertEqual(len(company.properties[1].sXone[0]), 2)
+        finally:
+            os.remove(snapshotFile)
+
+
+if __name__ == '__main__':
+    unittest.main()
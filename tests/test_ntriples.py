@@ -0,0 +1,88 @@
+import unittest
+import gzip
+import shutil
+import tempfile
+from os import path
+import rdflib
+from context import ShacShifter
+from ShacShifter.NTriples import NTriplesError
+from ShacShifter.NTriplesLoader import NTriplesLoader
+from ShacShifter.ShapeDiff import ShapeDiff
+from ShacShifter.ShapeParser import ShapeParser
+
+EX = 'http://www.example.org/'
+DATA = """<http://www.example.org/alice> <http://www.example.org/name> "Alice" .
+<http://www.example.org/alice> <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> \
+<http://www.example.org/Person> .
+"""
+
+
+class NTriplesLoaderTests(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.shapesFile = path.abspath('tests/_files/logical/shapes.ttl')
+        graph = rdflib.Graph()
+        graph.parse(self.shapesFile, format='turtle')
+        self.triples = len(graph)
+        self.inputFile = path.join(self.dir, 'shapes.nt')
+        with open(self.inputFile, 'w', encoding='utf-8') as fp:
+            fp.write(graph.serialize(format='nt'))
+            fp.write(DATA)
+        self.expected = ShapeDiff.hashes(ShapeParser().parseShape(self.shapesFile))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def testChunks(self):
+        loader = NTriplesLoader(chunkBytes=100)
+        chunks = loader.chunks(self.inputFile)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(chunks[0][0], 0)
+        self.assertIsNone(chunks[-1][1])
+        with open(self.inputFile, 'rb') as fp:
+            content = fp.read()
+        for start, end in chunks:
+            # every chunk starts at the beginning of a line
+            self.assertEqual(content[start - 1:start], b'\n' if start else b'')
+        for (_, end), (start, _) in zip(chunks, chunks[1:]):
+            self.assertEqual(end, start)
+
+    def testRelevantOnly(self):
+        graph = rdflib.Graph()
+        loader = NTriplesLoader()
+        self.assertEqual(loader.load(self.inputFile, graph), self.triples)
+        self.assertEqual(loader.lines, self.triples + 2)
+        self.assertNotIn((rdflib.URIRef(EX + 'alice'), None, None), graph)
+
+        graph = rdflib.Graph()
+        NTriplesLoader(relevantOnly=False).load(self.inputFile, graph)
+        self.assertEqual(len(graph), self.triples + 2)
+        self.assertEqual(graph.value(rdflib.URIRef(EX + 'alice'), rdflib.URIRef(EX + 'name')),
+                         rdflib.Literal('Alice'))
+
+    def testParallel(self):
+        # blank nodes and lists span several chunks
+        loader = NTriplesLoader(jobs=3, chunkBytes=200)
+        parser = ShapeParser(loader=loader)
+        self.assertEqual(ShapeDiff.hashes(parser.parseShape(self.inputFile)), self.expected)
+        self.assertEqual(len(parser.g), self.triples)
+
+    def testCompressed(self):
+        compressedFile = self.inputFile + '.gz'
+        with open(self.inputFile, 'rb') as source, gzip.open(compressedFile, 'wb') as target:
+            shutil.copyfileobj(source, target)
+        loader = NTriplesLoader(jobs=2, chunkBytes=200)
+        self.assertEqual(loader.chunks(compressedFile), [(0, None)])
+        parser = ShapeParser(loader=loader)
+        self.assertEqual(ShapeDiff.hashes(parser.parseShape(compressedFile)), self.expected)
+
+    def testInvalidLine(self):
+        with open(self.inputFile, 'a', encoding='utf-8') as fp:
+            fp.write('<http://www.example.org/broken> .\n')
+        with self.assertRaises(NTriplesError):
+            NTriplesLoader(jobs=2, chunkBytes=200).load(self.inputFile, rdflib.Graph())
+
+
+if __name__ == '__main__':
+    unittest.main()
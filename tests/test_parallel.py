@@ -0,0 +1,48 @@
+import unittest
+from os import path
+import rdflib
+from context import ShacShifter
+from ShacShifter.ParallelValidator import ParallelValidator
+from ShacShifter.ShapeParser import ShapeParser
+from ShacShifter.ShapeValidator import ShapeValidator
+
+
+class ParallelValidatorTests(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = path.abspath('tests/_files/validation')
+        self.dataFile = path.join(self.dir, 'data.ttl')
+        self.nodeShapes = ShapeParser().parseShape(path.join(self.dir, 'shapes.ttl'))
+
+    def tearDown(self):
+        self.nodeShapes = None
+
+    def results(self, report):
+        # blank node labels differ between two parses of the data
+        return [(str(result.focusNode), str(result.sourceConstraintComponent),
+                 None if isinstance(result.value, rdflib.BNode) else str(result.value))
+                for result in report.results]
+
+    def testShards(self):
+        validator = ParallelValidator(self.nodeShapes, jobs=2, shardSize=2)
+        focusNodes = {uri: {rdflib.URIRef('http://ex.org/{}'.format(i)) for i in range(5)}
+                      for uri in self.nodeShapes}
+        shards = list(validator.shards(focusNodes))
+
+        self.assertEqual(len(shards), 3 * len(self.nodeShapes))
+        self.assertEqual([node for _, nodes in shards[:3] for node in nodes],
+                         sorted(focusNodes[shards[0][0]]))
+
+    def testSameReport(self):
+        dataGraph = rdflib.Graph().parse(self.dataFile, format='turtle')
+        expected = ShapeValidator(self.nodeShapes).validate(dataGraph)
+
+        for jobs in (1, 2):
+            report = ParallelValidator(self.nodeShapes, jobs=jobs, shardSize=1).validate(
+                self.dataFile)
+            self.assertEqual(self.results(report), self.results(expected))
+            self.assertFalse(report.conforms)
+
+
+if __name__ == '__main__':
+    unittest.main()
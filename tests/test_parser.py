@@ -7,6 +7,7 @@ from rdflib.namespace import XSD
 from ShacShifter.ShapeParser import ShapeParser
 from ShacShifter.modules.NodeShape import NodeShape
 from ShacShifter.modules.PropertyShape import PropertyShape
+from ShacShifter.modules.Term import Term
 
 
 class ShapeParserTests(unittest.TestCase):
@@ -94,6 +95,62 @@ class ShapeParserTests(unittest.TestCase):
                     self.assertFalse(propertyShape.isSet['qualifiedValueShapesDisjoint'])
                     self.assertEqual(propertyShape.maxCount, 5)
 
+    def testDetachedParse(self):
+        """Test that a detached parse result holds no rdflib terms."""
+        parser = ShapeParser()
+        nodeShapes = parser.parseShape(
+            path.join(self.w3c_test_files, 'InExampleShape.ttl'), detached=True)
+        propertyShape = nodeShapes[str(self.ex.InExampleShape)].properties[0]
+
+        self.assertEqual(len(parser.g), 0)
+        self.assertEqual(propertyShape.shIn, [Term.iri(self.ex.Pink), Term.iri(self.ex.Purple)])
+        for value in propertyShape.shIn:
+            self.assertIs(type(value), Term)
+            self.assertIs(type(value.value), str)
+
+        nodeShapes = ShapeParser().parseShape(
+            path.join(self.dir, 'complexPathExample.ttl'), detached=True)
+
+        def assertPlain(pathPart):
+            if isinstance(pathPart, dict):
+                for key, value in pathPart.items():
+                    self.assertIs(type(key), str)
+                    assertPlain(value)
+            elif isinstance(pathPart, list):
+                for value in pathPart:
+                    assertPlain(value)
+            else:
+                self.assertIs(type(pathPart), str)
+
+        for nodeShape in nodeShapes.values():
+            for propertyShape in nodeShape.properties:
+                assertPlain(propertyShape.path)
+
+    def testDetachedTerms(self):
+        """Test that detached sh:in and sh:hasValue values keep their kind and language."""
+        shapesFile = path.join(self.dir, 'termValuesExample.ttl')
+        parser = ShapeParser()
+        nodeShape = parser.parseShape(shapesFile)[str(self.ex.TermShape)]
+        expected = {str(p.path): (p.shIn, p.hasValue) for p in nodeShape.properties}
+        nodeShape = ShapeParser().parseShape(shapesFile, detached=True)[str(self.ex.TermShape)]
+        detached = {p.path: (p.shIn, p.hasValue) for p in nodeShape.properties}
+
+        shIn = detached[str(self.ex.color)][0]
+        self.assertEqual(shIn[:4], [
+            Term.iri(self.ex.A), Term.literal('A', lang='de'), Term.literal('A'),
+            Term.literal(self.ex.A)])
+        self.assertEqual(len(set(shIn)), 6)
+        self.assertEqual(shIn[4].datatype, str(XSD.integer))
+        # the detached values are the same rdflib terms
+        for uri, (expectedIn, expectedHasValue) in expected.items():
+            self.assertEqual([value.toTerm() for value in detached[uri][0]], expectedIn)
+            self.assertEqual(sorted(value.toTerm() for value in detached[uri][1]),
+                             sorted(expectedHasValue))
+            for value in detached[uri][0] + detached[uri][1]:
+                self.assertEqual(Term.fromTerm(value.toTerm()), value)
+        # language tags compare case insensitively
+        self.assertIn(Term.literal('Tag', lang='en'), detached[str(self.ex.tag)][1])
+
     def testMinMaxLogic(self):
         with self.assertRaises(Exception):
             ShapeParser().parseShape(path.join(self.dir, 'minGreaterMax.ttl'))
@@ -0,0 +1,62 @@
+import unittest
+import rdflib
+from context import ShacShifter
+from ShacShifter.PathEvaluator import PathEvaluator, SH
+
+
+class PathEvaluatorTests(unittest.TestCase):
+
+    ex = rdflib.Namespace('http://www.example.org/')
+    skos = rdflib.Namespace('http://www.w3.org/2004/02/skos/core#')
+
+    def setUp(self):
+        ex = self.ex
+        broader = str(self.skos.broader)
+        self.broader = broader
+        self.g = rdflib.Graph()
+        # a -> b -> c -> d -> b (cycle), e -> a
+        for s, o in [(ex.a, ex.b), (ex.b, ex.c), (ex.c, ex.d), (ex.d, ex.b), (ex.e, ex.a)]:
+            self.g.add((s, self.skos.broader, o))
+        self.g.add((ex.a, ex.name, rdflib.Literal('A')))
+        self.g.add((ex.b, rdflib.RDFS.label, rdflib.Literal('B')))
+        self.evaluator = PathEvaluator(self.g)
+
+    def testPredicateAndInverse(self):
+        ex = self.ex
+        self.assertEqual(self.evaluator.values(ex.a, self.broader), {ex.b})
+        self.assertEqual(self.evaluator.values(ex.b, {SH.inversePath: self.broader}),
+                         {ex.a, ex.d})
+
+    def testClosures(self):
+        ex = self.ex
+        oneOrMore = {SH.oneOrMorePath: self.broader}
+        zeroOrMore = {SH.zeroOrMorePath: self.broader}
+        zeroOrOne = {SH.zeroOrOnePath: self.broader}
+
+        result = self.evaluator.evaluate(oneOrMore, [ex.a, ex.e, ex.d])
+        self.assertEqual(result[ex.a], {ex.b, ex.c, ex.d})
+        self.assertEqual(result[ex.e], {ex.a, ex.b, ex.c, ex.d})
+        self.assertEqual(result[ex.d], {ex.b, ex.c, ex.d})
+        self.assertEqual(self.evaluator.values(ex.a, zeroOrMore), {ex.a, ex.b, ex.c, ex.d})
+        self.assertEqual(self.evaluator.values(ex.c, zeroOrOne), {ex.c, ex.d})
+        self.assertEqual(self.evaluator.values(ex.b, {SH.inversePath: oneOrMore}),
+                         {ex.a, ex.b, ex.c, ex.d, ex.e})
+
+    def testSequenceAndAlternative(self):
+        ex = self.ex
+        path = [self.broader, {SH.alternativePath: [str(ex.name), str(rdflib.RDFS.label)]}]
+        result = self.evaluator.evaluate(path, [ex.a, ex.e, ex.d])
+        self.assertEqual(result[ex.a], {rdflib.Literal('B')})
+        self.assertEqual(result[ex.e], {rdflib.Literal('A')})
+        self.assertEqual(result[ex.d], {rdflib.Literal('B')})
+        self.assertEqual(self.evaluator.values(ex.b, {SH.inversePath: path}), set())
+        self.assertEqual(
+            self.evaluator.values(rdflib.Literal('B'), {SH.inversePath: path}), {ex.a, ex.d})
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+import unittest
+import re
+from context import ShacShifter
+from ShacShifter.PatternRegistry import Pattern, PatternRegistry
+from ShacShifter.Profiler import Profiler
+
+
+class PatternRegistryTests(unittest.TestCase):
+
+    values = ['', 'abc', 'abc\n', 'xabc', 'abcx', 'a.c', 'ABC', 'http://example.org/a',
+              'a$', '^abc']
+
+    def testKinds(self):
+        for pattern, kind, literal in [
+                ('^abc$', 'equals', 'abc'),
+                ('^http://example\\.org/', 'prefix', 'http://example.org/'),
+                ('abc$', 'suffix', 'abc'),
+                ('abc', 'contains', 'abc'),
+                ('a\\$', 'contains', 'a$'),
+                ('^\\d{3}$', 'regex', None),
+                ('a.c', 'regex', None),
+                ('^a|b$', 'regex', None)]:
+            self.assertEqual(Pattern.analyze(pattern, ''), (kind, literal), pattern)
+        self.assertEqual(Pattern.analyze('a.c', 'q'), ('contains', 'a.c'))
+        self.assertEqual(Pattern.analyze('abc', 'i'), ('regex', None))
+
+    def testSameAsRegex(self):
+        for pattern in ['^abc$', '^abc', 'abc$', 'abc', 'a\\.c', '^a\\$', '^$', '', 'a.c',
+                        '^\\^abc', '^http://example\\.org/']:
+            compiled = Pattern(pattern)
+            for value in self.values:
+                self.assertEqual(compiled.search(value), re.search(pattern, value) is not None,
+                                 (pattern, value))
+
+    def testFlags(self):
+        registry = PatternRegistry()
+        self.assertTrue(registry.get('^abc$', 'i').search('ABC'))
+        self.assertFalse(registry.get('^abc$', '').search('ABC'))
+        self.assertTrue(registry.get('a.c', 'q').search('xa.cx'))
+        self.assertFalse(registry.get('a.c', 'q').search('abc'))
+        self.assertTrue(registry.get('A.C', 'qi').search('a.c'))
+        self.assertTrue(registry.get('a b c', 'x').search('abc'))
+
+    def testCache(self):
+        registry = PatternRegistry()
+        first = registry.get('^\\d+$', 'im')
+        self.assertIs(registry.get('^\\d+$', 'mi'), first)
+        self.assertIsNot(registry.get('^\\d+$'), first)
+        self.assertEqual(len(registry), 2)
+        self.assertEqual(first.uses, 2)
+
+    def testStats(self):
+        registry = PatternRegistry(timed=True)
+        slow = registry.get('^(a+)+$')
+        fast = registry.get('^abc$')
+        slow.search('a' * 18 + 'b')
+        fast.search('abc')
+        fast.search('abd')
+
+        stats = registry.stats()
+        self.assertEqual(stats[0]['pattern'], '^(a+)+$')
+        self.assertEqual(stats[0]['kind'], 'regex')
+        self.assertEqual(stats[1]['calls'], 2)
+        self.assertGreater(stats[0]['maxSeconds'], stats[1]['maxSeconds'])
+
+        profiler = Profiler()
+        profiler.addSection('patterns', stats)
+        self.assertEqual(profiler.report()['patterns'], stats)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import unittest
+import contextlib
+import threading
+from os import path
+from context import ShacShifter
+from ShacShifter.ShapeDiff import ShapeDiff
+from ShacShifter.ShapeParser import ShapeParser
+from ShacShifter.ShapeParserPool import ShapeParserPool
+
+FILES = ['tests/_files/stats/shapes.ttl', 'tests/_files/stats/simple.ttl',
+         'tests/_files/logical/shapes.ttl', 'tests/_files/wisski/shapes.ttl',
+         'tests/_files/example_shapes_graph.ttl']
+
+
+class ShapeParserPoolTests(unittest.TestCase):
+
+    def setUp(self):
+        self.files = [path.abspath(name) for name in FILES]
+        self.expected = {name: ShapeDiff.hashes(ShapeParser().parseShape(name, detached=True))
+                         for name in self.files}
+
+    def testReuse(self):
+        parser = ShapeParser()
+        first = parser.parseShape(self.files[0])
+        second = parser.parseShape(self.files[1])
+        # the second parse does not see the triples or shapes of the first
+        self.assertEqual(ShapeDiff.hashes(second), self.expected[self.files[1]])
+        self.assertEqual(len(parser.g), len(ShapeParser().loadGraph(self.files[1])))
+        # and does not change the result of the first
+        self.assertEqual(ShapeDiff.hashes(first), ShapeDiff.hashes(
+            ShapeParser().parseShape(self.files[0])))
+
+    def testCheckout(self):
+        pool = ShapeParserPool(size=2)
+        with pool.parser() as parser:
+            nodeShapes = parser.parseShape(self.files[1])
+            labels = parser.labels
+            with pool.parser():
+                with self.assertRaises(Exception):
+                    with pool.parser(timeout=0.01):
+                        pass
+        # returned parsers are reset, earlier results are kept
+        self.assertEqual(len(parser.g), 0)
+        self.assertIsNot(parser.labels, labels)
+        self.assertEqual(ShapeDiff.hashes(nodeShapes), self.expected[self.files[1]])
+        with pool.parser(timeout=0.01) as again:
+            self.assertIs(again, parser)
+
+    @staticmethod
+    def shapeLabels(parser):
+        return {uri: parser.labels.forResource(uri) for uri in parser.nodeShapes}
+
+    def testConcurrentResults(self):
+        pool = ShapeParserPool(size=4)
+        expected = {}
+        for name in self.files[:4]:
+            parser = ShapeParser()
+            nodeShapes = parser.parseShape(name)
+            expected[name] = (ShapeDiff.hashes(nodeShapes), self.shapeLabels(parser),
+                              len(parser.g))
+        barrier = threading.Barrier(4)
+        results = {}
+        errors = []
+
+        def work(name):
+            try:
+                with pool.parser() as parser:
+                    # all four parsers are checked out before any of them parses
+                    barrier.wait(timeout=10)
+                    nodeShapes = parser.parseShape(name)
+                    barrier.wait(timeout=10)
+                    # the other parses did not change the graph, shapes or labels
+                    results[name] = (id(parser), ShapeDiff.hashes(nodeShapes),
+                                     self.shapeLabels(parser), len(parser.g))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(name,)) for name in expected]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        # every thread had a parser of its own
+        self.assertEqual(len({result[0] for result in results.values()}), 4)
+        self.assertEqual({name: result[1:] for name, result in results.items()}, expected)
+
+    def testHammer(self):
+        pool = ShapeParserPool(size=4)
+        lock = threading.Lock()
+        active = [0, 0]
+        errors = []
+        original = pool.parser
+
+        @contextlib.contextmanager
+        def parser(timeout=None):
+            # count the parsers in use while they are checked out
+            with original(timeout) as checkedOut:
+                with lock:
+                    active[0] += 1
+                    active[1] = max(active[1], active[0])
+                try:
+                    yield checkedOut
+                finally:
+                    with lock:
+                        active[0] -= 1
+        pool.parser = parser
+
+        def work(offset):
+            try:
+                for n in range(10):
+                    name = self.files[(offset + n) % len(self.files)]
+                    result = ShapeDiff.hashes(pool.parseShape(name))
+                    if result != self.expected[name]:
+                        errors.append((name, result))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(n,)) for n in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(active[1], 4)
+        self.assertEqual(pool.parsers.qsize(), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
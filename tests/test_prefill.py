@@ -0,0 +1,86 @@
+import unittest
+import json
+import os
+import tempfile
+from os import path
+import rdflib
+from context import ShacShifter
+from ShacShifter.FormPrefiller import FormPrefiller, termJson
+from ShacShifter.Profiler import Profiler, CountingGraph
+from ShacShifter.RDFormsSerializer import RDFormsSerializer
+from ShacShifter.ShapeParser import ShapeParser
+
+
+class FormPrefillerTests(unittest.TestCase):
+
+    ex = rdflib.Namespace('http://www.example.org/')
+
+    def setUp(self):
+        self.dir = path.abspath('tests/_files/validation')
+        self.dataGraph = rdflib.Graph().parse(path.join(self.dir, 'data.ttl'), format='turtle')
+        self.nodeShapes = ShapeParser().parseShape(path.join(self.dir, 'shapes.ttl'))
+
+    def tearDown(self):
+        self.dataGraph = None
+        self.nodeShapes = None
+
+    def testTermJson(self):
+        self.assertEqual(termJson(rdflib.Literal('Bob', lang='en')),
+                         {'type': 'literal', 'value': 'Bob', 'lang': 'en'})
+        self.assertEqual(termJson(rdflib.Literal(42)), {
+            'type': 'literal', 'value': '42',
+            'datatype': 'http://www.w3.org/2001/XMLSchema#integer'})
+        self.assertEqual(termJson(self.ex.Alice), {'type': 'uri', 'value': str(self.ex.Alice)})
+        self.assertEqual(termJson(rdflib.BNode('b1')), {'type': 'bnode', 'value': '_:b1'})
+
+    def testForms(self):
+        forms = {(form['template'], form['resource']): form
+                 for form in FormPrefiller(self.nodeShapes, self.dataGraph).forms()}
+
+        self.assertEqual(sorted(forms), [
+            (str(self.ex.BossShape), str(self.ex.Alice)),
+            (str(self.ex.PersonShape), str(self.ex.Alice)),
+            (str(self.ex.PersonShape), str(self.ex.Bob))])
+        boss = forms[(str(self.ex.BossShape), str(self.ex.Alice))]
+        self.assertEqual(boss['label'], {'en': 'Edit Instance of: ' + str(self.ex.Alice)})
+        self.assertEqual(boss['graph'], {str(self.ex.Alice): {
+            str(self.ex.role): [{'type': 'uri', 'value': str(self.ex.Boss)}]}})
+        bob = forms[(str(self.ex.PersonShape), str(self.ex.Bob))]['graph'][str(self.ex.Bob)]
+        self.assertEqual(sorted(value['value'] for value in bob[str(self.ex.ssn)]),
+                         ['12-345-6789', '987-65-4321'])
+        self.assertNotIn(str(self.ex.role), bob)
+
+    def testOneLookupPerProperty(self):
+        profiler = Profiler()
+        prefiller = FormPrefiller(self.nodeShapes, CountingGraph(self.dataGraph, profiler))
+        before = profiler.counters.get('graphLookups', 0)
+        list(prefiller.forms())
+
+        self.assertEqual(profiler.counters['graphLookups'] - before,
+                         len(prefiller.predicates()))
+
+    def testSerializer(self):
+        outputfile = tempfile.mkstemp(suffix='.json')[1]
+        try:
+            serializer = RDFormsSerializer(self.nodeShapes, outputfile)
+            serializer.write(self.dataGraph)
+            with open(outputfile) as fp:
+                content = fp.read()
+        finally:
+            os.remove(outputfile)
+
+        decoder = json.JSONDecoder()
+        documents = []
+        position = 0
+        while content[position:].strip():
+            document, position = decoder.raw_decode(content, position)
+            documents.append(document)
+            while position < len(content) and content[position].isspace():
+                position += 1
+        self.assertEqual(len(documents), len(self.nodeShapes) + 3)
+        self.assertEqual(sorted(document['resource'] for document in documents[-3:]),
+                         [str(self.ex.Alice), str(self.ex.Alice), str(self.ex.Bob)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+import importlib
+import json
+import os
+import tempfile
+from os import path
+from context import ShacShifter
+from ShacShifter.ShacShifter import ShacShifter as Shifter
+from ShacShifter.ShapeParser import ShapeParser
+from ShacShifter.Profiler import Profiler, NullProfiler
+
+# the package exports the class Profiler under the name of its module
+ProfilerModule = importlib.import_module('ShacShifter.Profiler')
+
+
+class ProfilerTests(unittest.TestCase):
+
+    w3c_test_files = 'tests/_files/w3c'
+
+    def testParserPhasesAndCounters(self):
+        profiler = Profiler()
+        ShapeParser(profiler=profiler).parseShape(
+            path.join(self.w3c_test_files, 'AddressShape.ttl'))
+        report = profiler.report()
+
+        for phase in ['load', 'discovery', 'extraction', 'propertyShape', 'path']:
+            self.assertIn(phase, report['phases'])
+            self.assertGreaterEqual(report['phases'][phase]['wall'], 0)
+            self.assertIn('cpu', report['phases'][phase])
+        self.assertEqual(report['counters']['nodeShapes'], 2)
+        self.assertEqual(report['counters']['propertyShapes'], 2)
+        self.assertGreater(report['counters']['triplesLoaded'], 0)
+        self.assertGreater(report['counters']['graphLookups'], 0)
+
+    def testMemoryPeakAndHooks(self):
+        profiler = Profiler(traceMemory=True)
+        reports = []
+        profiler.addHook(reports.append)
+
+        with profiler.phase('outer'):
+            with profiler.phase('inner'):
+                data = [0] * 100000
+            del data
+
+        profiler.publish()
+        self.assertEqual(len(reports), 1)
+        phases = reports[0]['phases']
+        self.assertGreater(phases['inner']['peakMemory'], 0)
+        self.assertGreaterEqual(phases['outer']['peakMemory'], phases['inner']['peakMemory'])
+
+    def testMemoryWithoutResetPeak(self):
+        # Python < 3.9 has no tracemalloc.reset_peak()
+        resetPeak = ProfilerModule.RESET_PEAK
+        ProfilerModule.RESET_PEAK = False
+        try:
+            profiler = Profiler(traceMemory=True)
+            with profiler.phase('outer'):
+                with profiler.phase('inner'):
+                    data = [0] * 100000
+                del data
+        finally:
+            ProfilerModule.RESET_PEAK = resetPeak
+
+        phases = profiler.report()['phases']
+        self.assertGreater(phases['inner']['peakMemory'], 800000)
+        self.assertGreaterEqual(phases['outer']['peakMemory'], phases['inner']['peakMemory'])
+
+    def testShiftWritesBytesCounter(self):
+        profiler = Profiler()
+        fd, output = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            Shifter().shift(
+                path.join(self.w3c_test_files, 'AddressShape.ttl'), output, 'rdforms',
+                profiler=profiler)
+        finally:
+            os.remove(output)
+
+        report = json.loads(profiler.toJson())
+        self.assertIn('serialize', report['phases'])
+        self.assertIn('write', report['phases'])
+        self.assertGreater(report['counters']['bytesWritten'], 0)
+
+    def testShiftHTMLWritesBytesCounter(self):
+        profiler = Profiler()
+        fd, output = tempfile.mkstemp(suffix='.html')
+        os.close(fd)
+        try:
+            Shifter().shift(
+                path.join(self.w3c_test_files, 'AddressShape.ttl'), output, 'html',
+                profiler=profiler)
+            size = os.path.getsize(output)
+        finally:
+            os.remove(output)
+
+        report = profiler.report()
+        self.assertIn('serialize', report['phases'])
+        self.assertIn('write', report['phases'])
+        self.assertEqual(report['counters']['bytesWritten'], size)
+
+    def testNullProfiler(self):
+        profiler = NullProfiler()
+        with profiler.phase('load'):
+            profiler.count('triplesLoaded', 10)
+        self.assertEqual(profiler.report(), {'phases': {}, 'counters': {}})
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+import unittest
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from os import path
+from context import ShacShifter
+from ShacShifter.RDFormsSerializer import RDFormsSerializer
+from ShacShifter.ShacShifter import ShacShifter
+from ShacShifter.ShapeParser import ShapeParser
+
+EX = 'http://www.example.org/'
+
+
+class ShardedOutputTests(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = path.abspath('tests/_files/diff')
+        self.output = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output)
+
+    def writeShards(self, fileName, compress=False):
+        nodeShapes = ShapeParser().parseShape(path.join(self.dir, fileName))
+        return RDFormsSerializer(nodeShapes).writeShards(self.output, compress)
+
+    def readShard(self, entry, compress=False):
+        opener = gzip.open if compress else open
+        with opener(path.join(self.output, entry['file']), 'rb') as fp:
+            return json.loads(fp.read().decode('utf-8'))
+
+    def testManifest(self):
+        manifest = self.writeShards('old.ttl')
+        self.assertEqual(sorted(manifest['shapes']), [
+            EX + 'CompanyShape', EX + 'PersonShape', EX + 'ProductShape'])
+        self.assertEqual(sorted(manifest['targetClasses']), [
+            EX + 'Company', EX + 'Organization', EX + 'Person', EX + 'Product'])
+        company = manifest['shapes'][EX + 'CompanyShape']
+        self.assertEqual(manifest['targetClasses'][EX + 'Organization'],
+                         [dict(company, shape=EX + 'CompanyShape')])
+        self.assertEqual(company['size'], os.path.getsize(path.join(self.output, company['file'])))
+        self.assertTrue(company['file'].startswith(company['hash'][:20]))
+        self.assertEqual(self.readShard(company)['root'], EX + 'CompanyShape')
+
+        with open(path.join(self.output, 'manifest.json')) as fp:
+            self.assertEqual(json.load(fp), manifest)
+        self.assertEqual(len(os.listdir(self.output)), 4)
+
+    def testUnchangedFilesAreKept(self):
+        old = self.writeShards('old.ttl')
+        company = path.join(self.output, old['shapes'][EX + 'CompanyShape']['file'])
+        product = path.join(self.output, old['shapes'][EX + 'ProductShape']['file'])
+        os.utime(company, (0, 0))
+        os.utime(path.join(self.output, 'manifest.json'), (0, 0))
+
+        # nothing changed, so neither the files nor the manifest are written again
+        self.assertEqual(self.writeShards('old.ttl'), old)
+        self.assertEqual(os.stat(company).st_mtime, 0)
+        self.assertEqual(os.stat(path.join(self.output, 'manifest.json')).st_mtime, 0)
+
+        new = self.writeShards('new.ttl')
+        self.assertNotEqual(new['shapes'][EX + 'PersonShape'], old['shapes'][EX + 'PersonShape'])
+        self.assertIn(EX + 'OfferShape', new['shapes'])
+        self.assertFalse(path.exists(product))
+        self.assertEqual(len(os.listdir(self.output)), 4)
+
+    def testCompression(self):
+        manifest = self.writeShards('old.ttl', compress=True)
+        self.assertEqual(manifest['compression'], 'gzip')
+        person = manifest['shapes'][EX + 'PersonShape']
+        self.assertTrue(person['file'].endswith('.json.gz'))
+        self.assertEqual(self.readShard(person, compress=True)['root'], EX + 'PersonShape')
+
+        # compressed files are reproducible and the plain files of earlier runs are removed
+        with open(path.join(self.output, person['file']), 'rb') as fp:
+            content = fp.read()
+        os.remove(path.join(self.output, person['file']))
+        self.writeShards('old.ttl')
+        manifest = self.writeShards('old.ttl', compress=True)
+        with open(path.join(self.output, person['file']), 'rb') as fp:
+            self.assertEqual(fp.read(), content)
+        self.assertTrue(all(name.endswith('.gz') for name in os.listdir(self.output)
+                            if name != 'manifest.json'))
+
+    def testShift(self):
+        ShacShifter().shift(path.join(self.dir, 'new.ttl'), self.output, 'rdforms',
+                            shards=True, compress=True)
+        with open(path.join(self.output, 'manifest.json')) as fp:
+            manifest = json.load(fp)
+        self.assertEqual(sorted(manifest['shapes']), [
+            EX + 'CompanyShape', EX + 'OfferShape', EX + 'PersonShape'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+import os
+import tempfile
+from os import path
+from context import ShacShifter
+from ShacShifter.ShapeParser import ShapeParser
+from ShacShifter.ShapeSnapshot import ShapeSnapshot, ShapeSnapshotWriter, ShapeSnapshotError
+from ShacShifter.modules.PropertyShape import PropertyShape
+from ShacShifter.modules.Term import Term
+
+EX = 'http://www.example.org/'
+XSD = 'http://www.w3.org/2001/XMLSchema#'
+
+
+class ShapeSnapshotTests(unittest.TestCase):
+
+    w3c_test_files = 'tests/_files/w3c'
+
+    def setUp(self):
+        fd, self.snapshotFile = tempfile.mkstemp(suffix='.snapshot')
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.snapshotFile)
+
+    def assertShapesEqual(self, expected, actual):
+        expected = dict(vars(expected))
+        actual = dict(vars(actual))
+        for key in ['properties', 'qualifiedValueShape']:
+            expectedValue = expected.pop(key, None)
+            actualValue = actual.pop(key, None)
+            if isinstance(expectedValue, list):
+                self.assertEqual(len(expectedValue), len(actualValue))
+                for expectedShape, actualShape in zip(expectedValue, actualValue):
+                    self.assertShapesEqual(expectedShape, actualShape)
+            elif isinstance(expectedValue, PropertyShape):
+                self.assertShapesEqual(expectedValue, actualValue)
+            else:
+                self.assertEqual(expectedValue, actualValue)
+        for key in ['sAnd', 'sOr', 'sXone', 'sNot']:
+            expectedValue = expected.pop(key, [])
+            actualValue = actual.pop(key, [])
+            self.assertEqual(len(expectedValue), len(actualValue))
+            for expectedShapes, actualShapes in zip(expectedValue, actualValue):
+                if not isinstance(expectedShapes, list):
+                    expectedShapes, actualShapes = [expectedShapes], [actualShapes]
+                self.assertEqual(len(expectedShapes), len(actualShapes))
+                for expectedShape, actualShape in zip(expectedShapes, actualShapes):
+                    self.assertShapesEqual(expectedShape, actualShape)
+        self.assertEqual(expected, actual)
+
+    def testRoundTripOfAllFiles(self):
+        """Test that every W3C sample survives writing and loading a snapshot."""
+        for f in sorted(os.listdir(self.w3c_test_files)):
+            nodeShapes = ShapeParser().parseShape(
+                path.join(self.w3c_test_files, f), detached=True)
+            ShapeSnapshotWriter().write(nodeShapes, self.snapshotFile)
+
+            with ShapeSnapshot(self.snapshotFile) as snapshot:
+                self.assertEqual(sorted(snapshot), sorted(nodeShapes))
+                for uri, nodeShape in nodeShapes.items():
+                    self.assertShapesEqual(nodeShape, snapshot[uri])
+
+    def testTypedRangeBounds(self):
+        nodeShapes = ShapeParser().parseShape('tests/_files/validation/ranges.ttl', detached=True)
+        ShapeSnapshotWriter().write(nodeShapes, self.snapshotFile)
+
+        with ShapeSnapshot(self.snapshotFile) as snapshot:
+            for uri, nodeShape in nodeShapes.items():
+                # decimal and date bounds keep their type
+                self.assertShapesEqual(nodeShape, snapshot[uri])
+
+    def testTermValues(self):
+        nodeShapes = ShapeParser().parseShape('tests/_files/termValuesExample.ttl',
+                                              detached=True)
+        ShapeSnapshotWriter().write(nodeShapes, self.snapshotFile)
+
+        with ShapeSnapshot(self.snapshotFile) as snapshot:
+            for uri, nodeShape in nodeShapes.items():
+                # IRIs and literals with the same text, languages and datatypes are kept
+                self.assertShapesEqual(nodeShape, snapshot[uri])
+            values = [value for propertyShape in snapshot[EX + 'TermShape'].properties
+                      for value in propertyShape.shIn + propertyShape.hasValue]
+        self.assertIn(Term.iri(EX + 'A'), values)
+        self.assertIn(Term.literal(EX + 'A'), values)
+        self.assertIn(Term.literal('A', lang='de'), values)
+        self.assertIn(Term.literal('1.50', datatype=XSD + 'decimal'), values)
+
+    def testLazyMaterialization(self):
+        nodeShapes = ShapeParser().parseShape(
+            path.join(self.w3c_test_files, 'AddressShape.ttl'))
+        ShapeSnapshotWriter().write(nodeShapes, self.snapshotFile)
+
+        with ShapeSnapshot(self.snapshotFile) as snapshot:
+            self.assertEqual(len(snapshot), 2)
+            self.assertEqual(snapshot.nodeShapes, {})
+            addressShape = snapshot['http://www.example.org/AddressShape']
+            self.assertEqual(len(snapshot.nodeShapes), 1)
+            self.assertIs(addressShape, snapshot['http://www.example.org/AddressShape'])
+            self.assertEqual(addressShape.properties[0].maxCount, 1)
+            self.assertEqual(len(snapshot.materializeAll()), 2)
+
+    def testInvalidFile(self):
+        with open(self.snapshotFile, 'wb') as fp:
+            fp.write(b'no snapshot at all, but long enough to hold a header' * 4)
+        with self.assertRaises(ShapeSnapshotError):
+            ShapeSnapshot(self.snapshotFile)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+import unittest
+import json
+import os
+import tempfile
+from os import path
+from context import ShacShifter
+from ShacShifter.ShacShifter import ShacShifter
+from ShacShifter.HTMLSerializer import HTMLSerializer
+from ShacShifter.JSONSchemaSerializer import JSONSchemaSerializer
+from ShacShifter.RDFormsSerializer import RDFormsSerializer
+from ShacShifter.ShapeParser import ShapeParser
+from ShacShifter.ShapeStatistics import ShapeStatistics, distribution
+from ShacShifter.WisskiSerializer import WisskiSerializer
+
+
+class ShapeStatisticsTests(unittest.TestCase):
+
+    def setUp(self):
+        self.shapesFile = path.abspath('tests/_files/stats/shapes.ttl')
+        self.simpleFile = path.abspath('tests/_files/stats/simple.ttl')
+        fd, self.outputfile = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.outputfile)
+
+    def collect(self, inputFilePath, **kwargs):
+        parser = ShapeParser()
+        parser.loadGraph(inputFilePath)
+        return parser, ShapeStatistics(parser, **kwargs).collect()
+
+    def testCounts(self):
+        parser, stats = self.collect(self.shapesFile, sampleSize=0)
+        self.assertEqual(stats['nodeShapes'], len(parser.getNodeShapeUris()))
+        self.assertEqual(stats['nodeShapes'], 3)
+        self.assertEqual(stats['propertyShapes'],
+                         {'count': 7, 'standalone': 1, 'references': 8, 'malformed': 0})
+        # ex:name is used by all three node shapes
+        self.assertEqual(stats['fanOut']['shared'], 1)
+        self.assertEqual(stats['fanOut']['max'], 3)
+        self.assertEqual(stats['propertiesPerShape']['max'], 4)
+        # nothing is extracted
+        self.assertEqual(parser.nodeShapes, {})
+        self.assertEqual(stats['estimatedBytes'],
+                         {'rdforms': 0, 'html': 0, 'wisski': 0, 'jsonschema': 0})
+
+    def testPathsListsAndCardinalities(self):
+        parser, stats = self.collect(self.shapesFile, sampleSize=0)
+        # inversePath of zeroOrMorePath
+        self.assertEqual(stats['pathDepth']['max'], 3)
+        self.assertEqual(stats['pathDepth']['count'], 7)
+        self.assertEqual(stats['shIn']['histogram'], {'1': 1, '2-3': 1, '4-7': 1})
+        self.assertEqual(stats['cardinality'],
+                         {'maxMinCount': 2, 'maxMaxCount': 3, 'unbounded': 4, 'malformed': 0})
+
+    def testMalformedCounts(self):
+        # the parser rejects the counts and the cyclic lists, the statistics skip them
+        parser, stats = self.collect(path.abspath('tests/_files/stats/malformed.ttl'))
+        # a malformed sh:maxCount is not unbounded
+        self.assertEqual(stats['cardinality'],
+                         {'maxMinCount': 0, 'maxMaxCount': 2, 'unbounded': 2, 'malformed': 2})
+        self.assertEqual(stats['propertyShapes']['count'], 4)
+        # the cyclic sh:in list and the cyclic sequence path
+        self.assertEqual(stats['propertyShapes']['malformed'], 2)
+        self.assertEqual(stats['shIn']['count'], 0)
+        self.assertEqual(stats['pathDepth']['count'], 3)
+        self.assertEqual(stats['estimatedBytes'],
+                         {'rdforms': None, 'html': None, 'wisski': None, 'jsonschema': None})
+
+    def testNodeReferences(self):
+        parser, stats = self.collect(self.shapesFile, sampleSize=0)
+        # Person -> Address -> City, Person -> Person is a cycle
+        self.assertEqual(stats['nodeReferences'], {'count': 3, 'maxDepth': 2, 'cycles': 1})
+
+    def testDistribution(self):
+        self.assertEqual(distribution([]), {'count': 0, 'min': 0, 'max': 0, 'mean': 0,
+                                            'histogram': {}})
+        result = distribution([0, 1, 2, 3, 4, 9])
+        self.assertEqual(result['histogram'], {'0': 1, '1': 1, '2-3': 2, '4-7': 1, '8-15': 1})
+        self.assertEqual(result['mean'], 3.17)
+
+    def testEstimates(self):
+        parser, stats = self.collect(self.simpleFile)
+        nodeShapes = ShapeParser().parseShape(self.simpleFile)
+        rdforms = RDFormsSerializer(nodeShapes)
+        self.assertEqual(stats['estimatedBytes']['rdforms'],
+                         sum(len(bundle.toJson()) + 1 for bundle in rdforms.templateBundles))
+        HTMLSerializer(nodeShapes, self.outputfile)
+        self.assertEqual(stats['estimatedBytes']['html'], os.path.getsize(self.outputfile))
+        WisskiSerializer(nodeShapes, self.outputfile).write()
+        self.assertEqual(stats['estimatedBytes']['wisski'], os.path.getsize(self.outputfile))
+        JSONSchemaSerializer(nodeShapes, self.outputfile).write()
+        self.assertEqual(stats['estimatedBytes']['jsonschema'],
+                         os.path.getsize(self.outputfile))
+
+        # a sample of one shape is scaled to all shapes
+        parser, stats = self.collect(self.simpleFile, sampleSize=1)
+        for size in stats['estimatedBytes'].values():
+            self.assertGreater(size, 0)
+        # a format that fails on the sample is not estimated
+        parser, stats = self.collect(self.shapesFile)
+        self.assertIsNone(stats['estimatedBytes']['rdforms'])
+        self.assertGreater(stats['estimatedBytes']['wisski'], 0)
+        # the labels of the parser are not changed by the estimation
+        self.assertEqual(parser.labels.labels, {})
+
+    def testShift(self):
+        ShacShifter().shift(self.shapesFile, self.outputfile, None, stats=True)
+        with open(self.outputfile) as fp:
+            stats = json.load(fp)
+        self.assertEqual(stats['nodeShapes'], 3)
+        self.assertEqual(stats['triples'], 58)
+
+
+if __name__ == '__main__':
+    unittest.main()
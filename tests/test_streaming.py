@@ -0,0 +1,113 @@
+import unittest
+import gzip
+import os
+import shutil
+import tempfile
+from os import path
+import rdflib
+from context import ShacShifter
+from ShacShifter.NTriples import parseLine, subjectKey, NTriplesError
+from ShacShifter.ShapeParser import ShapeParser
+from ShacShifter.ShapeValidator import ShapeValidator, SH
+from ShacShifter.StreamingValidator import StreamingValidator, SubjectGrouper
+
+
+class StreamingValidatorTests(unittest.TestCase):
+
+    ex = rdflib.Namespace('http://www.example.org/')
+
+    def setUp(self):
+        self.dir = path.abspath('tests/_files/validation')
+        self.tmp = tempfile.mkdtemp()
+        self.dataGraph = rdflib.Graph().parse(path.join(self.dir, 'data.ttl'), format='turtle')
+        self.dataFile = path.join(self.tmp, 'data.nt')
+        self.dataGraph.serialize(destination=self.dataFile, format="nt", encoding="utf-8")
+        self.nodeShapes = ShapeParser().parseShape(path.join(self.dir, 'shapes.ttl'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+        self.dataGraph = None
+        self.nodeShapes = None
+
+    def violations(self, results):
+        return sorted(
+            (str(result.focusNode), str(result.sourceConstraintComponent).rsplit('#', 1)[-1])
+            for result in results)
+
+    def testParseLine(self):
+        s, p, o = parseLine('<http://a> <http://p> "x\\"y"@en-GB .\n')
+        self.assertEqual(s, rdflib.URIRef('http://a'))
+        self.assertEqual(o, rdflib.Literal('x"y', lang='en-GB'))
+        s, p, o = parseLine('_:b1 <http://p> "1"^^<http://www.w3.org/2001/XMLSchema#int> .')
+        self.assertEqual(s, rdflib.BNode('b1'))
+        self.assertEqual(o.toPython(), 1)
+        self.assertIsNone(parseLine('# comment'))
+        self.assertIsNone(parseLine('   '))
+        self.assertEqual(subjectKey('<http://a> <http://p> <http://o> .'), '<http://a>')
+        self.assertEqual(subjectKey('<http://\\u0061><http://p>"o" .'), '<http://a>')
+        self.assertEqual(subjectKey('_:b1<http://p><http://o>.'), '_:b1')
+        with self.assertRaises(NTriplesError):
+            parseLine('<http://a> <http://p> .')
+        with self.assertRaises(NTriplesError):
+            subjectKey('<http://a> <http://p> .')
+
+    def testGroupingSpills(self):
+        # a chunk size of 2 forces several spilled runs
+        grouper = SubjectGrouper(chunkSize=2, tempDir=self.tmp)
+        groups = list(grouper.groups(self.dataFile))
+        subjects = [subject for subject, _ in groups]
+
+        self.assertEqual(len(subjects), len(set(subjects)))
+        self.assertEqual(sorted(subjects), subjects)
+        self.assertEqual(sum(len(lines) for _, lines in groups), len(self.dataGraph))
+        self.assertEqual(os.listdir(self.tmp), ['data.nt'])
+
+    def testSubjectsWithoutWhitespace(self):
+        dataFile = path.join(self.tmp, 'compact.nt')
+        with open(dataFile, 'w') as fp:
+            fp.write('<http://www.example.org/Carol>'
+                     '<http://www.w3.org/1999/02/22-rdf-syntax-ns#type>'
+                     '<http://www.example.org/Person>.\n'
+                     '<http://www.example.org/Carol><http://www.example.org/ssn>"123-45-6789" .\n'
+                     '<http://www.example.org/Dave> <http://www.example.org/name> "Dave"@en .\n'
+                     '<http://www.example.org/\\u0043arol> <http://www.example.org/ssn> '
+                     '"987-65-4321" .\n'
+                     '<http://www.example.org/Carol><http://www.example.org/name>"Carol"@en .\n')
+        validator = StreamingValidator(self.nodeShapes, chunkSize=2)
+        # all triples of Carol are one group, Alice is a target node without triples
+        self.assertEqual(self.violations(validator.validate(dataFile)), [
+            (str(self.ex.Alice), 'HasValueConstraintComponent'),
+            (str(self.ex.Carol), 'MaxCountConstraintComponent')])
+
+    def testAgreesWithValidator(self):
+        expected = ShapeValidator(self.nodeShapes, localOnly=True).validate(self.dataGraph)
+        validator = StreamingValidator(self.nodeShapes, hierarchyGraphs=[self.dataGraph],
+                                       chunkSize=3)
+        self.assertEqual(self.violations(validator.validate(self.dataFile)),
+                         self.violations(expected.results))
+        self.assertIn((str(self.ex.Bob), 'PatternConstraintComponent'),
+                      self.violations(expected.results))
+
+    def testGzipAndTargetNodes(self):
+        gzipFile = self.dataFile + '.gz'
+        with open(self.dataFile, 'rb') as source, gzip.open(gzipFile, 'wb') as target:
+            target.write(b''.join(line for line in source if b'example.org/Alice>' not in
+                                  line.split(b' ', 1)[0]))
+        validator = StreamingValidator(self.nodeShapes, hierarchyGraphs=[self.dataGraph])
+        violations = self.violations(validator.validate(gzipFile))
+
+        # Alice has no triples left but is still the target node of BossShape
+        self.assertIn((str(self.ex.Alice), 'HasValueConstraintComponent'), violations)
+
+    def testWrite(self):
+        outputFile = path.join(self.tmp, 'report.nt')
+        validator = StreamingValidator(self.nodeShapes, hierarchyGraphs=[self.dataGraph])
+        count = validator.write(self.dataFile, outputFile)
+        report = rdflib.Graph().parse(outputFile, format='nt')
+
+        self.assertEqual(len(list(report.subjects(SH.focusNode, None))), count)
+        self.assertEqual(list(report.objects(None, SH.conforms)), [rdflib.Literal(False)])
+
+
+if __name__ == '__main__':
+    unittest.main()
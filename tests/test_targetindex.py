@@ -0,0 +1,55 @@
+import unittest
+from os import path
+import rdflib
+from context import ShacShifter
+from ShacShifter.ShapeParser import ShapeParser
+from ShacShifter.TargetIndex import TargetIndex
+
+
+class TargetIndexTests(unittest.TestCase):
+
+    ex = rdflib.Namespace('http://www.example.org/')
+
+    def setUp(self):
+        self.dir = path.abspath('tests/_files/validation')
+        self.index = TargetIndex(ShapeParser().parseShape(path.join(self.dir, 'targets.ttl')))
+        self.dataGraph = rdflib.Graph().parse(path.join(self.dir, 'data.ttl'), format='turtle')
+
+    def testFocusNodes(self):
+        focusNodes = self.index.focusNodes(self.dataGraph)
+        ex = self.ex
+
+        # ex:Bob is a ex:Student which is a subclass of ex:Person
+        self.assertEqual(focusNodes[str(ex.PersonShape)], {ex.Alice, ex.Bob})
+        self.assertEqual(focusNodes[str(ex.AliceShape)], {ex.Alice})
+        self.assertEqual(focusNodes[str(ex.WorkerShape)], {ex.Alice, ex.Bob})
+        self.assertEqual(focusNodes[str(ex.EmployerShape)], {ex.ACME, ex.Alice})
+
+    def testHierarchyGraph(self):
+        ex = self.ex
+        dataGraph = rdflib.Graph()
+        dataGraph.add((ex.Carol, rdflib.RDF.type, ex.Student))
+        ontology = rdflib.Graph()
+        ontology.add((ex.Student, rdflib.RDFS.subClassOf, ex.Person))
+        # cycles in the hierarchy must not hang the index
+        ontology.add((ex.Person, rdflib.RDFS.subClassOf, ex.Student))
+
+        self.assertEqual(self.index.focusNodes(dataGraph), {str(ex.AliceShape): {ex.Alice}})
+        self.assertEqual(self.index.focusNodes(dataGraph, ontology)[str(ex.PersonShape)],
+                         {ex.Carol})
+
+    def testShapesFor(self):
+        ex = self.ex
+        self.assertEqual(
+            sorted(self.index.shapesFor(ex.Alice, types=[ex.Person], subjectOf=[ex.worksFor])),
+            [str(ex.AliceShape), str(ex.PersonShape), str(ex.WorkerShape)])
+        self.assertEqual(self.index.shapesFor(ex.ACME, objectOf=[ex.worksFor]),
+                         [str(ex.EmployerShape)])
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+import unittest
+import datetime
+import os
+import tempfile
+from decimal import Decimal
+from os import path
+import rdflib
+from context import ShacShifter
+from ShacShifter.ShacShifter import ShacShifter as Shifter
+from ShacShifter.ShapeParser import ShapeParser
+from ShacShifter.ShapeSnapshot import ShapeSnapshot, ShapeSnapshotWriter
+from ShacShifter.ShapeValidator import ShapeValidator, SH
+
+
+class ShapeValidatorTests(unittest.TestCase):
+
+    ex = rdflib.Namespace('http://www.example.org/')
+
+    def setUp(self):
+        self.dir = path.abspath('tests/_files/validation')
+        self.dataGraph = rdflib.Graph().parse(path.join(self.dir, 'data.ttl'), format='turtle')
+
+    def tearDown(self):
+        self.dir = None
+        self.dataGraph = None
+
+    def violations(self, nodeShapes):
+        report = ShapeValidator(nodeShapes).validate(self.dataGraph)
+        return report, sorted(
+            (str(result.focusNode).rsplit('/', 1)[-1],
+             str(result.sourceConstraintComponent).rsplit('#', 1)[-1])
+            for result in report.results)
+
+    def testConstraints(self):
+        nodeShapes = ShapeParser().parseShape(path.join(self.dir, 'shapes.ttl'))
+        report, violations = self.violations(nodeShapes)
+
+        self.assertFalse(report.conforms)
+        self.assertEqual(violations, [
+            ('Bob', 'ClassConstraintComponent'),
+            ('Bob', 'InConstraintComponent'),
+            ('Bob', 'LanguageInConstraintComponent'),
+            ('Bob', 'MaxCountConstraintComponent'),
+            ('Bob', 'MaxExclusiveConstraintComponent'),
+            ('Bob', 'MaxLengthConstraintComponent'),
+            ('Bob', 'NodeConstraintComponent'),
+            ('Bob', 'PatternConstraintComponent'),
+            ('Bob', 'UniqueLangConstraintComponent')
+        ])
+
+    def testDecimalAndDateBounds(self):
+        nodeShapes = ShapeParser().parseShape(path.join(self.dir, 'ranges.ttl'))
+        properties = {propertyShape.path: propertyShape for propertyShape
+                      in nodeShapes['http://www.example.org/ProductShape'].properties}
+        price = properties[str(self.ex.price)]
+        self.assertEqual((price.minExclusive, price.maxInclusive),
+                         (Decimal('0.0'), Decimal('9.99')))
+        self.assertEqual(properties[str(self.ex.released)].minInclusive,
+                         datetime.date(2000, 1, 1))
+
+        self.dataGraph = rdflib.Graph().parse(path.join(self.dir, 'rangesData.ttl'),
+                                              format='turtle')
+        self.assertEqual(self.violations(nodeShapes)[1], [
+            ('Expensive', 'MaxExclusiveConstraintComponent'),
+            ('Expensive', 'MaxInclusiveConstraintComponent'),
+            ('Free', 'MinExclusiveConstraintComponent'),
+            ('Free', 'MinInclusiveConstraintComponent'),
+            ('Undated', 'MaxExclusiveConstraintComponent'),
+            ('Undated', 'MinInclusiveConstraintComponent')
+        ])
+        detached = ShapeParser().parseShape(path.join(self.dir, 'ranges.ttl'), detached=True)
+        self.assertEqual(self.violations(detached)[1], self.violations(nodeShapes)[1])
+
+    def testTermEquality(self):
+        """Test that sh:in and sh:hasValue tell IRIs and literals and languages apart."""
+        self.dataGraph = rdflib.Graph().parse(path.join(self.dir, 'termsData.ttl'),
+                                              format='turtle')
+        shapesFile = path.join(self.dir, 'terms.ttl')
+        expected = [
+            ('a', 'HasValueConstraintComponent'),
+            ('a', 'InConstraintComponent'),
+            ('b', 'InConstraintComponent'),
+            ('b', 'InConstraintComponent')
+        ]
+        fd, snapshotFile = tempfile.mkstemp(suffix='.snapshot')
+        os.close(fd)
+        try:
+            ShapeSnapshotWriter().write(ShapeParser().parseShape(shapesFile, detached=True),
+                                        snapshotFile)
+            with ShapeSnapshot(snapshotFile) as snapshot:
+                for nodeShapes in [ShapeParser().parseShape(shapesFile),
+                                   ShapeParser().parseShape(shapesFile, detached=True),
+                                   snapshot.materializeAll()]:
+                    report, violations = self.violations(nodeShapes)
+                    self.assertEqual(violations, expected)
+                    self.assertEqual(
+                        sorted(str(result.value) for result in report.results
+                               if result.value is not None),
+                        ['http://www.example.org/Pink', 'rot', 'rot'])
+        finally:
+            os.remove(snapshotFile)
+
+    def testDetachedShapes(self):
+        """Test that detached shapes give the same results as attached ones."""
+        attached = ShapeParser().parseShape(path.join(self.dir, 'shapes.ttl'))
+        detached = ShapeParser().parseShape(path.join(self.dir, 'shapes.ttl'), detached=True)
+        self.assertEqual(self.violations(attached)[1], self.violations(detached)[1])
+
+    def testReportGraph(self):
+        nodeShapes = ShapeParser().parseShape(path.join(self.dir, 'shapes.ttl'))
+        graph = ShapeValidator(nodeShapes).validate(self.dataGraph).toGraph()
+        report = graph.value(predicate=rdflib.RDF.type, object=SH.ValidationReport)
+
+        self.assertEqual(graph.value(report, SH.conforms), rdflib.Literal(False))
+        self.assertEqual(len(list(graph.objects(report, SH.result))), 9)
+
+    def testShiftReport(self):
+        fd, output = tempfile.mkstemp(suffix='.ttl')
+        os.close(fd)
+        try:
+            Shifter().shift(path.join(self.dir, 'shapes.ttl'), output, 'report',
+                            data=path.join(self.dir, 'data.ttl'))
+            graph = rdflib.Graph().parse(output, format='turtle')
+        finally:
+            os.remove(output)
+        self.assertEqual(len(list(graph.subjects(rdflib.RDF.type, SH.ValidationResult))), 9)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+import unittest
+import json
+import shutil
+import tempfile
+from os import path
+from context import ShacShifter
+from ShacShifter.ShapeWatcher import ShapeWatcher, splitStatements
+
+EX = 'http://www.example.org/'
+
+
+class SplitStatementsTests(unittest.TestCase):
+
+    def split(self, text):
+        begin = 0
+        statements = []
+        for end in splitStatements(text):
+            statements.append(text[begin:end].strip())
+            begin = end
+        return statements
+
+    def testStatements(self):
+        text = ('PREFIX ex: <http://www.example.org/>\n'
+                '@prefix sh: <http://www.w3.org/ns/shacl#> .\n'
+                '# a comment. With dots.\n'
+                'ex:a ex:b "a literal. with dots" , """long\n. literal""" .\n'
+                'ex:c ex:d [ ex:e 1.5 ; ex:f ( ex:g ex:h ) ] .\n'
+                'ex:i.j ex:k <http://www.example.org/l.m> .\n'
+                'ex:n ex:o 1 .ex:p ex:q ex:r')
+        self.assertEqual(self.split(text), [
+            'PREFIX ex: <http://www.example.org/>',
+            '@prefix sh: <http://www.w3.org/ns/shacl#> .',
+            '# a comment. With dots.\nex:a ex:b "a literal. with dots" , """long\n. literal""" .',
+            'ex:c ex:d [ ex:e 1.5 ; ex:f ( ex:g ex:h ) ] .',
+            'ex:i.j ex:k <http://www.example.org/l.m> .',
+            'ex:n ex:o 1 .',
+            'ex:p ex:q ex:r'
+        ])
+
+    def testTrailingComment(self):
+        self.assertEqual(self.split('ex:a ex:b ex:c .\n# the end\n'), ['ex:a ex:b ex:c .'])
+
+
+class ShapeWatcherTests(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.input = path.join(self.dir, 'shapes.ttl')
+        self.output = path.join(self.dir, 'forms.json')
+        shutil.copy(path.abspath('tests/_files/watch/shapes.ttl'), self.input)
+        with open(self.input) as fp:
+            self.text = fp.read()
+        self.watcher = ShapeWatcher(self.input, self.output)
+        self.watcher.load()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def edit(self, old, new):
+        self.assertIn(old, self.text)
+        self.text = self.text.replace(old, new)
+        with open(self.input, 'w') as fp:
+            fp.write(self.text)
+        return self.watcher.update()
+
+    def bundles(self, outputfile):
+        """Return the written bundles by root, the order of their templates is not fixed."""
+        with open(outputfile) as fp:
+            decoder = json.JSONDecoder()
+            content = fp.read()
+            bundles = {}
+            pos = 0
+            while content[pos:].strip():
+                bundle, end = decoder.raw_decode(content[pos:].lstrip())
+                pos = len(content) - len(content[pos:].lstrip()) + end
+                bundle['templates'] = sorted(bundle.get('templates', []),
+                                             key=lambda template: template['id'])
+                bundles[bundle['root']] = bundle
+        return bundles
+
+    def assertSameAsFullLoad(self):
+        outputfile = path.join(self.dir, 'full.json')
+        ShapeWatcher(self.input, outputfile).load()
+        self.assertEqual(self.bundles(self.output), self.bundles(outputfile))
+
+    def testLoad(self):
+        self.assertEqual(sorted(self.bundles(self.output)), [
+            EX + 'CompanyShape', EX + 'PersonShape', EX + 'ProductShape'])
+
+    def testUnchanged(self):
+        self.assertEqual(self.watcher.update(), set())
+
+    def testChangedShape(self):
+        changed = self.edit('sh:minInclusive 5', 'sh:minInclusive 1 ; sh:minCount 1')
+        self.assertEqual(changed, {EX + 'ProductShape'})
+        price = self.bundles(self.output)[EX + 'ProductShape']['templates'][0]
+        self.assertEqual(price['cardinality']['min'], 1)
+        self.assertSameAsFullLoad()
+
+    def testChangedListCell(self):
+        changed = self.edit('"retired. Really."', '"retired"')
+        self.assertEqual(changed, {EX + 'PersonShape'})
+        self.assertSameAsFullLoad()
+
+    def testSharedPropertyShape(self):
+        changed = self.edit('sh:maxCount 1 .', 'sh:maxCount 2 .')
+        self.assertEqual(changed, {EX + 'PersonShape', EX + 'CompanyShape'})
+        self.assertSameAsFullLoad()
+
+    def testChangedLabel(self):
+        changed = self.edit('"Name"@en', '"Full name"@en')
+        self.assertEqual(changed, {EX + 'PersonShape', EX + 'CompanyShape'})
+        name = self.bundles(self.output)[EX + 'CompanyShape']['templates'][0]
+        self.assertEqual(name['label'], {'en': 'Full name'})
+        self.assertSameAsFullLoad()
+
+    def testAddedAndRemovedShape(self):
+        changed = self.edit('ex:ProductShape a sh:NodeShape ;\n    sh:targetClass ex:Product ;',
+                            'ex:OfferShape a sh:NodeShape ;\n    sh:targetClass ex:Offer ;')
+        self.assertEqual(changed, {EX + 'ProductShape', EX + 'OfferShape'})
+        self.assertEqual(sorted(self.bundles(self.output)), [
+            EX + 'CompanyShape', EX + 'OfferShape', EX + 'PersonShape'])
+        self.assertSameAsFullLoad()
+
+    def testChangedOperand(self):
+        shutil.copy(path.abspath('tests/_files/logical/shapes.ttl'), self.input)
+        with open(self.input) as fp:
+            self.text = fp.read()
+        self.watcher.load()
+        changed = self.edit('sh:path ex:name ;', 'sh:path ex:fullName ;')
+        # PersonShape and CompanyShape flatten BaseShape through sh:and
+        self.assertEqual(changed, {EX + 'BaseShape', EX + 'PersonShape', EX + 'CompanyShape'})
+        ids = [template['id'] for template
+               in self.bundles(self.output)[EX + 'PersonShape']['templates']]
+        self.assertIn(EX + 'fullName', ids)
+        self.assertNotIn(EX + 'name', ids)
+        # operands are shared with the shapes that use them, like in a full parse
+        nodeShapes = self.watcher.parser.nodeShapes
+        self.assertIs(nodeShapes[EX + 'CompanyShape'].sAnd[0][0], nodeShapes[EX + 'BaseShape'])
+        self.assertSameAsFullLoad()
+
+        # a change of an operand of sh:or
+        changed = self.edit('sh:path ex:phone ;', 'sh:path ex:mobile ;')
+        self.assertEqual(changed, {EX + 'ContactShape', EX + 'PersonShape'})
+        self.assertSameAsFullLoad()
+
+    def testChangedPrefix(self):
+        changed = self.edit('@prefix ex: <http://www.example.org/> .',
+                            '@prefix ex: <http://www.example.com/> .')
+        self.assertEqual(len(changed), 3)
+        self.assertIn('http://www.example.com/PersonShape', self.bundles(self.output))
+        self.assertSameAsFullLoad()
+
+    def testSyntaxError(self):
+        with self.assertRaises(Exception):
+            self.edit('sh:minInclusive 5 ;', 'sh:minInclusive ;')
+        # the old model stays resident and the next valid version is applied
+        self.assertEqual(len(self.watcher.bundles), 3)
+        changed = self.edit('sh:minInclusive ;', 'sh:minInclusive 2 ;')
+        self.assertEqual(changed, {EX + 'ProductShape'})
+        self.assertSameAsFullLoad()
+
+
+if __name__ == '__main__':
+    unittest.main()
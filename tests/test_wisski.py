@@ -0,0 +1,125 @@
+import unittest
+import os
+import tempfile
+import xml.etree.ElementTree as ElementTree
+from os import path
+from context import ShacShifter
+from ShacShifter.ShacShifter import ShacShifter
+from ShacShifter.ShapeParser import ShapeParser
+from ShacShifter.WisskiSerializer import WisskiSerializer, RDFS_RESOURCE
+
+EX = 'http://www.example.org/'
+
+
+class WisskiSerializerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.shapesFile = path.abspath('tests/_files/wisski/shapes.ttl')
+        self.parser = ShapeParser()
+        self.nodeShapes = self.parser.parseShape(self.shapesFile)
+        fd, self.outputfile = tempfile.mkstemp(suffix='.xml')
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.outputfile)
+
+    def paths(self, **kwargs):
+        serializer = WisskiSerializer(self.nodeShapes, self.outputfile, labels=self.parser.labels,
+                                      **kwargs)
+        count = serializer.write()
+        root = ElementTree.parse(self.outputfile).getroot()
+        self.assertEqual(root.tag, 'pathbuilderinterface')
+        self.assertEqual(len(root), count)
+        paths = {}
+        for element in root:
+            entry = {child.tag: child.text or '' for child in element if child.tag != 'path_array'}
+            entry['path_array'] = [(step.tag, step.text) for step in element.find('path_array')]
+            paths[entry['id']] = entry
+        return serializer, paths
+
+    def byName(self, paths, name, groupId=None):
+        return [entry for entry in paths.values() if entry['name'] == name and
+                (groupId is None or entry['group_id'] == groupId)]
+
+    def testGroups(self):
+        serializer, paths = self.paths()
+        groups = [entry for entry in paths.values() if entry['group_id'] == '0']
+        # the event shape is only nested and has no target class
+        self.assertEqual(sorted(entry['name'] for entry in groups), ['PersonShape', 'PlaceShape'])
+        person = self.byName(paths, 'PersonShape')[0]
+        self.assertEqual(person['is_group'], '1')
+        self.assertEqual(person['path_array'], [('x', EX + 'Person')])
+        self.assertEqual(person['bundle'], person['field'])
+
+    def testFields(self):
+        serializer, paths = self.paths()
+        person = self.byName(paths, 'PersonShape')[0]['id']
+        name = self.byName(paths, 'Name', person)[0]
+        self.assertEqual(name['is_group'], '0')
+        self.assertEqual(name['datatype_property'], EX + 'name')
+        self.assertEqual(name['path_array'], [('x', EX + 'Person')])
+        self.assertEqual(name['cardinality'], '1')
+        self.assertEqual(name['fieldtype'], 'string')
+
+        knows = self.byName(paths, 'Knows', person)[0]
+        self.assertEqual(knows['fieldtype'], 'entity_reference')
+        self.assertEqual(knows['path_array'],
+                         [('x', EX + 'Person'), ('y', EX + 'knows'), ('x', EX + 'Person')])
+
+    def testNestedShapes(self):
+        serializer, paths = self.paths()
+        person = self.byName(paths, 'PersonShape')[0]['id']
+        birth = self.byName(paths, 'Birth', person)[0]
+        self.assertEqual(birth['is_group'], '1')
+        self.assertEqual(birth['path_array'],
+                         [('x', EX + 'Person'), ('y', EX + 'birth'), ('x', RDFS_RESOURCE)])
+        date = self.byName(paths, 'Date', birth['id'])[0]
+        self.assertEqual(date['fieldtype'], 'integer')
+        self.assertEqual(date['path_array'], birth['path_array'])
+        self.assertEqual(date['datatype_property'], EX + 'date')
+        place = self.byName(paths, 'Place name', birth['id'])[0]
+        self.assertEqual(place['path_array'], birth['path_array'] + [
+            ('y', EX + 'tookPlaceAt'), ('x', RDFS_RESOURCE)])
+        self.assertEqual(place['datatype_property'], EX + 'placeName')
+
+        # the event shape is expanded below both shapes, but translated only once
+        self.assertEqual(len(self.byName(paths, 'Date')), 2)
+        self.assertEqual(sorted(serializer.fields), sorted(self.nodeShapes))
+
+    def testCycle(self):
+        serializer, paths = self.paths()
+        parent = self.byName(paths, 'Parent')
+        self.assertEqual(len(parent), 1)
+        self.assertEqual(parent[0]['is_group'], '0')
+        self.assertEqual(parent[0]['fieldtype'], 'entity_reference')
+
+    def testMaxDepth(self):
+        serializer, paths = self.paths(maxDepth=0)
+        birth = self.byName(paths, 'Birth')[0]
+        self.assertEqual(birth['is_group'], '0')
+        self.assertEqual(self.byName(paths, 'Date'), [])
+
+    def testLogicalShapes(self):
+        self.parser = ShapeParser()
+        self.nodeShapes = self.parser.parseShape(path.abspath('tests/_files/logical/shapes.ttl'))
+        serializer, paths = self.paths()
+        person = [entry for entry in paths.values()
+                  if entry['group_id'] == '0' and entry['path_array'] == [('x', EX + 'Person')]]
+        fields = sorted(entry['datatype_property'] for entry in paths.values()
+                        if entry['group_id'] == person[0]['id'])
+        # the property shapes of the flattened sh:and chain, like in the other formats
+        self.assertEqual(fields, [EX + 'age', EX + 'name'])
+        company = [entry for entry in paths.values()
+                   if entry['group_id'] == '0' and entry['path_array'] == [('x', EX + 'Company')]]
+        fields = sorted(entry['datatype_property'] for entry in paths.values()
+                        if entry['group_id'] == company[0]['id'])
+        self.assertEqual(fields, [EX + 'ceo', EX + 'id', EX + 'name'])
+
+    def testShift(self):
+        ShacShifter().shift(self.shapesFile, self.outputfile, 'wisski')
+        root = ElementTree.parse(self.outputfile).getroot()
+        self.assertEqual(len(root), 11)
+
+
+if __name__ == '__main__':
+    unittest.main()